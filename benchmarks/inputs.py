@@ -0,0 +1,89 @@
+"""벤치마크용 합성 입력(diff, 링크가 많은 MR 설명, 긴 모델 리포트) 생성기."""
+
+from __future__ import annotations
+
+from typing import Final
+
+_DOMAINS: Final[tuple[str, ...]] = ("보안", "트랜잭션/동시성", "비즈니스 로직", "성능/리소스", "빌드/CI", "유지보수성")
+
+
+def synthetic_diff(size_bytes: int, *, lines_per_hunk: int = 12, hunks_per_file: int = 4) -> str:
+    """size_bytes 이상이 될 때까지 소스·테스트·생성 파일이 섞인 unified diff를 만든다."""
+    parts: list[str] = []
+    total = 0
+    index = 0
+    while total < size_bytes:
+        path = _path_for(index)
+        header = f"diff --git a/{path} b/{path}\nindex 1111111..2222222 100644\n--- a/{path}\n+++ b/{path}\n"
+        parts.append(header)
+        total += len(header)
+        for hunk in range(hunks_per_file):
+            start = hunk * 40 + 1
+            body = [f"@@ -{start},{lines_per_hunk} +{start},{lines_per_hunk + 1} @@ def handler_{index}_{hunk}():\n"]
+            for line in range(lines_per_hunk):
+                if line == lines_per_hunk // 2:
+                    body.append(f"-    value = compute(order_{index}, retries={line})\n")
+                    body.append(f"+    value = compute(order_{index}, retries={line + 1}, timeout=30)\n")
+                    body.append(f"+    log.info('computed %s', value)  # 주문 {index}\n")
+                else:
+                    body.append(f"     result_{line} = transform(payload[{line}])\n")
+            text = "".join(body)
+            parts.append(text)
+            total += len(text)
+            if total >= size_bytes:
+                break
+        index += 1
+    return "".join(parts)
+
+
+def link_heavy_description(links: int) -> str:
+    """GitLab 이슈 링크·#참조·Asana 태스크 링크가 links개 섞인 MR 설명."""
+    lines = ["## 변경 사항", "주문 취소 흐름을 정리했습니다.", ""]
+    for index in range(links):
+        kind = index % 3
+        if kind == 0:
+            lines.append(f"- 관련 이슈: https://gitlab.example.com/group/project/-/issues/{index + 1}")
+        elif kind == 1:
+            lines.append(f"- 참고 #{index + 1} 및 후속 작업")
+        else:
+            lines.append(f"- Asana: https://app.asana.com/0/1200000000000/{1200000000000 + index}")
+    return "\n".join(lines)
+
+
+def long_report(issues: int) -> str:
+    """현재 리포트 형식(핵심 요약 / 안정성 / 추가 개선 아이디어)을 따르는 긴 모델 출력."""
+    must, ideas = issues // 2, issues - issues // 2
+    lines = [
+        "## 핵심 요약",
+        f"- 안정성을 위해 먼저 살펴보면 좋은 부분: {{+ {must}건 +}}",
+        f"- 추가 개선 아이디어: {{+ {ideas}건 +}}",
+        "- 핵심 위험 요약: {+ 트랜잭션 경계 누락으로 데이터 불일치 위험 +}",
+        "",
+    ]
+    for title, count in (("안정성을 위해 먼저 살펴보면 좋은 부분", must), ("추가 개선 아이디어", ideas)):
+        lines.extend(["<details>", "", "<summary>", title, "</summary>", ""])
+        for domain_index, domain in enumerate(_DOMAINS):
+            share = [n for n in range(count) if n % len(_DOMAINS) == domain_index]
+            if not share:
+                continue
+            lines.append(f"### {domain}")
+            for n in share:
+                lines.extend(_issue_lines(n))
+                lines.append("")
+        lines.extend(["</details>", ""])
+    return "\n".join(lines)
+
+
+def _issue_lines(n: int) -> list[str]:
+    return [
+        f"- `(src/service/order_{n}.py:{n + 10}-{n + 25})`",
+        f"  - 문제: 주문 {n} 처리 중 예외가 삼켜져 재시도 상태가 남지 않습니다.",
+        "  - 영향: 일시적 장애 후 주문이 영구적으로 보류될 수 있습니다.",
+        "  - 조치: 예외를 로깅하고 재시도 큐에 다시 넣도록 수정해 주세요.",
+    ]
+
+
+def _path_for(index: int) -> str:
+    if index % 10 == 9:
+        return f"web/app_{index}/package-lock.json" if index % 20 == 19 else f"tests/test_module_{index}.py"
+    return f"src/app/module_{index // 50}/service_{index}.py"
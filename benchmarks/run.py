@@ -0,0 +1,246 @@
+"""로컬(LLM 호출 제외) 핫패스 마이크로벤치마크.
+
+사용법:
+    python benchmarks/run.py                     # quick 프로필(최대 10MB diff) 실행 후 기준선과 비교
+    python benchmarks/run.py --profile full      # 100MB diff 포함
+    python benchmarks/run.py --check             # 기준선 대비 시간·메모리 회귀가 있으면 종료 코드 1
+    python benchmarks/run.py --update-baseline   # 현재 결과를 benchmarks/baseline.json에 저장
+
+시간은 같은 입력을 반복 실행한 중앙값(표시)과 최솟값(비교)이고, 메모리는 별도 1회 실행에서 tracemalloc으로 잰
+최대 할당량이다. 절대 시간은 머신마다 다르므로, 코드와 무관한 고정 작업(calibration)을 케이스 앞뒤로 재서
+기준선을 만든 머신과의 속도 차이만큼 기준 시간을 보정한 뒤 비교한다. 공유 러너의 순간 부하에 덜 흔들리도록
+비교에는 최솟값을 쓴다. 최대 메모리는 머신과 무관하므로 보정 없이 비교한다.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Final
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+sys.path.insert(0, str(ROOT))
+
+from ai_review_bot.chunking import split_diff  # noqa: E402
+from ai_review_bot.compaction import compact_diff  # noqa: E402
+from ai_review_bot.diff import parse_diff  # noqa: E402
+from ai_review_bot.llm import LLMResult  # noqa: E402
+from ai_review_bot.prompt import build_review_prompt  # noqa: E402
+from ai_review_bot.report import ReviewReport, merge_reports  # noqa: E402
+from ai_review_bot.review import ReviewContext, TokenUsage  # noqa: E402
+from ai_review_bot.review_service import ReviewService, _render_review  # noqa: E402
+from ai_review_bot.support.asana import _extract_task_ids  # noqa: E402
+from ai_review_bot.support.gitlab import extract_issue_iids  # noqa: E402
+from ai_review_bot.tokens import prompt_token_budget  # noqa: E402
+from benchmarks.inputs import link_heavy_description, long_report, synthetic_diff  # noqa: E402
+
+BASELINE_PATH: Final[Path] = Path(__file__).with_name("baseline.json")
+_KB: Final[int] = 1024
+_MB: Final[int] = 1024 * 1024
+_PROFILES: Final[dict[str, tuple[int, ...]]] = {
+    "quick": (_KB, _MB, 10 * _MB),
+    "full": (_KB, _MB, 10 * _MB, 100 * _MB),
+}
+_MIN_REPEATS: Final[int] = 3
+_MAX_REPEATS: Final[int] = 50
+_TARGET_SECONDS: Final[float] = 0.3
+_CALIBRATION: Final[str] = "calibration"
+# 이보다 작은 차이는 측정 잡음으로 보고 회귀로 세지 않는다.
+_NOISE_MS: Final[float] = 1.0
+_NOISE_MB: Final[float] = 1.0
+
+
+@dataclass(frozen=True)
+class Case:
+    name: str
+    func: Callable[[], Any]
+
+
+@dataclass(frozen=True)
+class Measurement:
+    name: str
+    median_ms: float
+    min_ms: float
+    repeats: int
+    peak_mb: float
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"median_ms": self.median_ms, "min_ms": self.min_ms, "repeats": self.repeats, "peak_mb": self.peak_mb}
+
+
+class _StubLLM:
+    """LLM 호출 없이 긴 리포트를 즉시 돌려주는 대역."""
+
+    is_available = True
+    model = "gpt-5.1"
+    structured_output = False
+    reasoning_effort = "low"
+    text_verbosity = "low"
+
+    def __init__(self, report: str) -> None:
+        self._report = report
+
+    def complete(self, prompt: Any) -> LLMResult:
+        return LLMResult(text=self._report, usage=TokenUsage(), model=self.model)
+
+
+def build_cases(sizes: tuple[int, ...]) -> list[Case]:
+    overview = "프로젝트 규칙: 모든 쿼리는 인증이 필요합니다.\n" * 400
+    ticket = link_heavy_description(200)
+    budget = prompt_token_budget("gpt-5.1")
+    cases: list[Case] = []
+
+    for size in sizes:
+        label = _size_label(size)
+        diff = synthetic_diff(size)
+        context = ReviewContext(project_name="kop-web", pr_number="1", diff=diff, ticket_context=ticket, project_overview=overview)
+        cases.append(Case(f"diff.parse/{label}", lambda diff=diff: sum(1 for _ in parse_diff(diff))))
+        cases.append(Case(f"diff.compact/{label}", lambda diff=diff: compact_diff(diff)))
+        cases.append(Case(f"chunking.split/{label}", lambda diff=diff: split_diff(diff, 60_000)))
+        cases.append(Case(f"prompt.build/{label}", lambda context=context: build_review_prompt(context, token_budget=budget)))
+        if size <= _MB:
+            service = ReviewService(_StubLLM(long_report(40)))  # type: ignore[arg-type]
+            cases.append(Case(f"service.create_review/{label}", lambda service=service, context=context: service.create_review(context)))
+
+    for issues in (50, 500, 5000):
+        current = long_report(issues)
+        parsed = ReviewReport.parse(current)
+        cases.append(Case(f"report.parse/{issues}", lambda current=current: ReviewReport.parse(current)))
+        cases.append(Case(f"report.render/{issues}", lambda parsed=parsed: parsed.render()))
+        cases.append(Case(f"service.normalize/{issues}", lambda current=current: _render_review(current, ReviewReport.parse(current))))
+        cases.append(Case(f"report.merge/{issues}", lambda current=current: merge_reports([current] * 4)))
+
+    for links in (1_000, 10_000):
+        description = link_heavy_description(links)
+        cases.append(Case(f"tickets.extract_issue_iids/{links}", lambda description=description: extract_issue_iids(description)))
+        cases.append(Case(f"tickets.extract_task_ids/{links}", lambda description=description: _extract_task_ids(description)))
+    return cases
+
+
+def _calibration_workload() -> int:
+    """머신 속도 보정용 고정 작업. 저장소 코드를 쓰지 않으므로 러너 간 속도 차이만 반영한다."""
+    text = "+    value = compute(item, key='x') # line\n" * 20_000
+    words = sum(len(line.split()) for line in text.splitlines())
+    return words + len(sorted(text[:200_000])) + len({line[:12]: line for line in text.splitlines()})
+
+
+def measure(case: Case) -> Measurement:
+    case.func()  # 워밍업
+    timings: list[float] = []
+    started = time.perf_counter()
+    while len(timings) < _MIN_REPEATS or (time.perf_counter() - started < _TARGET_SECONDS and len(timings) < _MAX_REPEATS):
+        gc.collect()
+        begin = time.perf_counter()
+        case.func()
+        timings.append((time.perf_counter() - begin) * 1000)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        case.func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return Measurement(
+        name=case.name,
+        median_ms=round(statistics.median(timings), 4),
+        min_ms=round(min(timings), 4),
+        repeats=len(timings),
+        peak_mb=round(peak / _MB, 3),
+    )
+
+
+def compare(
+    results: list[Measurement],
+    baseline: dict[str, Any],
+    *,
+    tolerance: float,
+    memory_tolerance: float,
+    speed: float = 1.0,
+) -> tuple[list[str], list[str]]:
+    """결과 표와 회귀 목록을 만든다.
+
+    speed는 이번 머신이 기준선 머신보다 느린 배수(calibration 최솟값의 비)로, 기준 최솟값에 곱해 비교한다.
+    _NOISE_MS·_NOISE_MB보다 작은 차이는 회귀로 세지 않는다.
+    """
+    rows = [f"{'case':<40} {'median ms':>12} {'min ms':>12} {'expected':>12} {'ratio':>7} {'peak MB':>9} {'base MB':>9}"]
+    regressions: list[str] = []
+    for result in results:
+        base = baseline.get(result.name) or {}
+        expected_ms = base["min_ms"] * speed if "min_ms" in base else None
+        base_mb = base.get("peak_mb")
+        ratio = result.min_ms / expected_ms if expected_ms else None
+        flags = []
+        if ratio is not None and expected_ms is not None and ratio > 1 + tolerance and result.min_ms - expected_ms > _NOISE_MS:
+            flags.append("REGRESSION")
+            regressions.append(f"{result.name}: expected {expected_ms:.2f}ms → {result.min_ms:.2f}ms (x{ratio:.2f})")
+        if base_mb is not None and result.peak_mb > base_mb * (1 + memory_tolerance) and result.peak_mb - base_mb > _NOISE_MB:
+            flags.append("MEMORY")
+            regressions.append(f"{result.name}: peak {base_mb:.2f}MB → {result.peak_mb:.2f}MB")
+        rows.append(
+            f"{result.name:<40} {result.median_ms:>12.3f} {result.min_ms:>12.3f} {f'{expected_ms:.3f}' if expected_ms is not None else '-':>12} "
+            f"{f'x{ratio:.2f}' if ratio is not None else '-':>7} {result.peak_mb:>9.3f} {base_mb if base_mb is not None else '-':>9}"
+            f"{'  ' + ' '.join(flags) if flags else ''}"
+        )
+    return rows, regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Run local hot-path micro-benchmarks.")
+    parser.add_argument("--profile", choices=sorted(_PROFILES), default="quick", help="diff 크기 프로필 (full은 100MB 포함).")
+    parser.add_argument("--filter", default="", help="이름에 이 문자열이 들어간 케이스만 실행합니다.")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH, help="비교할 기준선 JSON 경로.")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="회귀로 볼 (속도 보정한) 최솟값 증가 비율 (기본 0.5 = 50%%).")
+    parser.add_argument("--memory-tolerance", type=float, default=0.25, help="회귀로 볼 최대 메모리 증가 비율 (기본 0.25 = 25%%).")
+    parser.add_argument("--check", action="store_true", help="회귀가 있으면 종료 코드 1을 반환합니다.")
+    parser.add_argument("--update-baseline", action="store_true", help="이번 결과로 기준선을 갱신합니다.")
+    parser.add_argument("--output", type=Path, help="결과 표를 추가로 저장할 파일 경로.")
+    args = parser.parse_args(argv)
+
+    cases = [case for case in build_cases(_PROFILES[args.profile]) if args.filter in case.name]
+    before = measure(Case(_CALIBRATION, _calibration_workload))
+    results = []
+    for case in cases:
+        result = measure(case)
+        print(f"[bench] {result.name}: {result.median_ms:.3f}ms (n={result.repeats}, peak {result.peak_mb:.3f}MB)", file=sys.stderr)
+        results.append(result)
+    after = measure(Case(_CALIBRATION, _calibration_workload))
+    calibration = min(before, after, key=lambda measurement: measurement.min_ms)
+    print(f"[bench] {_CALIBRATION}: {calibration.min_ms:.3f}ms (before {before.min_ms:.3f}ms, after {after.min_ms:.3f}ms)", file=sys.stderr)
+
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8")) if args.baseline.exists() else {}
+    base_calibration = (baseline.get(_CALIBRATION) or {}).get("min_ms")
+    speed = calibration.min_ms / base_calibration if base_calibration else 1.0
+    if base_calibration:
+        print(f"[bench] machine speed vs baseline: x{speed:.2f} (calibration {base_calibration:.2f}ms → {calibration.min_ms:.2f}ms)", file=sys.stderr)
+    else:
+        print("[bench] WARN: baseline has no calibration entry – comparing absolute timings", file=sys.stderr)
+    rows, regressions = compare(results, baseline.get("results", {}), tolerance=args.tolerance, memory_tolerance=args.memory_tolerance, speed=speed)
+    report = "\n".join(rows + ([""] + ["회귀:"] + regressions if regressions else []))
+    print(report)
+    if args.output:
+        args.output.write_text(report + "\n", encoding="utf-8")
+
+    if args.update_baseline:
+        merged = {**baseline.get("results", {}), **{result.name: result.to_dict() for result in results}}
+        payload = {"python": sys.version.split()[0], _CALIBRATION: calibration.to_dict(), "results": dict(sorted(merged.items()))}
+        args.baseline.write_text(json.dumps(payload, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+        print(f"[bench] baseline updated: {args.baseline}", file=sys.stderr)
+    return 1 if args.check and regressions else 0
+
+
+def _size_label(size: int) -> str:
+    return f"{size // _MB}MB" if size >= _MB else f"{size // _KB}KB"
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
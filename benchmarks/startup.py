@@ -0,0 +1,108 @@
+"""`python -X importtime` 기반 시작 시간(import 비용) 벤치마크.
+
+사용법:
+    python benchmarks/startup.py             # 대상별 import 시간 중앙값과 가장 무거운 모듈 출력
+    python benchmarks/startup.py --check     # 시작 경로에서 금지 모듈을 가져오면 종료 코드 1 (예산 초과는 경고만)
+    python benchmarks/startup.py --check --strict-budget   # 예산(startup_budget.json) 초과도 실패로 본다
+
+각 대상은 새 인터프리터에서 실행하며, 아무것도 import하지 않는 인터프리터의 시작 비용(site 등)을 뺀 값을 잰다.
+openai/requests처럼 무거운 의존성은 실제로 호출하는 경로에서만 가져와야 하므로 시작 경로에서 보이면 실패로 본다.
+밀리초 예산은 공유 러너의 부하에 따라 수십 ms씩 흔들리므로 기본으로는 참고용 경고로만 쓰고, 결정적인 금지 모듈
+검사만 CI를 막는다. 고정 러너에서는 --strict-budget으로 예산 초과도 실패로 볼 수 있다.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Final
+
+ROOT = Path(__file__).resolve().parents[1]
+BUDGET_PATH: Final[Path] = Path(__file__).with_name("startup_budget.json")
+_FORBIDDEN: Final[tuple[str, ...]] = ("openai", "requests", "urllib3", "http.server")
+_TARGETS: Final[dict[str, str]] = {
+    # ai-review-bot 콘솔 스크립트의 단일 리뷰 경로
+    "cli": "import ai_review_bot.cli",
+    # CI 엔트리포인트가 첫 네트워크 호출 전까지 가져오는 모듈
+    "entrypoint": (
+        "import entrypoint; entrypoint._configure_sys_path(); "
+        "import ai_review_bot.metrics, ai_review_bot.supersede, ai_review_bot.support.gitlab, ai_review_bot.incremental, ai_review_bot.review_service"
+    ),
+}
+
+
+@dataclass(frozen=True)
+class ImportRecord:
+    module: str
+    self_us: int
+    cumulative_us: int
+    top_level: bool
+
+
+def run_importtime(statement: str) -> list[ImportRecord]:
+    """새 인터프리터에서 statement를 실행하고 `-X importtime` 출력을 모듈별 기록으로 읽는다."""
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join([str(ROOT / "src"), str(ROOT)])}
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", statement], cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+    records = []
+    for line in proc.stderr.splitlines():
+        # "import time:       120 |       3620 |   requests.api" (들여쓰기 = import 깊이)
+        if not line.startswith("import time:"):
+            continue
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|", 2)
+        if not cumulative_us.strip().isdigit():
+            continue
+        module = name[1:].rstrip()
+        records.append(ImportRecord(module=module.strip(), self_us=int(self_us), cumulative_us=int(cumulative_us), top_level=not module.startswith(" ")))
+    return records
+
+
+def total_ms(records: list[ImportRecord]) -> float:
+    return sum(record.cumulative_us for record in records if record.top_level) / 1000
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Measure import-time startup cost with -X importtime.")
+    parser.add_argument("--repeats", type=int, default=7, help="대상별 반복 횟수 (중앙값 사용).")
+    parser.add_argument("--budget", type=Path, default=BUDGET_PATH, help="대상별 예산(ms) JSON 경로.")
+    parser.add_argument("--top", type=int, default=8, help="가장 무거운 모듈을 몇 개 보여 줄지.")
+    parser.add_argument("--check", action="store_true", help="금지 모듈이 있으면 종료 코드 1을 반환합니다.")
+    parser.add_argument("--strict-budget", action="store_true", help="--check에서 예산(ms) 초과도 실패로 봅니다(고정 러너용).")
+    args = parser.parse_args(argv)
+
+    budgets = json.loads(args.budget.read_text(encoding="utf-8")) if args.budget.exists() else {}
+    interpreter_ms = statistics.median(total_ms(run_importtime("pass")) for _ in range(args.repeats))
+    failures = []
+    warnings = []
+    print(f"{'target':<12} {'median ms':>10} {'budget ms':>10}")
+    for name, statement in _TARGETS.items():
+        runs = [run_importtime(statement) for _ in range(args.repeats)]
+        median_ms = max(statistics.median(total_ms(records) for records in runs) - interpreter_ms, 0.0)
+        budget = budgets.get(name)
+        flag = ""
+        if budget is not None and median_ms > budget:
+            flag = "  <-- over budget"
+            (failures if args.strict_budget else warnings).append(f"{name}: {median_ms:.1f}ms > budget {budget}ms")
+        loaded = {record.module for record in runs[-1]}
+        forbidden = [module for module in _FORBIDDEN if module in loaded]
+        if forbidden:
+            flag += f"  <-- imports {', '.join(forbidden)}"
+            failures.append(f"{name}: imports {', '.join(forbidden)} at startup")
+        print(f"{name:<12} {median_ms:>10.1f} {budget if budget is not None else '-':>10}{flag}")
+        heaviest = sorted(runs[-1], key=lambda record: record.self_us, reverse=True)[: args.top]
+        print("  " + ", ".join(f"{record.module} {record.self_us / 1000:.1f}ms" for record in heaviest))
+
+    for warning in warnings:
+        print(f"[bench] WARN: {warning} (advisory; use --strict-budget to fail)", file=sys.stderr)
+    if failures:
+        print("\n실패:\n" + "\n".join(failures))
+    return 1 if args.check and failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -3,15 +3,13 @@ from __future__ import annotations
 import os
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-import requests
-from openai import OpenAI
-
 ROOT = Path(__file__).resolve().parent
 SRC = ROOT / "src"
-
-client = OpenAI()  # OPENAI_API_KEY는 환경변수로 자동 인식
+_LISTED_SKIPPED_PATHS = 20
+_REVIEW_PATH = "/workspace/llm_review.txt"
 
 
 def _configure_sys_path() -> None:
@@ -19,6 +17,14 @@ def _configure_sys_path() -> None:
         sys.path.insert(0, str(SRC))
 
 
+def _stage(name: str, func, *args, **kwargs):
+    """func 실행 시간을 name 단계 span으로 기록한다(LLM_REVIEW_METRICS_FILE 등이 없으면 기록하지 않음)."""
+    from ai_review_bot.metrics import span
+
+    with span(name):
+        return func(*args, **kwargs)
+
+
 def require_env(name: str) -> str:
     value = os.getenv(name)
     if not value:
@@ -27,169 +33,356 @@ def require_env(name: str) -> str:
     return value
 
 
-def run_cmd(args, cwd="/workspace", capture_output=True, check=True) -> str:
-    """간단한 쉘 명령 실행 헬퍼."""
-    print(f"[llm-code-review] run: {' '.join(args)}")
+def generate_diff(target_branch: str, commit_sha: str):
+    """origin/타겟 브랜치와의 merge-base 기준 diff를 git 한 번 실행으로 스트리밍해 만든다(제외 경로·바이너리는 git에서 걸러냄)."""
+    print(f"[llm-code-review] generating diff for origin/{target_branch}...{commit_sha}")
+    output = _read_git_diff(f"origin/{target_branch}", commit_sha, merge_base=True)
+    if not output.text.strip():
+        print("[llm-code-review] diff is empty – nothing to review.")
+    return output
+
+
+def is_ancestor(ancestor_sha: str, commit_sha: str) -> bool:
+    """ancestor_sha가 commit_sha의 조상인지 확인한다(객체가 없거나 force-push된 경우 False)."""
     result = subprocess.run(
-        args,
-        cwd=cwd,
-        capture_output=capture_output,
+        ["git", "merge-base", "--is-ancestor", ancestor_sha, commit_sha],
+        cwd="/workspace",
+        capture_output=True,
         text=True,
     )
-    if check and result.returncode != 0:
-        print(f"[llm-code-review] command failed: {' '.join(args)}", file=sys.stderr)
-        print(result.stdout, file=sys.stderr)
-        print(result.stderr, file=sys.stderr)
-        sys.exit(result.returncode)
-    return result.stdout if capture_output else ""
+    return result.returncode == 0
 
 
-def generate_diff(target_branch: str, commit_sha: str) -> str:
-    """origin/타겟 브랜치 기준으로 diff 생성."""
-    merge_base = run_cmd(["git", "merge-base", f"origin/{target_branch}", commit_sha]).strip()
+def generate_interdiff(previous_sha: str, commit_sha: str):
+    """마지막으로 리뷰한 커밋 이후 변경분만 diff로 만든다."""
+    print(f"[llm-code-review] generating incremental diff for {previous_sha}..{commit_sha}")
+    return _read_git_diff(previous_sha, commit_sha, merge_base=False)
 
-    print(f"[llm-code-review] generating diff for {merge_base}..{commit_sha}")
 
-    diff_text = run_cmd(["git", "diff", f"{merge_base}..{commit_sha}"])
-    if not diff_text.strip():
-        print("[llm-code-review] diff is empty – nothing to review.")
-    return diff_text
+def _read_git_diff(base: str, head: str, *, merge_base: bool):
+    """support.git.DiffOutput(본문과 크기 상한으로 건너뛴 파일 경로)를 돌려준다."""
+    from ai_review_bot.support.git import build_diff_args, diff_excludes_from_env, read_diff
+
+    try:
+        output = read_diff(build_diff_args(base, head, excludes=diff_excludes_from_env(), merge_base=merge_base), cwd="/workspace")
+    except (OSError, RuntimeError) as exc:
+        print(f"[llm-code-review] command failed: {exc}", file=sys.stderr)
+        sys.exit(1)
+    print(f"[llm-code-review] diff: {output.files} file(s), {len(output.text)} chars")
+    return output
+
+
+def is_incremental_enabled() -> bool:
+    return os.getenv("LLM_REVIEW_INCREMENTAL", "").strip().lower() in ("1", "true", "yes", "on")
+
+
+def is_inline_enabled() -> bool:
+    return os.getenv("LLM_REVIEW_INLINE_COMMENTS", "").strip().lower() in ("1", "true", "yes", "on")
 
 
 def post_comment_to_gitlab(body: str):
     """GitLab MR 코멘트 생성."""
-    gitlab_token = require_env("GITLAB_TOKEN")
-    ci_api_v4_url = require_env("CI_API_V4_URL")
-    ci_project_id = require_env("CI_PROJECT_ID")
-    ci_mr_iid = require_env("CI_MERGE_REQUEST_IID")
-
-    url = f"{ci_api_v4_url}/projects/{ci_project_id}/merge_requests/{ci_mr_iid}/notes"
-    print(f"[llm-code-review] posting comment to GitLab: {url}")
-
-    resp = requests.post(
-        url,
-        headers={
-            "PRIVATE-TOKEN": gitlab_token,
-            "Content-Type": "application/json",
-        },
-        json={"body": body},
-        timeout=30,
+    from ai_review_bot.support.gitlab import post_merge_request_note
+
+    try:
+        post_merge_request_note(
+            api_url=require_env("CI_API_V4_URL"),
+            project_id=require_env("CI_PROJECT_ID"),
+            mr_iid=require_env("CI_MERGE_REQUEST_IID"),
+            token=require_env("GITLAB_TOKEN"),
+            body=body,
+        )
+    except RuntimeError as exc:
+        print(f"[llm-code-review] ERROR: {exc}", file=sys.stderr)
+        sys.exit(1)
+
+
+def post_inline_findings(report_text: str, diff_text: str, *, api_url: str, project_id: str, mr_iid: str, token: str) -> str:
+    """diff 안을 가리키는 지적은 인라인 토론으로 남기고, 요약 코멘트에 남길 리포트를 돌려준다."""
+    from ai_review_bot.discussions import DiffPositionIndex, build_inline_note, post_inline_discussions
+    from ai_review_bot.report import ReviewReport
+    from ai_review_bot.support.gitlab import fetch_merge_request_diff_refs, post_merge_request_discussion
+
+    report = ReviewReport.parse(report_text)
+    if not report.issues:
+        return report_text
+    diff_refs = fetch_merge_request_diff_refs(api_url=api_url, project_id=project_id, mr_iid=mr_iid, token=token)
+    if diff_refs is None:
+        print("[llm-code-review] WARN: MR diff_refs unavailable – posting every finding in the summary comment", file=sys.stderr)
+        return report_text
+
+    remaining, posted = post_inline_discussions(
+        report,
+        DiffPositionIndex.from_diff(diff_text, diff_refs),
+        lambda body, position: post_merge_request_discussion(api_url=api_url, project_id=project_id, mr_iid=mr_iid, token=token, body=body, position=position),
     )
+    print(f"[llm-code-review] posted {posted} inline discussion(s), {len(remaining.issues)} finding(s) left in the summary")
+    if not posted:
+        return report_text
+    return f"{remaining.render().rstrip()}\n\n{build_inline_note(report, remaining)}\n"
+
+
+def merge_request_diff(diff_text: str, previous_review, target_branch: str, commit_sha: str) -> str:
+    """인라인 토론 위치를 찾을 diff. GitLab 위치는 MR 전체(merge-base..head) 기준이라 증분 모드의 interdiff로는 찾을 수 없다.
+
+    이어받은 지적은 이번 interdiff에 없는 파일을 가리키므로 전체 MR diff를 다시 만든다.
+    """
+    return generate_diff(target_branch, commit_sha).text if previous_review else diff_text
 
-    if not resp.ok:
+
+def resolve_bot_author(*, api_url: str, token: str):
+    """증분 리뷰 마커를 믿을 봇 계정. LLM_REVIEW_BOT_USERNAME이 있으면 그 값을, 없으면 토큰 주인(GET /user)을 쓴다."""
+    from ai_review_bot.support.gitlab import fetch_current_user
+
+    username = os.getenv("LLM_REVIEW_BOT_USERNAME", "").strip()
+    if username:
+        return {"username": username}
+    return fetch_current_user(api_url=api_url, token=token)
+
+
+def prepare_diff(target_branch: str, commit_sha: str, *, api_url: str, project_id: str, mr_iid: str, token: str):
+    """리뷰할 diff와 (증분 모드일 때) 직전 리뷰 정보를 준비한다. 리뷰할 필요가 없으면 None."""
+    from ai_review_bot.incremental import find_previous_review
+    from ai_review_bot.support.gitlab import fetch_merge_request_notes
+
+    previous_review = None
+    if is_incremental_enabled():
+        author = resolve_bot_author(api_url=api_url, token=token)
+        if author is None:
+            print("[llm-code-review] WARN: could not identify the bot account (GET /user) – running a full review.", file=sys.stderr)
+        else:
+            notes = fetch_merge_request_notes(api_url=api_url, project_id=project_id, mr_iid=mr_iid, token=token)
+            previous_review = find_previous_review(notes, author=author)
+        if previous_review and previous_review.sha == commit_sha:
+            print(f"[llm-code-review] {commit_sha} was already reviewed – skipping.")
+            return None
+        if previous_review and not is_ancestor(previous_review.sha, commit_sha):
+            print(f"[llm-code-review] last reviewed commit {previous_review.sha} is not an ancestor (rebased?) – running a full review.")
+            previous_review = None
+
+    if previous_review:
+        interdiff = generate_interdiff(previous_review.sha, commit_sha)
+        if not interdiff.text.strip():
+            print("[llm-code-review] no changes since the last review – skipping.")
+            return None
+        return interdiff, previous_review
+    return generate_diff(target_branch, commit_sha), None
+
+
+def load_project_overview() -> str | None:
+    """레포지토리 루트의 AGENTS.md에서 프로젝트 개요를 읽는다(있을 경우)."""
+    agents_path = Path("/workspace") / "AGENTS.md"
+    if not agents_path.exists():
+        return None
+    print(f"[llm-code-review] loading project overview from {agents_path}")
+    try:
+        return agents_path.read_text(encoding="utf-8")
+    except Exception as exc:  # pragma: no cover - 방어적 로깅
         print(
-            f"[llm-code-review] ERROR: failed to post comment (status={resp.status_code}): {resp.text}",
+            f"[llm-code-review] WARN: failed to read AGENTS.md: {exc}",
             file=sys.stderr,
         )
-        sys.exit(1)
+        return None
+
+
+def collect_ticket_context(*, api_url: str, project_id: str, mr_iid: str, token: str) -> str | None:
+    """GitLab MR description과 연결된 이슈에서 Asana 티켓 컨텍스트를 수집한다."""
+    from ai_review_bot.support.asana import build_ticket_context_from_asana
+    from ai_review_bot.support.gitlab import collect_issue_descriptions
+    from ai_review_bot.support.http import get_http_client
+
+    mr_url = f"{api_url}/projects/{project_id}/merge_requests/{mr_iid}"
+    print(f"[llm-code-review] fetching MR description from {mr_url}")
+    try:
+        resp = _stage(
+            "gitlab.mr_fetch",
+            get_http_client().get,
+            mr_url,
+            headers={"PRIVATE-TOKEN": token},
+            timeout=10,
+        )
+        if not resp.ok:
+            print(
+                f"[llm-code-review] WARN: failed to fetch MR (status={resp.status_code}) – continuing without ticket context",
+                file=sys.stderr,
+            )
+            return None
+        try:
+            mr_data = resp.json()
+        except ValueError:
+            mr_data = {}
+        description = str(mr_data.get("description") or "")
+        print(f"[llm-code-review] MR description: {description}")
+        if not description:
+            return None
+        issue_bodies = collect_issue_descriptions(
+            description,
+            api_url=api_url,
+            project_id=project_id,
+            token=token,
+        )
+        return build_ticket_context_from_asana(
+            description,
+            extra_texts=issue_bodies,
+        )
+    except Exception as exc:  # pragma: no cover - 방어적 로깅
+        print(
+            f"[llm-code-review] WARN: exception while fetching MR description: {exc}",
+            file=sys.stderr,
+        )
+        return None
+
+
+def merge_request_head_sha(commit_sha: str) -> str:
+    """MR의 소스 브랜치 head SHA. merged results 파이프라인의 CI_COMMIT_SHA는 임시 머지 커밋이라 MR head와 다르다."""
+    return os.getenv("CI_MERGE_REQUEST_SOURCE_BRANCH_SHA", "").strip() or commit_sha
+
+
+def claim_review_lease(commit_sha: str, *, api_url: str, project_id: str, mr_iid: str, token: str):
+    """project+MR 리스를 잡아 더 새로운 push가 오면 이 리뷰가 멈추게 한다.
+
+    commit_sha가 이미 MR의 현재 head가 아니면(재시도된 이전 파이프라인) 리스를 넘겨받지 않고 바로 대체된 상태로 시작한다.
+    """
+    from ai_review_bot.supersede import LeaseStore, SupersedeGuard, debounce_seconds_from_env, lease_key
+    from ai_review_bot.support.gitlab import fetch_merge_request_head_sha
+
+    def latest_head_sha() -> str | None:
+        return fetch_merge_request_head_sha(api_url=api_url, project_id=project_id, mr_iid=mr_iid, token=token)
+
+    store = LeaseStore.from_env()
+    return SupersedeGuard(
+        store,
+        store.claim(lease_key(api_url, project_id, mr_iid), commit_sha, latest_head_sha=latest_head_sha()),
+        latest_head_sha=latest_head_sha,
+        debounce_seconds=debounce_seconds_from_env(),
+    )
 
 
 def main():
     _configure_sys_path()
 
+    from ai_review_bot.metrics import configure_from_env, write_metrics
+
+    configure_from_env()
+    try:
+        _run()
+    finally:
+        write_metrics()
+
+
+def _run():
+
+    from ai_review_bot.incremental import (
+        build_incremental_note,
+        build_review_marker,
+        carry_forward_findings,
+        changed_paths,
+    )
     from ai_review_bot.review import ReviewContext
     from ai_review_bot.review_service import ReviewService
-    from ai_review_bot.support.asana import build_ticket_context_from_asana
+    from ai_review_bot.support.review_cache import ReviewCache
 
     # 필수 환경변수 확인
     target_branch = require_env("CI_MERGE_REQUEST_TARGET_BRANCH_NAME")
-    commit_sha = require_env("CI_COMMIT_SHA")
+    # merged results 파이프라인의 CI_COMMIT_SHA는 임시 머지 커밋이라, 리스·diff·리뷰 마커 모두 MR head SHA를 쓴다.
+    # 그래야 다음 파이프라인에서 마커의 SHA가 조상으로 확인돼 증분 리뷰가 이어진다.
+    commit_sha = merge_request_head_sha(require_env("CI_COMMIT_SHA"))
     project_id = require_env("CI_PROJECT_ID")
     mr_iid = require_env("CI_MERGE_REQUEST_IID")
     ci_api_v4_url = require_env("CI_API_V4_URL")
     gitlab_token = require_env("GITLAB_TOKEN")
 
     project_name = os.getenv("LLM_REVIEW_PROJECT_NAME", "kop-web")
+    gitlab = {"api_url": ci_api_v4_url, "project_id": project_id, "mr_iid": mr_iid, "token": gitlab_token}
+
+    # 0) 같은 MR에 더 새로운 push가 있으면(또는 debounce 동안 들어오면) 이 리뷰는 건너뛴다
+    guard = claim_review_lease(commit_sha, **gitlab)
+    if guard.wait_debounce():
+        return
 
-    # 1) diff 생성
-    diff_text = generate_diff(target_branch, commit_sha)
+    # 1~3) diff 생성(증분 모드면 마지막 리뷰 이후 변경분만), AGENTS.md 로드, MR/이슈/Asana 티켓 수집을 동시에 진행
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        diff_future = pool.submit(_stage, "stage.prepare_diff", prepare_diff, target_branch, commit_sha, **gitlab)
+        overview_future = pool.submit(_stage, "stage.load_overview", load_project_overview)
+        ticket_future = pool.submit(_stage, "stage.ticket_context", collect_ticket_context, **gitlab)
+        project_overview = _optional_context(overview_future, "project overview")
+        ticket_context = _optional_context(ticket_future, "ticket context")
+        prepared = diff_future.result()
+
+    if prepared is None:
+        return
+    diff_output, previous_review = prepared
+    diff_text = diff_output.text
     if not diff_text.strip():
         # diff 없으면 짧게 코멘트 하나 남기고 종료해도 되고, 그냥 조용히 끝내도 됨
         body = "자동 코드리뷰: 변경된 코드가 없어 리뷰할 내용이 없습니다."
         # 필요 없다면 아래 줄 주석 처리
-        post_comment_to_gitlab(body)
+        _stage("stage.post_comment", post_comment_to_gitlab, body)
         # 파일은 그래도 남겨두면 디버깅에 편함
-        with open("/workspace/llm_review.txt", "w", encoding="utf-8") as f:
+        with open(_REVIEW_PATH, "w", encoding="utf-8") as f:
             f.write(body)
         return
 
-    # 2) 레포지토리 루트의 AGENTS.md에서 프로젝트 개요 로드 (있을 경우)
-    project_overview: str | None = None
-    agents_path = Path("/workspace") / "AGENTS.md"
-    if agents_path.exists():
-        print(f"[llm-code-review] loading project overview from {agents_path}")
-        try:
-            project_overview = agents_path.read_text(encoding="utf-8")
-        except Exception as exc:  # pragma: no cover - 방어적 로깅
-            print(
-                f"[llm-code-review] WARN: failed to read AGENTS.md: {exc}",
-                file=sys.stderr,
-            )
-
-    # 3) GitLab MR description에서 Asana 티켓 컨텍스트 수집
-    ticket_context: str | None = None
-    issue_bodies: list[str] = []
-    mr_url = f"{ci_api_v4_url}/projects/{project_id}/merge_requests/{mr_iid}"
-    print(f"[llm-code-review] fetching MR description from {mr_url}")
-    try:
-        resp = requests.get(
-            mr_url,
-            headers={"PRIVATE-TOKEN": gitlab_token},
-            timeout=10,
-        )
-        if not resp.ok:
-            print(
-                f"[llm-code-review] WARN: failed to fetch MR (status={resp.status_code}) – continuing without ticket context",
-                file=sys.stderr,
-            )
-        else:
-            try:
-                mr_data = resp.json()
-            except ValueError:
-                mr_data = {}
-            description = str(mr_data.get("description") or "")
-            print(f"[llm-code-review] MR description: {description}")
-            if description:
-                from ai_review_bot.support.gitlab import collect_issue_descriptions
-
-                issue_bodies = collect_issue_descriptions(
-                    description,
-                    api_url=ci_api_v4_url,
-                    project_id=project_id,
-                    token=gitlab_token,
-                )
-                ticket_context = build_ticket_context_from_asana(
-                    description,
-                    extra_texts=issue_bodies,
-                )
-    except Exception as exc:  # pragma: no cover - 방어적 로깅
-        print(
-            f"[llm-code-review] WARN: exception while fetching MR description: {exc}",
-            file=sys.stderr,
-        )
+    if guard.superseded("the LLM call"):
+        return
 
-    # 4) OpenAI 호출
-    review_text = ReviewService().create_review(
+    # 4) OpenAI 호출 (LLM_REVIEW_CACHE_DIR이 있으면 같은 입력의 이전 결과를 재사용)
+    review_text = _stage(
+        "stage.review",
+        ReviewService(cache=ReviewCache.from_env()).create_review,
         ReviewContext(
             project_name=project_name,
             pr_number=mr_iid,
             diff=diff_text,
             ticket_context=ticket_context,
             project_overview=project_overview,
-        )
+            omitted_paths=diff_output.skipped_paths,
+        ),
     )
 
-    # 5) 결과 파일로 저장 (CI artifact 용)
-    review_path = "/workspace/llm_review.txt"
-    print(f"[llm-code-review] writing review to {review_path}")
-    with open(review_path, "w", encoding="utf-8") as f:
-        f.write(review_text)
-
-    # 6) GitLab MR 코멘트 등록
-    post_comment_to_gitlab(review_text)
+    footer = []
+    if previous_review:
+        review_text, carried_count = carry_forward_findings(previous_review.report, review_text, changed_paths(diff_text))
+        footer.append(build_incremental_note(previous_review.sha, commit_sha, carried_count))
+    if diff_output.skipped_paths:
+        footer.append(build_skipped_note(diff_output.skipped_paths))
+    footer.append(build_review_marker(commit_sha))
+
+    # 5) 결과 파일로 저장 (CI artifact 용, 인라인 모드에서도 전체 리포트)
+    print(f"[llm-code-review] writing review to {_REVIEW_PATH}")
+    with open(_REVIEW_PATH, "w", encoding="utf-8") as f:
+        f.write(_with_footer(review_text, footer))
+
+    # 6) GitLab MR 코멘트 등록 (인라인 모드면 diff 안의 지적은 해당 라인 토론으로, 나머지는 요약 코멘트로)
+    if guard.superseded("posting the review"):
+        return
+    if is_inline_enabled():
+        mr_diff = merge_request_diff(diff_text, previous_review, target_branch, commit_sha)
+        review_text = _stage("stage.inline_discussions", post_inline_findings, review_text, mr_diff, **gitlab)
+    _stage("stage.post_comment", post_comment_to_gitlab, _with_footer(review_text, footer))
 
     print("[llm-code-review] complete.")
 
 
+def _optional_context(future, label: str):
+    """보조 컨텍스트(AGENTS.md, 티켓) 작업의 결과. 실패해도 리뷰는 계속하되 원인은 WARN으로 남긴다."""
+    try:
+        return future.result()
+    except Exception as exc:
+        print(f"[llm-code-review] WARN: failed to load {label}: {exc} – continuing without it", file=sys.stderr)
+        return None
+
+
+def build_skipped_note(paths) -> str:
+    """diff 크기 상한(LLM_REVIEW_DIFF_MAX_BYTES) 때문에 리뷰하지 못한 파일을 알리는 코멘트 꼬리말."""
+    listed = ", ".join(f"`{path}`" for path in paths[:_LISTED_SKIPPED_PATHS])
+    more = f" 외 {len(paths) - _LISTED_SKIPPED_PATHS}개" if len(paths) > _LISTED_SKIPPED_PATHS else ""
+    return f"> ⚠️ diff가 크기 상한을 넘어 다음 파일 {len(paths)}개는 리뷰하지 못했습니다: {listed}{more}"
+
+
+def _with_footer(review_text: str, footer: list[str]) -> str:
+    return "\n\n".join([review_text.rstrip(), *footer]) + "\n"
+
+
 if __name__ == "__main__":
     main()
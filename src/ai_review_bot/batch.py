@@ -0,0 +1,144 @@
+"""JSONL 매니페스트로 여러 리뷰를 한 프로세스에서 실행하는 배치 모드."""
+
+from __future__ import annotations
+
+import json
+import sys
+import time
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from ai_review_bot.review import ReviewContext, TokenUsage
+from ai_review_bot.review_service import ReviewService
+
+
+@dataclass(frozen=True)
+class BatchJob:
+    """매니페스트 한 줄에 해당하는 리뷰 작업.
+
+    매니페스트를 읽지 못한 줄은 error에 이유를 담아 실행 없이 실패로 기록한다.
+    """
+
+    id: str
+    project: str = ""
+    pr_number: str = ""
+    diff: str = ""
+    ticket_context: str | None = None
+    project_overview: str | None = None
+    error: str | None = None
+
+
+def load_jobs(lines: Iterable[str], *, base_dir: Path | None = None) -> Iterator[BatchJob]:
+    """JSONL 매니페스트를 BatchJob으로 읽는다.
+
+    각 줄은 `project`, `pr_number`와 `diff` 또는 `diff_file`(매니페스트 위치 기준 상대 경로)을 가진다.
+    `id`를 생략하면 `line-<줄 번호>`를 쓴다. 빈 줄과 `#` 주석 줄은 건너뛴다.
+    """
+    for line_no, line in enumerate(lines, start=1):
+        stripped = line.strip()
+        if not stripped or stripped.startswith("#"):
+            continue
+        fallback_id = f"line-{line_no}"
+        try:
+            entry = json.loads(stripped)
+        except ValueError as exc:
+            yield BatchJob(id=fallback_id, error=f"매니페스트 JSON을 읽을 수 없습니다: {exc}")
+            continue
+        if not isinstance(entry, dict):
+            yield BatchJob(id=fallback_id, error="매니페스트 항목은 JSON 객체여야 합니다.")
+            continue
+        yield _build_job(entry, fallback_id, base_dir)
+
+
+def run_batch(service: ReviewService, jobs: Iterable[BatchJob], *, concurrency: int = 4) -> Iterator[dict[str, Any]]:
+    """작업을 최대 concurrency개씩 실행하고 결과 행을 입력 순서대로 돌려준다.
+
+    한 작업의 실패는 해당 행의 status=error로만 기록하고 나머지 작업은 계속 진행한다.
+    """
+    with ThreadPoolExecutor(max_workers=max(concurrency, 1)) as pool:
+        yield from pool.map(lambda job: _run_job(service, job), jobs)
+
+
+class BatchTotals:
+    """결과 행을 모아 배치 전체와 프로젝트별 토큰·비용 합계를 낸다."""
+
+    def __init__(self) -> None:
+        self.ok = 0
+        self.error = 0
+        self.usage = TokenUsage()
+        self.cost_usd = 0.0
+        self.cost_by_project: dict[str, float] = {}
+
+    def add(self, row: dict[str, Any]) -> None:
+        if row["status"] != "ok":
+            self.error += 1
+            return
+        self.ok += 1
+        self.usage += TokenUsage(**row["usage"])
+        cost = row.get("cost_usd") or 0.0
+        self.cost_usd += cost
+        self.cost_by_project[row["project"]] = self.cost_by_project.get(row["project"], 0.0) + cost
+
+    def render(self) -> str:
+        by_project = ", ".join(f"{project}=${cost:.4f}" for project, cost in sorted(self.cost_by_project.items(), key=lambda item: -item[1]))
+        return (
+            f"ok={self.ok} error={self.error} input={self.usage.input_tokens} cached={self.usage.cached_tokens} "
+            f"output={self.usage.output_tokens} reasoning={self.usage.reasoning_tokens} cost≈${self.cost_usd:.4f}" + (f" ({by_project})" if by_project else "")
+        )
+
+
+def _build_job(entry: dict[str, Any], fallback_id: str, base_dir: Path | None) -> BatchJob:
+    job_id = str(entry.get("id") or fallback_id)
+    diff = entry.get("diff")
+    diff_file = entry.get("diff_file")
+    if diff is None and diff_file:
+        path = Path(diff_file)
+        if base_dir is not None and not path.is_absolute():
+            path = base_dir / path
+        try:
+            diff = path.read_text(encoding="utf-8")
+        except OSError as exc:
+            return BatchJob(id=job_id, error=f"diff 파일을 읽을 수 없습니다: {exc}")
+    return BatchJob(
+        id=job_id,
+        project=str(entry.get("project") or ""),
+        pr_number=str(entry.get("pr_number") or ""),
+        diff=str(diff or ""),
+        ticket_context=entry.get("ticket_context"),
+        project_overview=entry.get("project_overview"),
+    )
+
+
+def _run_job(service: ReviewService, job: BatchJob) -> dict[str, Any]:
+    row: dict[str, Any] = {"id": job.id, "project": job.project, "pr_number": job.pr_number, "diff_bytes": len(job.diff.encode("utf-8"))}
+    if job.error:
+        return {**row, "status": "error", "latency_seconds": 0.0, "error": job.error}
+
+    context = ReviewContext(
+        project_name=job.project,
+        pr_number=job.pr_number,
+        diff=job.diff,
+        ticket_context=job.ticket_context,
+        project_overview=job.project_overview,
+    )
+    started = time.perf_counter()
+    try:
+        result = service.review(context)
+    except Exception as exc:  # 한 작업의 실패가 배치 전체를 멈추지 않게 한다
+        latency = round(time.perf_counter() - started, 3)
+        print(f"[llm-code-review] ERROR: batch job {job.id} failed: {exc}", file=sys.stderr)
+        return {**row, "status": "error", "latency_seconds": latency, "error": str(exc)}
+    latency = round(time.perf_counter() - started, 3)
+    return {
+        **row,
+        "status": "ok",
+        "latency_seconds": latency,
+        "cached": result.cached,
+        "model": result.model,
+        "usage": result.usage.to_dict(),
+        "cost_usd": round(result.cost_usd, 6) if result.cost_usd is not None else None,
+        "report": result.report,
+    }
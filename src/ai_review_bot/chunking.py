@@ -0,0 +1,52 @@
+"""대용량 diff를 리뷰 단위 묶음으로 나누는 로직."""
+
+from __future__ import annotations
+
+from ai_review_bot.diff import DiffFile, parse_diff
+
+
+def split_diff(diff: str, max_chars: int) -> list[str]:
+    """diff를 파일/헝크 경계 기준으로 max_chars 이하 묶음으로 나눈다.
+
+    - 여러 파일은 예산 안에서 하나의 묶음으로 합친다.
+    - 예산보다 큰 파일은 헝크 단위로 쪼개고, 각 조각에 파일 헤더를 다시 붙인다.
+    - 단일 헝크가 예산을 넘으면 더 쪼개지 않고 그대로 하나의 묶음으로 둔다.
+    """
+    if max_chars <= 0 or len(diff) <= max_chars:
+        return [diff]
+
+    pieces: list[str] = []
+    for file in parse_diff(diff):
+        # 첫 파일 이전의 머리말(예: format-patch 헤더)은 첫 조각에 포함해 잃지 않는다.
+        start = file.start if pieces else 0
+        if file.end - start <= max_chars or not file.hunks:
+            pieces.append(diff[start : file.end])
+        else:
+            pieces.extend(_split_file_by_hunk(diff, file, start, max_chars))
+
+    return _pack(pieces, max_chars) if pieces else [diff]
+
+
+def _split_file_by_hunk(diff: str, file: DiffFile, start: int, max_chars: int) -> list[str]:
+    """파일 diff를 헝크 묶음으로 나누고 각 묶음 앞에 파일 헤더를 반복한다."""
+    header = diff[start : file.hunks[0].start]
+    ends = [hunk.start for hunk in file.hunks[1:]] + [file.end]
+    hunks = [diff[hunk.start : end] for hunk, end in zip(file.hunks, ends, strict=True)]
+    budget = max(max_chars - len(header), 0)
+    return [header + group for group in _pack(hunks, budget)]
+
+
+def _pack(pieces: list[str], max_chars: int) -> list[str]:
+    """순서를 유지한 채 인접한 조각을 예산 안에서 합친다."""
+    groups: list[str] = []
+    current: list[str] = []
+    size = 0
+    for piece in pieces:
+        if current and size + len(piece) > max_chars:
+            groups.append("".join(current))
+            current, size = [], 0
+        current.append(piece)
+        size += len(piece)
+    if current:
+        groups.append("".join(current))
+    return groups
@@ -3,10 +3,16 @@
 from __future__ import annotations
 
 import argparse
+import contextlib
+import json
+import os
 import sys
 from pathlib import Path
 
+from ai_review_bot.metrics import configure_from_env, write_metrics
 from ai_review_bot.review_controller import ReviewController
+from ai_review_bot.review_service import ReviewService
+from ai_review_bot.support.review_cache import ReviewCache
 
 
 def parse_args(argv: list[str]) -> argparse.Namespace:
@@ -26,11 +32,59 @@ def parse_args(argv: list[str]) -> argparse.Namespace:
         type=Path,
         help="git diff 내용이 담긴 파일 경로. 생략하면 stdin을 사용합니다.",
     )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="모델 출력을 도착하는 대로 stderr에 표시합니다. 정리된 최종 리포트는 stdout에 씁니다.",
+    )
+    return parser.parse_args(argv)
+
+
+def parse_batch_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="ai-review-bot batch", description="Review many diffs listed in a JSONL manifest.")
+    parser.add_argument(
+        "--manifest",
+        required=True,
+        help="리뷰 작업 JSONL 파일 경로. '-'이면 stdin을 사용합니다.",
+    )
+    parser.add_argument(
+        "--output",
+        default="-",
+        help="결과 JSONL을 쓸 파일 경로. 생략하거나 '-'이면 stdout에 씁니다.",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=4,
+        help="동시에 실행할 리뷰 작업 수 (기본 4).",
+    )
+    return parser.parse_args(argv)
+
+
+def parse_serve_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="ai-review-bot serve", description="Serve GitLab merge request webhooks and post reviews.")
+    parser.add_argument("--host", default="0.0.0.0", help="바인드할 주소 (기본 0.0.0.0).")
+    parser.add_argument("--port", type=int, default=8080, help="수신 포트 (기본 8080).")
+    parser.add_argument("--workers", type=int, default=4, help="동시에 리뷰할 MR 수 (기본 4).")
+    parser.add_argument("--queue-size", type=int, default=100, help="대기할 수 있는 최대 작업 수. 넘치면 503을 반환합니다 (기본 100).")
     return parser.parse_args(argv)
 
 
 def main(argv: list[str] | None = None) -> int:
-    args = parse_args(argv or sys.argv[1:])
+    argv = argv if argv is not None else sys.argv[1:]
+    configure_from_env()
+    try:
+        if argv and argv[0] == "batch":
+            return batch_main(argv[1:])
+        if argv and argv[0] == "serve":
+            return serve_main(argv[1:])
+        return review_main(argv)
+    finally:
+        write_metrics()
+
+
+def review_main(argv: list[str]) -> int:
+    args = parse_args(argv)
 
     diff_source = args.diff_file.read_text(encoding="utf-8") if args.diff_file else sys.stdin.read()
 
@@ -39,7 +93,70 @@ def main(argv: list[str] | None = None) -> int:
         project_name=args.project,
         pr_number=args.pr_number,
         raw_diff=diff_source,
+        on_delta=_write_progress if args.stream else None,
     )
+    if args.stream:
+        sys.stderr.write("\n")
     sys.stdout.write(report)
     sys.stdout.flush()
     return 0
+
+
+def _write_progress(delta: str) -> None:
+    sys.stderr.write(delta)
+    sys.stderr.flush()
+
+
+def batch_main(argv: list[str]) -> int:
+    """매니페스트의 작업을 공유 ReviewService 하나로 실행하고, 실패한 작업이 있으면 1을 돌려준다."""
+    from ai_review_bot.batch import BatchTotals, load_jobs, run_batch
+
+    args = parse_batch_args(argv)
+    if args.manifest == "-":
+        lines, base_dir = sys.stdin.read().splitlines(), Path.cwd()
+    else:
+        manifest = Path(args.manifest)
+        lines, base_dir = manifest.read_text(encoding="utf-8").splitlines(), manifest.parent
+
+    service = ReviewService()
+    totals = BatchTotals()
+    output_context = contextlib.nullcontext(sys.stdout) if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    # 진행 로그가 결과 JSONL과 섞이지 않도록 실행 중 stdout 출력을 stderr로 돌린다.
+    with output_context as output, contextlib.redirect_stdout(sys.stderr):
+        for row in run_batch(service, load_jobs(lines, base_dir=base_dir), concurrency=args.concurrency):
+            totals.add(row)
+            output.write(json.dumps(row, ensure_ascii=False) + "\n")
+            output.flush()
+    print(f"[llm-code-review] batch finished: {totals.render()}", file=sys.stderr)
+    return 1 if totals.error else 0
+
+
+def serve_main(argv: list[str]) -> int:
+    """GitLab MR 웹훅 서버를 띄운다. GITLAB_TOKEN·GITLAB_API_URL·LLM_REVIEW_WEBHOOK_SECRET(X-Gitlab-Token 검증)이 필요하다."""
+    # 서브커맨드 전용 모듈(http.server 등)은 단일 리뷰 실행의 시작 시간에 포함되지 않도록 여기서 가져온다.
+    from ai_review_bot.server import ReviewWorker, create_server
+
+    args = parse_serve_args(argv)
+    token = os.getenv("GITLAB_TOKEN", "").strip()
+    if not token:
+        print("[llm-code-review] ERROR: required env var GITLAB_TOKEN is missing", file=sys.stderr)
+        return 1
+    # 인증 없는 웹훅이나 페이로드가 정한 주소로 GITLAB_TOKEN이 새지 않도록 둘 다 없으면 시작하지 않는다.
+    secret = os.getenv("LLM_REVIEW_WEBHOOK_SECRET", "").strip()
+    api_url = os.getenv("GITLAB_API_URL", "").strip()
+    for name, value in (("LLM_REVIEW_WEBHOOK_SECRET", secret), ("GITLAB_API_URL", api_url)):
+        if not value:
+            print(f"[llm-code-review] ERROR: required env var {name} is missing", file=sys.stderr)
+            return 1
+
+    worker = ReviewWorker(ReviewService(cache=ReviewCache.from_env()), token=token, max_workers=args.workers, queue_size=args.queue_size)
+    server = create_server(worker, host=args.host, port=args.port, secret=secret, api_url=api_url)
+    print(f"[llm-code-review] serving GitLab webhooks on {args.host}:{server.server_port} (workers={args.workers})", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        worker.shutdown(wait=True)
+    return 0
@@ -0,0 +1,183 @@
+"""프롬프트를 만들기 전에 리뷰 신호가 없는 diff 부분을 덜어 내는 헝크 단위 압축 단계.
+
+- 공백으로 나눈 토큰이 그대로인 헝크(들여쓰기·줄바꿈·연속 공백만 바뀐 재포맷)는 빼고 파일 끝에 생략 안내 한 줄을 남긴다.
+  들여쓰기가 의미를 갖는 파일(Python, YAML 등)은 줄 끝 공백만 무시한다.
+- 내용 변경 없는 이름 변경은 `rename from/to` 헤더만, 삭제된 파일은 본문 대신 한 줄 안내만 남긴다.
+- 변경 줄에서 context줄보다 먼 문맥 줄은 버리고, 헝크를 나눠 헤더의 라인 번호를 다시 계산한다.
+  남은 줄의 라인 번호는 원본과 같으므로 모델의 `(파일:라인)` 참조가 그대로 맞는다.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+from dataclasses import dataclass
+from typing import Final
+
+from ai_review_bot.diff import DiffFile, DiffHunk, parse_diff
+from ai_review_bot.tokens import estimate_tokens
+
+_DEFAULT_CONTEXT: Final[int] = 3
+_DISABLED: Final[frozenset[str]] = frozenset({"off", "none", "false", "no"})
+_INDENT_SENSITIVE = re.compile(r"(?:\.(?:py|pyi|ya?ml|haml|pug|slim|coffee|sass|styl)|(?:^|/)Makefile)$")
+_BODY_MARKERS: Final[frozenset[str]] = frozenset({"+", "-", " "})
+_CHANGE_MARKERS: Final[frozenset[str]] = frozenset({"+", "-"})
+_HUNK_SUFFIX = re.compile(r"^@@ [^@]* @@(.*)$", re.DOTALL)
+# 파일 헤더에서 빼는 줄. blob 해시·유사도는 리뷰 신호가 없고, 나머지 헤더는 파서가 파일 구조를 읽도록 남긴다.
+_DROPPED_HEADERS: Final[tuple[str, ...]] = ("index ", "similarity index ", "dissimilarity index ")
+
+
+@dataclass(frozen=True)
+class CompactedDiff:
+    """압축한 diff와 전후 토큰 수, 덜어 낸 항목 수."""
+
+    diff: str
+    tokens_before: int
+    tokens_after: int
+    whitespace_hunks: int = 0
+    renames: int = 0
+    deleted_files: int = 0
+    context_lines: int = 0
+
+    @property
+    def saved_ratio(self) -> float:
+        return 1 - self.tokens_after / self.tokens_before if self.tokens_before else 0.0
+
+
+@dataclass
+class _Stats:
+    whitespace_hunks: int = 0
+    renames: int = 0
+    deleted_files: int = 0
+    context_lines: int = 0
+
+
+def compact_diff(diff: str, *, context: int = _DEFAULT_CONTEXT) -> CompactedDiff:
+    """diff를 파일·헝크 단위로 압축한다. 파일 순서와 남은 줄의 라인 번호는 바뀌지 않는다."""
+    stats = _Stats()
+    parts: list[str] = []
+    last = 0
+    for file in parse_diff(diff):
+        parts.append(diff[last : file.start])
+        parts.append(_compact_file(diff, file, max(context, 0), stats))
+        last = file.end
+    parts.append(diff[last:])
+    compacted = "".join(parts)
+    return CompactedDiff(
+        diff=compacted,
+        tokens_before=estimate_tokens(diff),
+        tokens_after=estimate_tokens(compacted),
+        whitespace_hunks=stats.whitespace_hunks,
+        renames=stats.renames,
+        deleted_files=stats.deleted_files,
+        context_lines=stats.context_lines,
+    )
+
+
+def compaction_context_from_env() -> int | None:
+    """LLM_REVIEW_DIFF_CONTEXT(기본 3): 변경 줄 주변에 남길 문맥 줄 수. `off`면 압축하지 않는다(None)."""
+    value = os.getenv("LLM_REVIEW_DIFF_CONTEXT", "").strip().lower()
+    if value in _DISABLED:
+        return None
+    return int(value) if value.isdigit() else _DEFAULT_CONTEXT
+
+
+def _compact_file(diff: str, file: DiffFile, context: int, stats: _Stats) -> str:
+    body_start = file.hunks[0].start if file.hunks else file.end
+    header = "".join(line for line in diff[file.start : body_start].splitlines(keepends=True) if not line.startswith(_DROPPED_HEADERS))
+    if file.is_deleted:
+        stats.deleted_files += 1
+        return f"{header}(삭제된 파일: 본문 {file.removed}줄 생략)\n" if file.hunks else header
+    if file.is_rename and not file.hunks:
+        stats.renames += 1
+        return header
+
+    hunks: list[str] = []
+    skipped = 0
+    indent_sensitive = bool(_INDENT_SENSITIVE.search(file.path))
+    for hunk in file.hunks:
+        text = diff[hunk.start : hunk.end]
+        lines = text.splitlines(keepends=True)
+        if _whitespace_only(lines[1:], indent_sensitive):
+            skipped += 1
+            continue
+        hunks.append(_shrink_context(hunk, lines, context, stats))
+    stats.whitespace_hunks += skipped
+    body = "".join(hunks)
+    if skipped:
+        body = f"{body}\n" if body and not body.endswith("\n") else body
+        body += f"(공백·줄바꿈만 바뀐 헝크 {skipped}개 생략)\n"
+    return header + body
+
+
+def _whitespace_only(body: list[str], indent_sensitive: bool) -> bool:
+    removed = [line[1:] for line in body if line.startswith("-")]
+    added = [line[1:] for line in body if line.startswith("+")]
+    if not removed and not added:
+        return False
+    if indent_sensitive:
+        return [line.rstrip() for line in removed if line.strip()] == [line.rstrip() for line in added if line.strip()]
+    # 공백을 모두 지우고 비교하면 `"Hello World"` → `"HelloWorld"`, `return x` → `returnx` 같은 실제 변경까지 사라지므로
+    # 공백으로 나눈 토큰 열이 같을 때(들여쓰기·줄바꿈·연속 공백만 바뀐 경우)만 생략한다.
+    return "".join(removed).split() == "".join(added).split()
+
+
+def _shrink_context(hunk: DiffHunk, lines: list[str], context: int, stats: _Stats) -> str:
+    """변경 줄에서 context줄 넘게 떨어진 문맥 줄을 버리고, 남은 연속 구간마다 헤더를 다시 만든다."""
+    if hunk.old_count - hunk.removed <= context:
+        # 문맥 줄이 context개 이하면 어느 줄도 변경 줄에서 context줄 넘게 떨어질 수 없다.
+        return "".join(lines)
+    body = lines[1:]
+    markers = [line[:1] if line[:1] in _BODY_MARKERS else (" " if line in ("\n", "\r\n") else "\\") for line in body]
+    counted = hunk.old_count + hunk.added
+    if len(markers) - markers.count("\\") > counted:
+        # 헤더 줄 수를 다 쓴 뒤의 줄(끝의 빈 줄 등)은 본문이 아니므로 직전 줄에 붙인다.
+        seen = 0
+        for index, marker in enumerate(markers):
+            if marker != "\\":
+                seen += 1
+                if seen > counted:
+                    markers[index] = "\\"
+
+    keep = [False] * len(markers)
+    for index, marker in enumerate(markers):
+        if marker in _CHANGE_MARKERS:
+            low = max(index - context, 0)
+            keep[low : index + context + 1] = [True] * (min(index + context + 1, len(keep)) - low)
+    for index, marker in enumerate(markers):
+        if marker == "\\":
+            keep[index] = index > 0 and keep[index - 1]
+    if all(keep):
+        return "".join(lines)
+    stats.context_lines += sum(1 for kept, marker in zip(keep, markers, strict=True) if not kept and marker == " ")
+
+    match = _HUNK_SUFFIX.match(lines[0].rstrip("\r\n"))
+    suffix = match.group(1) if match else ""
+    parts: list[str] = []
+    run: list[str] = []
+    old_line, new_line = hunk.old_start, hunk.new_start
+    run_old = run_new = old_count = new_count = 0
+    for index, (line, marker) in enumerate(zip(body, markers, strict=True)):
+        if keep[index]:
+            if not run:
+                run_old, run_new, old_count, new_count = old_line, new_line, 0, 0
+            run.append(line)
+            old_count += marker in (" ", "-")
+            new_count += marker in (" ", "+")
+        elif run:
+            parts.append(_hunk_header(run_old, old_count, run_new, new_count, suffix if not parts else ""))
+            parts.extend(run)
+            run = []
+        old_line += marker in (" ", "-")
+        new_line += marker in (" ", "+")
+    if run:
+        parts.append(_hunk_header(run_old, old_count, run_new, new_count, suffix if not parts else ""))
+        parts.extend(run)
+    return "".join(parts)
+
+
+def _hunk_header(old_start: int, old_count: int, new_start: int, new_count: int, suffix: str) -> str:
+    # git 규약: 한쪽 줄 수가 0이면 시작 번호는 그 앞 줄이다.
+    old_start = old_start if old_count else old_start - 1
+    new_start = new_start if new_count else new_start - 1
+    return f"@@ -{old_start},{old_count} +{new_start},{new_count} @@{suffix}\n"
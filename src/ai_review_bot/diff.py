@@ -0,0 +1,242 @@
+"""Unified diff를 파일/헝크 단위 레코드로 읽어 들이는 스트리밍 파서.
+
+레코드는 경로·플래그·라인 범위와 원본 버퍼 내 오프셋만 담는다. 본문이 필요하면
+오프셋으로 원본을 잘라 쓰므로, 수백 MB diff도 사본을 여러 벌 만들지 않고 훑을 수 있다.
+"""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from typing import IO
+
+_HUNK_HEADER = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+_DEV_NULL = "/dev/null"
+
+
+@dataclass(frozen=True, slots=True)
+class DiffHunk:
+    """헝크 하나의 라인 범위와 원본 오프셋."""
+
+    old_start: int
+    old_count: int
+    new_start: int
+    new_count: int
+    added: int
+    removed: int
+    start: int
+    end: int
+
+
+@dataclass(frozen=True, slots=True)
+class DiffFile:
+    """파일 하나의 diff 메타데이터와 원본 오프셋."""
+
+    old_path: str | None
+    new_path: str | None
+    is_new: bool
+    is_deleted: bool
+    is_rename: bool
+    is_binary: bool
+    start: int
+    end: int
+    hunks: tuple[DiffHunk, ...]
+
+    @property
+    def path(self) -> str:
+        return self.new_path or self.old_path or ""
+
+    @property
+    def added(self) -> int:
+        return sum(hunk.added for hunk in self.hunks)
+
+    @property
+    def removed(self) -> int:
+        return sum(hunk.removed for hunk in self.hunks)
+
+
+def parse_diff(text: str) -> Iterator[DiffFile]:
+    """문자열 diff를 파싱한다. 오프셋은 문자 인덱스라 `text[f.start:f.end]`로 자를 수 있다."""
+    return _parse(_iter_text_lines(text))
+
+
+def iter_diff_files(stream: IO[bytes]) -> Iterator[DiffFile]:
+    """바이너리 스트림(파일, `sys.stdin.buffer`)을 한 줄씩 읽으며 파싱한다. 오프셋은 바이트 단위다."""
+    return _parse(_iter_stream_lines(stream))
+
+
+def _iter_text_lines(text: str) -> Iterator[tuple[int, int, str]]:
+    start = 0
+    length = len(text)
+    while start < length:
+        newline = text.find("\n", start)
+        end = length if newline == -1 else newline + 1
+        yield start, end, text[start:end]
+        start = end
+
+
+def _iter_stream_lines(stream: IO[bytes]) -> Iterator[tuple[int, int, str]]:
+    offset = 0
+    for raw in iter(stream.readline, b""):
+        end = offset + len(raw)
+        yield offset, end, raw.decode("utf-8", errors="replace")
+        offset = end
+
+
+def _strip_prefix(path: str) -> str | None:
+    path = path.strip().split("\t", 1)[0]
+    if path == _DEV_NULL:
+        return None
+    if path.startswith(("a/", "b/")):
+        return path[2:]
+    return path
+
+
+class _FileBuilder:
+    """파일 레코드를 만들기 위한 가변 상태."""
+
+    def __init__(self, start: int, old_path: str | None = None, new_path: str | None = None) -> None:
+        self.start = start
+        self.old_path = old_path
+        self.new_path = new_path
+        self.is_new = False
+        self.is_deleted = False
+        self.is_rename = False
+        self.is_binary = False
+        self.hunks: list[DiffHunk] = []
+        # 진행 중인 헝크 헤더: (old_start, old_count, new_start, new_count, start)
+        self.hunk: tuple[int, int, int, int, int] | None = None
+        self.added = 0
+        self.removed = 0
+        self.old_left = 0
+        self.new_left = 0
+
+    @property
+    def in_hunk_body(self) -> bool:
+        return self.hunk is not None and (self.old_left > 0 or self.new_left > 0)
+
+    def close_hunk(self, end: int) -> None:
+        if self.hunk is None:
+            return
+        old_start, old_count, new_start, new_count, start = self.hunk
+        self.hunks.append(DiffHunk(old_start, old_count, new_start, new_count, self.added, self.removed, start, end))
+        self.hunk = None
+
+    def open_hunk(self, old_start: int, old_count: int, new_start: int, new_count: int, start: int) -> None:
+        self.close_hunk(start)
+        self.hunk = (old_start, old_count, new_start, new_count, start)
+        self.added = self.removed = 0
+        self.old_left, self.new_left = old_count, new_count
+
+    def build(self, end: int) -> DiffFile:
+        self.close_hunk(end)
+        return DiffFile(
+            old_path=self.old_path,
+            new_path=self.new_path,
+            is_new=self.is_new,
+            is_deleted=self.is_deleted,
+            is_rename=self.is_rename,
+            is_binary=self.is_binary,
+            start=self.start,
+            end=end,
+            hunks=tuple(self.hunks),
+        )
+
+
+def _parse(lines: Iterable[tuple[int, int, str]]) -> Iterator[DiffFile]:
+    current: _FileBuilder | None = None
+    last_end = 0
+
+    for start, end, line in lines:
+        last_end = end
+
+        if current is not None and current.in_hunk_body:
+            marker = line[:1]
+            if marker == "+":
+                current.new_left -= 1
+                current.added += 1
+                continue
+            if marker == "-":
+                current.old_left -= 1
+                current.removed += 1
+                continue
+            if marker == " " or line in ("\n", "\r\n"):
+                current.old_left -= 1
+                current.new_left -= 1
+                continue
+            if marker != "\\":
+                # 헤더 카운트보다 본문이 짧은 손상된 헝크: 본문을 끝내고 헤더로 해석한다.
+                current.old_left = current.new_left = 0
+
+        if line.startswith("diff --git "):
+            if current is not None:
+                yield current.build(start)
+            old_path, new_path = _paths_from_git_header(line)
+            current = _FileBuilder(start, old_path, new_path)
+            continue
+
+        if line.startswith("--- ") and (current is None or current.hunk is not None):
+            # `diff -u`처럼 diff --git 헤더가 없는 형식은 --- 줄이 새 파일의 시작이다.
+            if current is not None:
+                yield current.build(start)
+            current = _FileBuilder(start)
+
+        if current is None:
+            continue
+
+        if line.startswith("@@"):
+            match = _HUNK_HEADER.match(line)
+            if not match:
+                continue
+            old_start, old_count, new_start, new_count = match.groups()
+            current.open_hunk(
+                int(old_start),
+                1 if old_count is None else int(old_count),
+                int(new_start),
+                1 if new_count is None else int(new_count),
+                start,
+            )
+        elif current.hunk is not None:
+            # 헝크 본문 뒤의 `\ No newline at end of file` 등은 직전 헝크에 포함한다.
+            continue
+        elif line.startswith("--- "):
+            current.old_path = _strip_prefix(line[4:])
+            current.is_new = current.is_new or current.old_path is None
+        elif line.startswith("+++ "):
+            current.new_path = _strip_prefix(line[4:])
+            current.is_deleted = current.is_deleted or current.new_path is None
+        elif line.startswith("new file mode"):
+            current.is_new = True
+        elif line.startswith("deleted file mode"):
+            current.is_deleted = True
+        elif line.startswith("rename from "):
+            current.is_rename = True
+            current.old_path = line[len("rename from ") :].rstrip("\r\n")
+        elif line.startswith("rename to "):
+            current.is_rename = True
+            current.new_path = line[len("rename to ") :].rstrip("\r\n")
+        elif line.startswith(("Binary files ", "GIT binary patch")):
+            current.is_binary = True
+
+    if current is not None:
+        yield current.build(last_end)
+
+
+def _paths_from_git_header(line: str) -> tuple[str | None, str | None]:
+    """`diff --git a/x b/y` 헤더에서 경로를 추정한다.
+
+    rename from/to와 ---/+++ 줄이 뒤따르면 그 값으로 덮어쓴다. 경로에 공백이 들어가면 헤더만으로는
+    경계가 모호하므로, 양쪽 길이가 같으면(이름이 안 바뀐 파일) 가운데서 자르고, 그 밖에는
+    `" b/"`가 한 번만 나올 때만 그 위치를 믿는다.
+    """
+    body = line[len("diff --git ") :].rstrip("\r\n")
+    if not body.startswith("a/"):
+        return None, None
+    middle = len(body) // 2
+    if len(body) % 2 == 1 and body[middle : middle + 3] == " b/" and body[2:middle] == body[middle + 3 :]:
+        return body[2:middle], body[middle + 3 :]
+    if body.count(" b/") == 1:
+        old, _, new = body.partition(" b/")
+        return old[2:], new
+    return None, None
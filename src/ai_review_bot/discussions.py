@@ -0,0 +1,166 @@
+"""리뷰 지적을 MR diff의 해당 라인에 인라인 토론(discussion)으로 남기는 로직.
+
+GitLab 인라인 토론은 `position`(base/start/head SHA와 파일 경로, 변경 전후 라인 번호)이 diff 안의 라인을
+정확히 가리켜야 한다. diff를 한 번 훑어 "변경 후 파일 라인 → 변경 전 라인" 인덱스를 만들어 두고,
+지적의 `(파일:라인범위)`를 이 인덱스로 위치에 대응시킨다. diff 밖을 가리키는 지적은 요약 코멘트에 남긴다.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+from typing import Any, Final
+
+from ai_review_bot.diff import parse_diff
+from ai_review_bot.metrics import incr, span
+from ai_review_bot.report import IDEAS_TITLE, STABILITY_TITLE, ReviewIssue, ReviewReport
+from ai_review_bot.support.http import fetch_all
+
+_DEFAULT_CONCURRENCY: Final[int] = 4
+# 라인 범위가 비정상적으로 넓은 지적(파일 전체 등)에서 범위를 끝까지 훑지 않도록 제한한다.
+_MAX_RANGE: Final[int] = 500
+
+
+@dataclass(frozen=True)
+class _FileLines:
+    """파일 하나에서 인라인 코멘트를 달 수 있는 변경 후 라인. 값은 변경 전 라인 번호(추가된 줄이면 None)."""
+
+    old_path: str
+    new_path: str
+    lines: Mapping[int, int | None]
+
+
+class DiffPositionIndex:
+    """diff 한 건에서 미리 계산한 (변경 후 파일, 라인) → GitLab diff position 인덱스."""
+
+    def __init__(self, files: Mapping[str, _FileLines], *, base_sha: str, start_sha: str, head_sha: str) -> None:
+        self._files = dict(files)
+        self._base_sha = base_sha
+        self._start_sha = start_sha
+        self._head_sha = head_sha
+
+    @classmethod
+    def from_diff(cls, diff: str, diff_refs: Mapping[str, str]) -> DiffPositionIndex:
+        """unified diff의 헝크 본문을 한 번 훑어 인덱스를 만든다. 삭제·바이너리 파일은 건너뛴다.
+
+        diff_refs는 MR API의 `diff_refs`(base_sha, start_sha, head_sha)다.
+        """
+        files: dict[str, _FileLines] = {}
+        for file in parse_diff(diff):
+            if file.is_deleted or file.is_binary or not file.new_path:
+                continue
+            lines: dict[int, int | None] = {}
+            for hunk in file.hunks:
+                old_line, new_line = hunk.old_start, hunk.new_start
+                for line in diff[hunk.start : hunk.end].splitlines()[1:]:
+                    marker = line[:1]
+                    if marker == "+":
+                        lines[new_line] = None
+                        new_line += 1
+                    elif marker == "-":
+                        old_line += 1
+                    elif marker in (" ", ""):
+                        lines[new_line] = old_line
+                        old_line += 1
+                        new_line += 1
+            if lines:
+                files[file.new_path] = _FileLines(old_path=file.old_path or file.new_path, new_path=file.new_path, lines=lines)
+        return cls(
+            files,
+            base_sha=str(diff_refs.get("base_sha") or ""),
+            start_sha=str(diff_refs.get("start_sha") or ""),
+            head_sha=str(diff_refs.get("head_sha") or ""),
+        )
+
+    def position(self, path: str | None, line_start: int | None, line_end: int | None = None) -> dict[str, Any] | None:
+        """지적 위치를 GitLab `position`으로 바꾼다. diff 밖이면 None.
+
+        범위 안에 추가된 줄이 있으면 첫 추가 줄에, 없으면 첫 문맥(context) 줄에 단다.
+        파일명만 적힌 지적(`OrderService.ts`)은 diff 안에서 경로 끝부분이 하나로 정해질 때만 대응시킨다.
+        """
+        file = self._resolve(path)
+        if file is None or line_start is None:
+            return None
+        end = line_start if line_end is None or line_end < line_start else min(line_end, line_start + _MAX_RANGE)
+        candidates = [line for line in range(line_start, end + 1) if line in file.lines]
+        if not candidates:
+            return None
+        new_line = next((line for line in candidates if file.lines[line] is None), candidates[0])
+        position: dict[str, Any] = {
+            "position_type": "text",
+            "base_sha": self._base_sha,
+            "start_sha": self._start_sha,
+            "head_sha": self._head_sha,
+            "old_path": file.old_path,
+            "new_path": file.new_path,
+            "new_line": new_line,
+        }
+        old_line = file.lines[new_line]
+        if old_line is not None:
+            position["old_line"] = old_line
+        return position
+
+    def _resolve(self, path: str | None) -> _FileLines | None:
+        if not path:
+            return None
+        path = path.strip().removeprefix("./")
+        if path in self._files:
+            return self._files[path]
+        matches = [file for name, file in self._files.items() if name.endswith(f"/{path}")]
+        return matches[0] if len(matches) == 1 else None
+
+
+def post_inline_discussions(
+    report: ReviewReport,
+    index: DiffPositionIndex,
+    post: Callable[[str, Mapping[str, Any]], None],
+    *,
+    max_workers: int | None = None,
+) -> tuple[ReviewReport, int]:
+    """위치를 찾은 지적을 최대 max_workers개씩 동시에 인라인 토론으로 남긴다.
+
+    post(body, position)이 실패한 지적과 diff 밖의 지적은 남은 리포트에 그대로 둔다.
+    반환값은 (요약 코멘트에 남길 리포트, 인라인으로 남긴 지적 수)다.
+    """
+    targets = []
+    for number, issue in enumerate(report.issues):
+        position = index.position(issue.path, issue.line_start, issue.line_end)
+        if position is not None:
+            targets.append((number, issue, position))
+
+    def _post(target: tuple[int, ReviewIssue, dict[str, Any]]) -> bool:
+        _, issue, position = target
+        try:
+            post(_discussion_body(issue), position)
+        except Exception as exc:  # 실패한 지적은 요약 코멘트로 돌린다
+            incr("inline_discussion_failures")
+            print(f"[llm-code-review] WARN: failed to post inline discussion on {position['new_path']}:{position['new_line']}: {exc}", file=sys.stderr)
+            return False
+        return True
+
+    with span("gitlab.discussions_post", count=len(targets)):
+        results = fetch_all(_post, targets, max_workers=max_workers or inline_concurrency_from_env())
+    posted = {number for (number, _, _), ok in zip(targets, results, strict=True) if ok}
+    incr("inline_discussions_posted", len(posted))
+    remaining = tuple(issue for number, issue in enumerate(report.issues) if number not in posted)
+    return ReviewReport(issues=remaining, risks=report.risks, notes=report.notes, structured=report.structured), len(posted)
+
+
+def build_inline_note(report: ReviewReport, remaining: ReviewReport) -> str:
+    """요약 코멘트 꼬리말: 인라인 토론으로 옮긴 지적 수를 섹션별로 알려준다."""
+    stability = report.stability_count - remaining.stability_count
+    ideas = report.ideas_count - remaining.ideas_count
+    return f"> 💬 지적 {stability + ideas}건({STABILITY_TITLE} {stability}건, {IDEAS_TITLE} {ideas}건)은 해당 변경 라인에 인라인 토론으로 남겼습니다."
+
+
+def inline_concurrency_from_env() -> int:
+    """LLM_REVIEW_INLINE_CONCURRENCY(기본 4): 동시에 만들 인라인 토론 수 상한."""
+    value = os.getenv("LLM_REVIEW_INLINE_CONCURRENCY", "").strip()
+    return max(int(value), 1) if value.isdigit() else _DEFAULT_CONCURRENCY
+
+
+def _discussion_body(issue: ReviewIssue) -> str:
+    title = f"**{issue.section}** · {issue.domain}" if issue.domain else f"**{issue.section}**"
+    return f"{title}\n\n{issue.text.strip()}\n"
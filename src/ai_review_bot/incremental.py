@@ -0,0 +1,90 @@
+"""이전 리뷰 이후 변경분만 다시 리뷰하는 증분 리뷰 로직."""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from typing import Any, Final
+
+from ai_review_bot.diff import parse_diff
+from ai_review_bot.report import ReviewIssue, ReviewReport
+
+_MARKER_PATTERN = re.compile(r"<!-- ai-review-bot:reviewed-sha=(?P<sha>[0-9a-f]{7,40}) -->")
+_CARRIED_NOTE_PATTERN = re.compile(r"\n*^> 🔁 증분 리뷰:.*$", re.MULTILINE)
+_SHORT_SHA: Final[int] = 8
+
+
+@dataclass(frozen=True)
+class PreviousReview:
+    """봇이 마지막으로 남긴 리뷰 코멘트에서 읽은 정보."""
+
+    sha: str
+    report: str
+
+
+def build_review_marker(sha: str) -> str:
+    """코멘트에 숨겨 둘 마지막 리뷰 커밋 메타데이터(HTML 주석)."""
+    return f"<!-- ai-review-bot:reviewed-sha={sha} -->"
+
+
+def find_previous_review(notes: Iterable[Mapping[str, Any]], *, author: Mapping[str, Any]) -> PreviousReview | None:
+    """MR 노트 중 마커가 있는 가장 최근 봇 리뷰를 찾는다.
+
+    마커는 누구나 코멘트에 적을 수 있으므로 author(봇 계정의 `id`/`username`)가 남긴 노트만 믿는다.
+    """
+    latest: tuple[str, PreviousReview] | None = None
+    for note in notes:
+        if not _authored_by(note, author):
+            continue
+        body = str(note.get("body") or "")
+        match = _MARKER_PATTERN.search(body)
+        if not match:
+            continue
+        created_at = str(note.get("created_at") or "")
+        report = _MARKER_PATTERN.sub("", body)
+        report = _CARRIED_NOTE_PATTERN.sub("", report).strip()
+        if latest is None or created_at > latest[0]:
+            latest = (created_at, PreviousReview(sha=match.group("sha"), report=report))
+    return latest[1] if latest else None
+
+
+def _authored_by(note: Mapping[str, Any], author: Mapping[str, Any]) -> bool:
+    """id가 양쪽에 있으면 id로, 아니면 username으로 비교한다."""
+    note_author = note.get("author") or {}
+    if author.get("id") is not None and note_author.get("id") is not None:
+        return str(note_author["id"]) == str(author["id"])
+    username = author.get("username")
+    return bool(username) and note_author.get("username") == username
+
+
+def changed_paths(diff: str) -> set[str]:
+    """diff에 등장한 파일 경로(이름 변경 전후 모두)를 모은다."""
+    paths: set[str] = set()
+    for file in parse_diff(diff):
+        paths.update(path for path in (file.old_path, file.new_path) if path)
+    return paths
+
+
+def carry_forward_findings(previous_report: str, new_report: str, changed: set[str]) -> tuple[str, int]:
+    """이번 변경분에 포함되지 않은 파일의 이전 지적을 새 리포트에 합친다.
+
+    파일명만 적힌 지적(`OrderService.ts:10`)도 경로 끝부분으로 비교한다. 위치를 알 수 없는 지적은 버린다.
+    반환값은 (합친 리포트, 이어받은 지적 수)다.
+    """
+
+    def _untouched(issue: ReviewIssue) -> bool:
+        location = issue.path
+        if not location:
+            return False
+        return not any(path == location or path.endswith(f"/{location}") or location.endswith(f"/{path}") for path in changed)
+
+    carried = ReviewReport.parse(previous_report).filter(_untouched)
+    if not carried.issues:
+        return new_report, 0
+    return ReviewReport.merge([ReviewReport.parse(new_report), carried]).render(), len(carried.issues)
+
+
+def build_incremental_note(previous_sha: str, commit_sha: str, carried_count: int) -> str:
+    """증분 리뷰 범위를 알려주는 코멘트 꼬리말."""
+    return f"> 🔁 증분 리뷰: `{previous_sha[:_SHORT_SHA]}..{commit_sha[:_SHORT_SHA]}` 변경분만 다시 검토했고, 변경되지 않은 파일의 이전 지적 {carried_count}건을 유지했습니다."
@@ -2,15 +2,37 @@
 
 from __future__ import annotations
 
+import hashlib
+import importlib.util
 import os
-from typing import Any
-
-try:  # pragma: no cover - import 오류는 런타임에서만 감지됨
-    from openai import OpenAI  # type: ignore
-except ImportError:  # pragma: no cover
-    OpenAI = None  # type: ignore[assignment,misc]
+import sys
+import threading
+import time
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass, replace
+from typing import Any, Final
 
+from ai_review_bot.metrics import incr
 from ai_review_bot.prompt import PromptBundle
+from ai_review_bot.rate_limit import RateLimiter, get_rate_limiter, parse_reset_duration
+from ai_review_bot.report import REVIEW_JSON_SCHEMA
+from ai_review_bot.resilience import CallStats, LatencyTracker, RetryPolicy, call_with_retries
+from ai_review_bot.review import TokenUsage
+from ai_review_bot.tokens import estimate_tokens
+
+_OUTPUT_RESERVE_TOKENS: Final[int] = 4000
+_MAX_RATE_LIMIT_RETRIES: Final[int] = 5
+_RETRYABLE_STATUSES: Final[frozenset[int]] = frozenset({408, 409, 500, 502, 503, 504})
+
+
+@dataclass(frozen=True)
+class LLMResult:
+    """모델 응답 텍스트와 토큰 사용량, 응답한 모델과 소요 시간."""
+
+    text: str
+    usage: TokenUsage
+    model: str = ""
+    latency_seconds: float = 0.0
 
 
 class ReviewLLMClient:
@@ -24,6 +46,10 @@ class ReviewLLMClient:
         enabled: bool | None = None,
         reasoning_effort: str | None = None,
         text_verbosity: str | None = None,
+        structured_output: bool | None = None,
+        rate_limiter: RateLimiter | None = None,
+        retry_policy: RetryPolicy | None = None,
+        sleep: Callable[[float], None] = time.sleep,
     ) -> None:
         self._api_key = api_key or os.getenv("OPENAI_API_KEY")
         self._model = model or os.getenv("OPENAI_REVIEW_MODEL", "gpt-5.1")
@@ -32,47 +58,279 @@ class ReviewLLMClient:
         verbosity = text_verbosity or os.getenv("OPENAI_REVIEW_TEXT_VERBOSITY") or "low"
         self._reasoning_effort = effort.strip() or None
         self._text_verbosity = verbosity.strip() or None
+        if structured_output is None:
+            structured_output = os.getenv("OPENAI_REVIEW_STRUCTURED_OUTPUT", "").strip().lower() in ("1", "true", "yes", "on")
+        self._structured_output = structured_output
         self._client: Any | None = None
+        self._client_lock = threading.Lock()
+        self._rate_limiter = rate_limiter or get_rate_limiter(self._model)
+        self._retry_policy = retry_policy or RetryPolicy.from_env()
+        self._sleep = sleep
+        self._stats = CallStats()
+        self._latencies = LatencyTracker()
 
-        if self._enabled and OpenAI is not None:
-            self._client = OpenAI(api_key=self._api_key)
+    @property
+    def model(self) -> str:
+        return self._model
+
+    @property
+    def reasoning_effort(self) -> str | None:
+        return self._reasoning_effort
+
+    @property
+    def text_verbosity(self) -> str | None:
+        return self._text_verbosity
+
+    @property
+    def structured_output(self) -> bool:
+        """참이면 REVIEW_JSON_SCHEMA를 따르는 JSON으로 응답받고, 마크다운은 로컬에서 그린다."""
+        return self._structured_output
 
     @property
     def is_available(self) -> bool:
-        return self._enabled and self._client is not None
+        return self._enabled and (self._client is not None or _openai_installed())
+
+    def call_stats(self) -> dict[str, int]:
+        """지금까지의 호출·시도·재시도·헤징 횟수."""
+        return self._stats.snapshot()
 
     def generate(self, prompt: PromptBundle) -> str:
-        if not self.is_available or self._client is None:
+        return self.complete(prompt).text
+
+    def complete(self, prompt: PromptBundle) -> LLMResult:
+        """응답 텍스트와 함께 `response.usage`의 토큰 사용량을 돌려준다."""
+        if not self.is_available:
             raise RuntimeError("LLM client is disabled; set OPENAI_API_KEY to enable it.")
 
+        reserved = self._reserve_tokens(prompt)
+        payload = self._build_payload(prompt)
+        started = time.perf_counter()
         try:
-            payload: dict[str, Any] = {
-                "model": self._model,
-                "input": [
-                    {
-                        "role": "system",
-                        "content": [{"type": "input_text", "text": prompt.system}],
-                    },
-                    {
-                        "role": "user",
-                        "content": [{"type": "input_text", "text": prompt.user}],
-                    },
-                ],
-            }
-            if self._reasoning_effort:
-                payload["reasoning"] = {"effort": self._reasoning_effort}
-            if self._text_verbosity:
-                payload["text"] = {"verbosity": self._text_verbosity}
-
-            response = self._client.responses.create(**payload)
+            response, usage = self._call(lambda: self._create_settled(payload, reserved), self._retry_policy, on_discard=_record_discarded)
         except Exception as exc:  # pragma: no cover - 네트워크 오류에 대한 방어
-            message = str(exc)
-            status = getattr(exc, "status_code", None)
-            if status == 401 or "invalid_api_key" in message.lower():
-                raise RuntimeError("OpenAI API 키가 유효하지 않습니다. 키 값을 다시 확인해 주세요.") from exc
-            raise RuntimeError(f"Failed to call OpenAI Responses API: {message}") from exc
-
+            raise _translate_error(exc) from exc
         output_text = getattr(response, "output_text", None)
         if not output_text:
             raise RuntimeError("OpenAI response did not include text output.")
-        return str(output_text)
+        _log_usage(usage)
+        model = str(getattr(response, "model", None) or self._model)
+        return LLMResult(text=str(output_text), usage=usage, model=model, latency_seconds=time.perf_counter() - started)
+
+    def generate_stream(self, prompt: PromptBundle, *, on_usage: Callable[[TokenUsage], None] | None = None) -> Iterator[str]:
+        """Responses API 스트림에서 텍스트 조각(delta)을 도착하는 대로 돌려준다.
+
+        첫 토큰까지 걸린 시간(TTFT)과 전체 시간은 스트림이 끝날 때 로그로 남긴다.
+        on_usage가 주어지면 `response.completed` 이벤트의 토큰 사용량을 전달한다.
+        """
+        if not self.is_available:
+            raise RuntimeError("LLM client is disabled; set OPENAI_API_KEY to enable it.")
+
+        started = time.perf_counter()
+        first_token_at: float | None = None
+        received = False
+        stream = None
+        settled = False
+        try:
+            payload = {**self._build_payload(prompt), "stream": True}
+            reserved = self._reserve_tokens(prompt)
+            # 스트림은 같은 출력을 두 번 내보낼 수 없으므로 헤징하지 않고, 연결 단계만 재시도한다.
+            stream = self._call(lambda: self._create(payload, reserved), replace(self._retry_policy, hedge_percentile=None, hedge_after_seconds=None))
+            for event in stream:
+                event_type = getattr(event, "type", "")
+                if event_type == "response.output_text.delta":
+                    delta = str(getattr(event, "delta", "") or "")
+                    if not delta:
+                        continue
+                    if first_token_at is None:
+                        first_token_at = time.perf_counter()
+                    received = True
+                    yield delta
+                elif event_type == "response.completed":
+                    usage = _read_usage(getattr(getattr(event, "response", None), "usage", None))
+                    self._rate_limiter.settle(reserved, usage.total_tokens)
+                    settled = True
+                    _log_usage(usage)
+                    if on_usage is not None:
+                        on_usage(usage)
+                elif event_type in ("response.failed", "error"):
+                    raise RuntimeError(f"OpenAI stream failed: {_stream_error_message(event)}")
+        except RuntimeError:
+            raise
+        except Exception as exc:  # pragma: no cover - 네트워크 오류에 대한 방어
+            raise _translate_error(exc) from exc
+        finally:
+            # 도중에 끊기거나 소비자가 멈춘 스트림은 사용량을 알 수 없으므로 예약을 되돌려 창 끝까지 남지 않게 한다.
+            # 연결 단계에서 실패한 시도(stream이 None)의 예약은 _create가 이미 돌려줬다.
+            if stream is not None and not settled:
+                self._rate_limiter.release(reserved)
+
+        if not received:
+            raise RuntimeError("OpenAI response did not include text output.")
+        total = time.perf_counter() - started
+        ttft = (first_token_at or started) - started
+        print(f"[llm-code-review] stream finished: ttft={ttft:.2f}s total={total:.2f}s", file=sys.stderr)
+
+    def _reserve_tokens(self, prompt: PromptBundle) -> int:
+        return estimate_tokens(prompt.system) + estimate_tokens(prompt.shared) + estimate_tokens(prompt.user) + _OUTPUT_RESERVE_TOKENS
+
+    def _call(self, create: Callable[[], Any], policy: RetryPolicy, *, on_discard: Callable[[Any], None] | None = None) -> Any:
+        return call_with_retries(create, policy=policy, is_retryable=_is_retryable, stats=self._stats, latencies=self._latencies, sleep=self._sleep, on_discard=on_discard)
+
+    def _create_settled(self, payload: dict[str, Any], reserved: int) -> tuple[Any, TokenUsage]:
+        """시도마다 예약한 토큰을 그 시도의 실제 사용량으로 정산한다. 헤징으로 버려지는 응답도 각자 정산된다."""
+        response = self._create(payload, reserved)
+        usage = _read_usage(getattr(response, "usage", None))
+        self._rate_limiter.settle(reserved, usage.total_tokens)
+        return response, usage
+
+    def _create(self, payload: dict[str, Any], reserved: int) -> Any:
+        """리미터에서 자리를 예약한 뒤 호출하고, 429면 한도가 풀릴 때까지 기다렸다가 다시 보낸다."""
+        attempt = 0
+        while True:
+            attempt += 1
+            waited = self._rate_limiter.acquire(reserved)
+            if waited >= 1:
+                print(f"[llm-code-review] rate limit pacing: waited {waited:.1f}s for model={self._model}", file=sys.stderr)
+            try:
+                response, headers = _create_with_headers(self._openai().responses, {**payload, "timeout": self._retry_policy.attempt_timeout})
+            except Exception as exc:
+                # 실패한 시도의 예약은 돌려준다. 재시도(여기서든 call_with_retries에서든)는 다시 acquire한다.
+                self._rate_limiter.release(reserved)
+                headers = getattr(getattr(exc, "response", None), "headers", None) or {}
+                self._rate_limiter.update_from_headers(headers)
+                if getattr(exc, "status_code", None) != 429 or attempt > _MAX_RATE_LIMIT_RETRIES:
+                    raise
+                delay = _retry_after_seconds(headers) or float(2**attempt)
+                print(f"[llm-code-review] WARN: OpenAI rate limited (429), retrying in {delay:.1f}s (attempt {attempt})", file=sys.stderr)
+                self._rate_limiter.penalize(delay)
+                continue
+            self._rate_limiter.update_from_headers(headers)
+            return response
+
+    def _openai(self) -> Any:
+        """첫 호출 때 OpenAI 클라이언트를 만든다. 캐시 적중처럼 모델을 부르지 않는 실행은 openai를 import하지 않는다."""
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    from openai import OpenAI
+
+                    # 재시도는 _call에서 직접 다루므로 SDK 자체 재시도는 끈다.
+                    self._client = OpenAI(api_key=self._api_key, max_retries=0)
+        return self._client
+
+    def _build_payload(self, prompt: PromptBundle) -> dict[str, Any]:
+        # 변하지 않는 system → shared를 앞에 두어 프롬프트 캐시가 공통 접두사를 재사용하게 한다.
+        user_content = [{"type": "input_text", "text": text} for text in (prompt.shared, prompt.user) if text]
+        payload: dict[str, Any] = {
+            "model": self._model,
+            "input": [
+                {
+                    "role": "system",
+                    "content": [{"type": "input_text", "text": prompt.system}],
+                },
+                {
+                    "role": "user",
+                    "content": user_content,
+                },
+            ],
+            "prompt_cache_key": _prompt_cache_key(prompt),
+        }
+        if self._reasoning_effort:
+            payload["reasoning"] = {"effort": self._reasoning_effort}
+        text: dict[str, Any] = {}
+        if self._text_verbosity:
+            text["verbosity"] = self._text_verbosity
+        if self._structured_output:
+            text["format"] = {"type": "json_schema", "name": "review_findings", "schema": REVIEW_JSON_SCHEMA, "strict": True}
+        if text:
+            payload["text"] = text
+        return payload
+
+
+def _create_with_headers(responses: Any, payload: dict[str, Any]) -> tuple[Any, Any]:
+    """`with_raw_response`로 호출해 응답과 함께 rate limit 헤더를 얻는다."""
+    raw_api = getattr(responses, "with_raw_response", None)
+    if raw_api is None:
+        return responses.create(**payload), {}
+    raw = raw_api.create(**payload)
+    return raw.parse(), raw.headers
+
+
+def _is_retryable(exc: Exception) -> bool:
+    """시간 초과·연결 오류·일시적 서버 오류만 재시도한다. 429는 _create의 리미터가 처리한다."""
+    status = getattr(exc, "status_code", None)
+    if status is not None:
+        return status in _RETRYABLE_STATUSES
+    if isinstance(exc, (TimeoutError, ConnectionError)):
+        return True
+    # openai가 아직 import되지 않았다면 이 예외는 SDK에서 온 것이 아니다.
+    openai = sys.modules.get("openai")
+    return openai is not None and isinstance(exc, openai.APIConnectionError)
+
+
+def _openai_installed() -> bool:
+    return importlib.util.find_spec("openai") is not None
+
+
+def _retry_after_seconds(headers: Any) -> float | None:
+    retry_after_ms = headers.get("retry-after-ms")
+    if retry_after_ms:
+        try:
+            return float(retry_after_ms) / 1000
+        except ValueError:
+            pass
+    return parse_reset_duration(headers.get("retry-after"))
+
+
+def _prompt_cache_key(prompt: PromptBundle) -> str:
+    """같은 공통 접두사를 가진 요청이 같은 캐시로 라우팅되도록 접두사 해시를 키로 쓴다."""
+    digest = hashlib.sha256(f"{prompt.system}\0{prompt.shared}".encode()).hexdigest()
+    return f"ai-review-bot:{digest[:32]}"
+
+
+def _read_usage(usage: Any) -> TokenUsage:
+    if usage is None:
+        return TokenUsage()
+    input_tokens = int(getattr(usage, "input_tokens", 0) or 0)
+    output_tokens = int(getattr(usage, "output_tokens", 0) or 0)
+    total_tokens = int(getattr(usage, "total_tokens", 0) or 0) or input_tokens + output_tokens
+    cached_tokens = int(getattr(getattr(usage, "input_tokens_details", None), "cached_tokens", 0) or 0)
+    reasoning_tokens = int(getattr(getattr(usage, "output_tokens_details", None), "reasoning_tokens", 0) or 0)
+    return TokenUsage(
+        input_tokens=input_tokens,
+        output_tokens=output_tokens,
+        total_tokens=total_tokens,
+        cached_tokens=cached_tokens,
+        reasoning_tokens=reasoning_tokens,
+    )
+
+
+def _record_discarded(outcome: tuple[Any, TokenUsage]) -> None:
+    """헤징에서 진 응답도 과금되므로 사용량을 별도 카운터와 로그에 남긴다."""
+    usage = outcome[1]
+    print(f"[llm-code-review] discarded hedged response: input={usage.input_tokens} output={usage.output_tokens}", file=sys.stderr)
+    for name, value in usage.to_dict().items():
+        incr(f"llm_hedge_discarded_{name}", value)
+
+
+def _log_usage(usage: TokenUsage) -> None:
+    if not usage.input_tokens:
+        return
+    print(
+        f"[llm-code-review] usage: input={usage.input_tokens} cached={usage.cached_tokens} ({usage.cached_tokens / usage.input_tokens:.0%}) "
+        f"output={usage.output_tokens} reasoning={usage.reasoning_tokens}",
+        file=sys.stderr,
+    )
+
+
+def _translate_error(exc: Exception) -> RuntimeError:
+    message = str(exc)
+    status = getattr(exc, "status_code", None)
+    if status == 401 or "invalid_api_key" in message.lower():
+        return RuntimeError("OpenAI API 키가 유효하지 않습니다. 키 값을 다시 확인해 주세요.")
+    return RuntimeError(f"Failed to call OpenAI Responses API: {message}")
+
+
+def _stream_error_message(event: Any) -> str:
+    error = getattr(event, "error", None) or getattr(getattr(event, "response", None), "error", None)
+    return str(getattr(error, "message", None) or error or getattr(event, "message", "") or "unknown error")
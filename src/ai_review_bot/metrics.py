@@ -0,0 +1,161 @@
+"""리뷰 실행 단계별 시간(span)과 카운터를 모아 JSON/Prometheus textfile로 남기는 계측 도구.
+
+LLM_REVIEW_METRICS_FILE 또는 LLM_REVIEW_METRICS_PROM_FILE이 설정된 경우에만 기록하며,
+꺼져 있으면 span()은 공유 nullcontext를 돌려주고 incr()는 바로 반환한다.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+from collections.abc import Iterator, Mapping
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Final
+
+_PROM_PREFIX: Final[str] = "ai_review_bot"
+_PROM_NAME = re.compile(r"[^a-zA-Z0-9_]")
+_NOOP: Final[AbstractContextManager[None]] = nullcontext()
+
+_recorder: MetricsRecorder | None = None
+
+
+class MetricsRecorder:
+    """한 번의 실행 동안 span과 카운터를 모은다(스레드 안전)."""
+
+    def __init__(self, *, json_path: Path | None = None, prom_path: Path | None = None) -> None:
+        self.json_path = json_path
+        self.prom_path = prom_path
+        self._started_at = datetime.now(timezone.utc)
+        self._origin = time.perf_counter()
+        self._spans: list[dict[str, Any]] = []
+        self._counters: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, name: str, attrs: Mapping[str, Any]) -> Iterator[None]:
+        started = time.perf_counter()
+        status = "ok"
+        try:
+            yield
+        except BaseException:
+            status = "error"
+            raise
+        finally:
+            record = {
+                "name": name,
+                "start_seconds": round(started - self._origin, 6),
+                "duration_seconds": round(time.perf_counter() - started, 6),
+                "status": status,
+                "thread": threading.current_thread().name,
+            }
+            if attrs:
+                record["attrs"] = dict(attrs)
+            with self._lock:
+                self._spans.append(record)
+
+    def incr(self, name: str, value: float) -> None:
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def snapshot(self) -> dict[str, Any]:
+        """JSON 파일에 쓸 내용: 개별 span, 단계별 합계, 카운터."""
+        with self._lock:
+            spans = sorted(self._spans, key=lambda record: record["start_seconds"])
+            counters = dict(self._counters)
+        stages: dict[str, dict[str, float]] = {}
+        for record in spans:
+            stage = stages.setdefault(record["name"], {"count": 0, "total_seconds": 0.0, "max_seconds": 0.0, "errors": 0})
+            stage["count"] += 1
+            stage["total_seconds"] = round(stage["total_seconds"] + record["duration_seconds"], 6)
+            stage["max_seconds"] = max(stage["max_seconds"], record["duration_seconds"])
+            stage["errors"] += record["status"] == "error"
+        return {
+            "started_at": self._started_at.isoformat(),
+            "elapsed_seconds": round(time.perf_counter() - self._origin, 6),
+            "stages": stages,
+            "counters": counters,
+            "spans": spans,
+        }
+
+    def write(self) -> None:
+        snapshot = self.snapshot()
+        if self.json_path:
+            _write_atomic(self.json_path, json.dumps(snapshot, ensure_ascii=False, indent=2) + "\n")
+        if self.prom_path:
+            _write_atomic(self.prom_path, render_prometheus(snapshot))
+
+
+def configure_from_env() -> MetricsRecorder | None:
+    """환경 변수에 출력 경로가 있으면 이 프로세스의 기록기를 켠다."""
+    json_path = os.getenv("LLM_REVIEW_METRICS_FILE", "").strip()
+    prom_path = os.getenv("LLM_REVIEW_METRICS_PROM_FILE", "").strip()
+    if not json_path and not prom_path:
+        return set_recorder(None)
+    return set_recorder(MetricsRecorder(json_path=Path(json_path) if json_path else None, prom_path=Path(prom_path) if prom_path else None))
+
+
+def set_recorder(recorder: MetricsRecorder | None) -> MetricsRecorder | None:
+    global _recorder
+    _recorder = recorder
+    return recorder
+
+
+def span(name: str, **attrs: Any) -> AbstractContextManager[None]:
+    """name 단계의 실행 시간을 기록하는 컨텍스트 매니저. 계측이 꺼져 있으면 아무것도 하지 않는다."""
+    recorder = _recorder
+    if recorder is None:
+        return _NOOP
+    return recorder.span(name, attrs)
+
+
+def incr(name: str, value: float = 1) -> None:
+    recorder = _recorder
+    if recorder is not None:
+        recorder.incr(name, value)
+
+
+def write_metrics() -> None:
+    """설정된 경로에 지금까지의 계측 결과를 쓴다. 실패해도 리뷰 흐름은 막지 않는다."""
+    recorder = _recorder
+    if recorder is None:
+        return
+    try:
+        recorder.write()
+    except OSError as exc:  # pragma: no cover - 계측 실패는 리뷰를 막지 않는다
+        print(f"[llm-code-review] WARN: failed to write metrics: {exc}", file=sys.stderr)
+        return
+    print(f"[llm-code-review] metrics written: {', '.join(str(path) for path in (recorder.json_path, recorder.prom_path) if path)}", file=sys.stderr)
+
+
+def render_prometheus(snapshot: Mapping[str, Any]) -> str:
+    """node_exporter textfile collector 형식으로 단계별 시간과 카운터를 렌더링한다."""
+    lines = [
+        f"# HELP {_PROM_PREFIX}_stage_seconds Time spent in each review stage.",
+        f"# TYPE {_PROM_PREFIX}_stage_seconds summary",
+    ]
+    for name, stage in snapshot["stages"].items():
+        label = name.replace("\\", "\\\\").replace('"', '\\"')
+        lines.append(f'{_PROM_PREFIX}_stage_seconds_sum{{stage="{label}"}} {stage["total_seconds"]}')
+        lines.append(f'{_PROM_PREFIX}_stage_seconds_count{{stage="{label}"}} {stage["count"]}')
+    for name, value in snapshot["counters"].items():
+        metric = f"{_PROM_PREFIX}_{_PROM_NAME.sub('_', name)}_total"
+        lines.append(f"# TYPE {metric} counter")
+        lines.append(f"{metric} {value}")
+    lines.append(f"# TYPE {_PROM_PREFIX}_run_seconds gauge")
+    lines.append(f"{_PROM_PREFIX}_run_seconds {snapshot['elapsed_seconds']}")
+    return "\n".join(lines) + "\n"
+
+
+def _write_atomic(path: Path, text: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    with os.fdopen(fd, "w", encoding="utf-8") as handle:
+        handle.write(text)
+    os.replace(tmp_name, path)
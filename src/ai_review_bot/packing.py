@@ -0,0 +1,163 @@
+"""토큰 예산에 맞춰 프롬프트 입력(diff·프로젝트 개요·티켓)을 고르는 로직."""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Final
+
+from ai_review_bot.diff import DiffFile, parse_diff
+from ai_review_bot.tokens import estimate_tokens
+
+_SOURCE, _TEST, _GENERATED = 0, 1, 2
+_GENERATED_PATTERN = re.compile(
+    r"(?:^|/)(?:package-lock\.json|yarn\.lock|pnpm-lock\.yaml|poetry\.lock|Pipfile\.lock|Cargo\.lock|go\.sum|composer\.lock|Gemfile\.lock)$"
+    r"|\.min\.(?:js|css)$|\.map$|\.snap$|\.pb\.go$|_pb2(?:_grpc)?\.pyi?$|\.g\.dart$|\.generated\.\w+$"
+    r"|(?:^|/)(?:vendor|node_modules|dist|build|__snapshots__|generated)/"
+)
+_TEST_PATTERN = re.compile(r"(?:^|/)(?:tests?|__tests__|spec)/|(?:^|/)test_[^/]*$|_test\.\w+$|\.(?:test|spec)\.\w+$")
+_NOTE_RESERVE_TOKENS: Final[int] = 300
+_LISTED_OMISSIONS: Final[int] = 20
+# 예산을 넘칠 때 프로젝트 개요에 쓰는 예산 몫(1/N). diff 크기와 무관해야 shared 접두사가 MR마다 같다.
+_OVERVIEW_BUDGET_SHARE: Final[int] = 4
+_TRUNCATED_MARK: Final[str] = "…(토큰 예산으로 이하 생략)"
+
+
+@dataclass(frozen=True)
+class PackedInputs:
+    """예산에 맞게 고른 프롬프트 입력과 생략 안내."""
+
+    diff: str
+    project_overview: str | None
+    ticket_context: str | None
+    omission_note: str | None = None
+
+
+def classify_path(path: str) -> int:
+    """리뷰 우선순위 분류: 소스(0) → 테스트(1) → 생성 파일(2)."""
+    if _GENERATED_PATTERN.search(path):
+        return _GENERATED
+    if _TEST_PATTERN.search(path):
+        return _TEST
+    return _SOURCE
+
+
+def pack_review_inputs(
+    diff: str,
+    *,
+    project_overview: str | None,
+    ticket_context: str | None,
+    budget: int,
+    reserved: int = 0,
+) -> PackedInputs:
+    """프롬프트가 budget 토큰 안에 들어가도록 diff 헝크를 고르고 필요하면 티켓을 줄인다.
+
+    - 전체가 예산 안이면 개요를 포함해 입력을 그대로 돌려준다.
+    - 넘치면 프로젝트 개요를 예산의 1/4로 고정해 자른다. 개요는 캐시되는 shared 접두사라, 넘친 양에 맞춰
+      잘리는 길이가 MR마다 달라지면 접두사 캐시가 깨지기 때문이다. 그래서 개요는 "마지막에" 자르는 대신
+      넘치는 MR에서는 항상 같은 길이만 남긴다(예산 안인 MR과 넘치는 MR의 접두사는 서로 다르다).
+    - 넘치면 중요도가 낮은 헝크부터 뺀다: 소스 > 테스트 > 생성 파일, 같은 분류면 변경량이 큰 파일·헝크 우선.
+    - 테스트·생성 파일을 모두 빼도 소스 diff가 들어가지 않을 때만 티켓을 자르되, 남은 예산의 절반까지는 남긴다.
+    - reserved는 프로젝트/PR 헤더처럼 항상 들어가는 부분의 토큰 수다.
+    """
+    omissions: list[str] = []
+    overview_tokens = estimate_tokens(project_overview or "")
+    ticket_tokens = estimate_tokens(ticket_context or "")
+    diff_tokens = estimate_tokens(diff)
+    if reserved + overview_tokens + ticket_tokens + diff_tokens <= budget:
+        return PackedInputs(diff=diff, project_overview=project_overview, ticket_context=ticket_context)
+
+    overview_cap = budget // _OVERVIEW_BUDGET_SHARE
+    if project_overview and overview_tokens > overview_cap:
+        project_overview = _truncate(project_overview, overview_cap)
+        overview_tokens = estimate_tokens(project_overview)
+        omissions.append("프로젝트 개요(AGENTS.md) 일부")
+
+    files = list(parse_diff(diff))
+    available = max(budget - reserved - overview_tokens - _NOTE_RESERVE_TOKENS, 0)
+    source_tokens = sum(estimate_tokens(diff[file.start : file.end]) for file in files if classify_path(file.path) == _SOURCE)
+    ticket_share = min(ticket_tokens, max(available - source_tokens, available // 2))
+    if ticket_context and ticket_tokens > ticket_share:
+        ticket_context = _truncate(ticket_context, ticket_share)
+        ticket_tokens = estimate_tokens(ticket_context)
+        omissions.append("티켓/요구사항 일부")
+
+    packed_diff, dropped_files, dropped_hunks = _pack_diff(diff, files, max(available - ticket_tokens, 0))
+    if dropped_files:
+        listed = ", ".join(dropped_files[:_LISTED_OMISSIONS])
+        more = f" 외 {len(dropped_files) - _LISTED_OMISSIONS}개" if len(dropped_files) > _LISTED_OMISSIONS else ""
+        omissions.append(f"파일 {len(dropped_files)}개 전체({listed}{more})")
+    if dropped_hunks:
+        omissions.append(f"일부만 포함된 파일의 헝크 {dropped_hunks}개")
+    return PackedInputs(diff=packed_diff, project_overview=project_overview, ticket_context=ticket_context, omission_note=_omission_note(budget, omissions))
+
+
+def _omission_note(budget: int, omissions: list[str]) -> str | None:
+    if not omissions:
+        return None
+    return (
+        f"[생략 안내] 토큰 예산({budget:,}) 때문에 다음 내용은 프롬프트에서 제외했습니다: {'; '.join(omissions)}. "
+        "제외된 부분은 리뷰하지 말고, 필요하면 추가 확인이 필요하다고 적어 주세요."
+    )
+
+
+def _pack_diff(diff: str, files: list[DiffFile], budget: int) -> tuple[str, list[str], int]:
+    """중요도 순으로 헝크를 골라 원래 순서대로 다시 이어 붙인다."""
+    if not files:
+        return _truncate(diff, budget), [], 0
+
+    # (우선순위 키, 파일 번호, 헝크 번호) — 헝크가 없는 파일(바이너리/이름 변경)은 헝크 번호 -1
+    units: list[tuple[tuple[int, int, int, int], int, int]] = []
+    for file_index, file in enumerate(files):
+        file_rank = (classify_path(file.path), -(file.added + file.removed))
+        if not file.hunks:
+            units.append(((*file_rank, 0, file_index), file_index, -1))
+        for hunk_index, hunk in enumerate(file.hunks):
+            units.append(((*file_rank, -(hunk.added + hunk.removed), file_index), file_index, hunk_index))
+    units.sort(key=lambda unit: unit[0])
+
+    headers = [diff[file.start : file.hunks[0].start] if file.hunks else diff[file.start : file.end] for file in files]
+    selected: dict[int, set[int]] = {}
+    used = 0
+    for _, file_index, hunk_index in units:
+        cost = 0 if file_index in selected else estimate_tokens(headers[file_index])
+        if hunk_index >= 0:
+            cost += estimate_tokens(_hunk_text(diff, files[file_index], hunk_index))
+        if used + cost > budget:
+            continue
+        used += cost
+        chosen = selected.setdefault(file_index, set())
+        if hunk_index >= 0:
+            chosen.add(hunk_index)
+
+    parts: list[str] = []
+    dropped_files: list[str] = []
+    dropped_hunks = 0
+    for file_index, file in enumerate(files):
+        if file_index not in selected:
+            dropped_files.append(file.path)
+            continue
+        chosen = selected[file_index]
+        dropped_hunks += len(file.hunks) - len(chosen)
+        parts.append(headers[file_index])
+        parts.extend(_hunk_text(diff, file, hunk_index) for hunk_index in sorted(chosen))
+    return "".join(parts), dropped_files, dropped_hunks
+
+
+def _hunk_text(diff: str, file: DiffFile, index: int) -> str:
+    end = file.hunks[index + 1].start if index + 1 < len(file.hunks) else file.end
+    return diff[file.hunks[index].start : end]
+
+
+def _truncate(text: str, max_tokens: int) -> str:
+    """토큰 추정치가 max_tokens 이하가 되도록 줄 단위로 자른다."""
+    if max_tokens <= 0:
+        return _TRUNCATED_MARK
+    tokens = estimate_tokens(text)
+    if tokens <= max_tokens:
+        return text
+    cut = int(len(text) * max(max_tokens - estimate_tokens(_TRUNCATED_MARK), 0) / tokens)
+    newline = text.rfind("\n", 0, cut)
+    if newline > 0:
+        cut = newline
+    return f"{text[:cut].rstrip()}\n{_TRUNCATED_MARK}"
@@ -0,0 +1,69 @@
+"""Responses API 토큰 사용량을 예상 비용(USD)으로 바꾸는 모델별 단가표."""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+from dataclasses import dataclass
+from typing import Final
+
+from ai_review_bot.review import TokenUsage
+
+_PER_TOKENS: Final[int] = 1_000_000
+
+
+@dataclass(frozen=True)
+class ModelPrice:
+    """100만 토큰당 USD 단가. 추론(reasoning) 토큰은 출력 토큰 단가로 과금된다."""
+
+    input: float
+    cached_input: float
+    output: float
+
+
+# 모델 이름 접두사 → 단가. 가장 긴 접두사가 우선한다(gpt-5-mini가 gpt-5보다 먼저).
+_PRICES: Final[dict[str, ModelPrice]] = {
+    "gpt-5": ModelPrice(input=1.25, cached_input=0.125, output=10.0),
+    "gpt-5-mini": ModelPrice(input=0.25, cached_input=0.025, output=2.0),
+    "gpt-5-nano": ModelPrice(input=0.05, cached_input=0.005, output=0.4),
+    "gpt-4.1": ModelPrice(input=2.0, cached_input=0.5, output=8.0),
+    "gpt-4.1-mini": ModelPrice(input=0.4, cached_input=0.1, output=1.6),
+    "gpt-4.1-nano": ModelPrice(input=0.1, cached_input=0.025, output=0.4),
+    "gpt-4o": ModelPrice(input=2.5, cached_input=1.25, output=10.0),
+    "gpt-4o-mini": ModelPrice(input=0.15, cached_input=0.075, output=0.6),
+}
+
+
+def model_price(model: str) -> ModelPrice | None:
+    """모델 단가를 찾는다. OPENAI_REVIEW_PRICING(JSON)에 있는 값이 기본 표보다 우선한다.
+
+    예: `{"gpt-5.1": {"input": 1.25, "cached_input": 0.125, "output": 10}}`
+    """
+    prices = {**_PRICES, **_env_prices()}
+    matches = [prefix for prefix in prices if model == prefix or model.startswith(f"{prefix}-") or model.startswith(f"{prefix}.")]
+    if not matches:
+        return None
+    return prices[max(matches, key=len)]
+
+
+def estimate_cost(model: str, usage: TokenUsage) -> float | None:
+    """사용량의 예상 비용(USD). 단가를 모르는 모델이면 None."""
+    price = model_price(model)
+    if price is None:
+        return None
+    uncached = max(usage.input_tokens - usage.cached_tokens, 0)
+    cost = uncached * price.input + usage.cached_tokens * price.cached_input + usage.output_tokens * price.output
+    return cost / _PER_TOKENS
+
+
+def _env_prices() -> dict[str, ModelPrice]:
+    raw = os.getenv("OPENAI_REVIEW_PRICING", "").strip()
+    if not raw:
+        return {}
+    try:
+        data = json.loads(raw)
+        return {str(model): ModelPrice(input=float(p["input"]), cached_input=float(p.get("cached_input", p["input"])), output=float(p["output"])) for model, p in data.items()}
+    except (ValueError, TypeError, KeyError, AttributeError) as exc:
+        print(f"[llm-code-review] WARN: ignoring invalid OPENAI_REVIEW_PRICING: {exc}", file=sys.stderr)
+        return {}
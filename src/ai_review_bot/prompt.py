@@ -4,8 +4,15 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from textwrap import dedent
+from typing import Final
 
+from ai_review_bot.packing import PackedInputs, pack_review_inputs
 from ai_review_bot.review import ReviewContext
+from ai_review_bot.tokens import estimate_tokens
+
+# [프로젝트 개요]/[티켓/요구사항]/[Diff] 라벨과 줄바꿈 몫
+_SECTION_LABEL_TOKENS: Final[int] = 20
+_LISTED_OMITTED_PATHS: Final[int] = 20
 
 SYSTEM_PROMPT = dedent(
     """\
@@ -165,45 +172,102 @@ SYSTEM_PROMPT = dedent(
 ).strip()
 
 
+# 구조화 출력 모드용 시스템 프롬프트. 서식은 로컬에서 그리므로 리뷰 기준만 담는다.
+STRUCTURED_SYSTEM_PROMPT = dedent(
+    """\
+당신은 팀의 코드 리뷰어다. diff를 리뷰하고 결과를 주어진 JSON 스키마로만 출력한다. 마크다운 서식은 쓰지 않는다.
+
+[리뷰 목표]
+- 버그 가능성, 예외 누락, 경계 조건 누락
+- 보안/권한/민감정보 노출
+- 성능/리소스 비효율
+- 동시성/트랜잭션/스레드 안정성
+- 유지보수성, 네이밍, 책임 분리, 팀 규약 위반 (취향 차이는 제외)
+- `[티켓/요구사항]`이 있으면 변경이 요구사항을 충족하는지, 오해하거나 누락한 부분은 없는지 우선 확인
+
+[findings 작성 규칙]
+- 지적 하나가 항목 하나다. 같은 파일의 여러 문제는 각각 따로 쓴다.
+- severity: high(머지 전 반드시 확인), medium(안정성을 위해 먼저 살펴보면 좋은 부분), low(추가 개선 아이디어)
+- file은 diff에 나온 경로, line_start/line_end는 변경 후 파일 기준 라인 범위(모르면 null)
+- problem/impact/action은 각각 1~2문장의 존댓말로 쓰고, action에는 수정 가능한 조치를 제시한다. 추가 정보가 필요하면 action에 적는다.
+- 티켓/요구사항과 연결되는 변경이면 어떤 요구사항(또는 Asana 티켓)이 영향을 받는지 언급한다.
+- risk_summary는 가장 중요한 위험 한 줄이다. 없으면 빈 문자열로 둔다.
+- 지적할 것이 없으면 findings를 빈 배열로 둔다.
+
+[금지]
+- 추측 기반 단정
+- 포매터로 해결되는 문제만 지적하고 끝내기
+- 전면 리라이트 요구
+    """
+).strip()
+
+
 @dataclass(frozen=True)
 class PromptBundle:
-    """LLM 호출용 시스템·사용자 프롬프트 묶음."""
+    """LLM 호출용 프롬프트 묶음.
+
+    system → shared → user 순서로 전송한다. system과 shared는 같은 프로젝트의 모든 MR에서 바이트 단위로
+    같으므로 제공자 프롬프트 캐시의 공통 접두사가 되고, MR마다 달라지는 내용은 user에만 둔다.
+    """
 
     system: str
     user: str
-
-
-def build_review_prompt(context: ReviewContext) -> PromptBundle:
-    """분석에 필요한 시스템 프롬프트와 사용자 입력을 조합한다."""
+    shared: str = ""
+
+
+def build_review_prompt(
+    context: ReviewContext,
+    *,
+    part: tuple[int, int] | None = None,
+    token_budget: int | None = None,
+    structured: bool = False,
+) -> PromptBundle:
+    """분석에 필요한 시스템 프롬프트와 사용자 입력을 조합한다.
+
+    프로젝트 이름과 개요(AGENTS.md)는 shared에, PR 번호·티켓·diff는 user에 담는다.
+    part가 (순번, 전체 개수)로 주어지면 분할 리뷰 중 일부 묶음임을 프롬프트에 알린다.
+    token_budget이 주어지면 프롬프트가 예산에 맞도록 diff·개요·티켓을 골라 담고 생략 내역을 안내한다.
+    structured가 참이면 서식 규칙이 없는 구조화 출력용 시스템 프롬프트를 쓴다.
+    """
     context.validate()
-    ticket_block = ""
-    if context.ticket_context:
-        ticket_block = dedent(
-            f"""
-            [티켓/요구사항]
-            {context.ticket_context}
-            """
-        ).rstrip()
-
-    overview_block = ""
-    if context.project_overview:
-        overview_block = dedent(
-            f"""
-            [프로젝트 개요]
-            {context.project_overview}
-            """
-        ).rstrip()
-
-    user_prompt_parts = [
-        f"[프로젝트] {context.project_name}",
-        f"[PR/MR] {context.pr_number}",
-    ]
-    if overview_block:
-        user_prompt_parts.append(overview_block)
-    if ticket_block:
-        user_prompt_parts.append(ticket_block)
+    project_line = f"[프로젝트] {context.project_name}"
+    user_prompt_parts = [f"[PR/MR] {context.pr_number}"]
+    if part:
+        index, total = part
+        user_prompt_parts.append(f"[분할 리뷰] 전체 변경 중 {index}/{total}번째 묶음입니다. 아래 diff에 포함된 파일만 리뷰하세요.")
+
+    packed = PackedInputs(diff=context.diff, project_overview=context.project_overview, ticket_context=context.ticket_context)
+    if token_budget:
+        packed = pack_review_inputs(
+            context.diff,
+            project_overview=context.project_overview,
+            ticket_context=context.ticket_context,
+            budget=token_budget,
+            reserved=estimate_tokens("\n".join([project_line, *user_prompt_parts])) + _SECTION_LABEL_TOKENS,
+        )
+
+    shared_parts = [project_line]
+    if packed.project_overview:
+        shared_parts.extend(["[프로젝트 개요]", packed.project_overview.strip()])
+
+    if packed.ticket_context:
+        user_prompt_parts.extend(["[티켓/요구사항]", packed.ticket_context.strip()])
+    if packed.omission_note:
+        user_prompt_parts.append(packed.omission_note)
+    if context.omitted_paths:
+        user_prompt_parts.append(_omitted_paths_note(context.omitted_paths))
     user_prompt_parts.append("[Diff]")
-    user_prompt_parts.append(context.diff)
+    user_prompt_parts.append(packed.diff)
 
     user_prompt = "\n".join(user_prompt_parts).strip()
-    return PromptBundle(system=SYSTEM_PROMPT, user=user_prompt)
+    system = STRUCTURED_SYSTEM_PROMPT if structured else SYSTEM_PROMPT
+    return PromptBundle(system=system, user=user_prompt, shared="\n".join(shared_parts))
+
+
+def _omitted_paths_note(paths: tuple[str, ...]) -> str:
+    listed = ", ".join(paths[:_LISTED_OMITTED_PATHS])
+    more = f" 외 {len(paths) - _LISTED_OMITTED_PATHS}개" if len(paths) > _LISTED_OMITTED_PATHS else ""
+    return (
+        f"[생략 안내] diff 크기 상한 때문에 다음 파일 {len(paths)}개는 diff에 포함되지 않았습니다: {listed}{more}. "
+        "이 파일들은 리뷰하지 말고, 필요하면 추가 확인이 필요하다고 적어 주세요."
+    )
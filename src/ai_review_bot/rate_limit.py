@@ -0,0 +1,168 @@
+"""모델별 분당 요청 수(RPM)·토큰 수(TPM)에 맞춰 OpenAI 호출 속도를 조절하는 클라이언트 측 리미터."""
+
+from __future__ import annotations
+
+import os
+import re
+import threading
+import time
+from collections.abc import Callable, Mapping
+from typing import Final
+
+_WINDOW_SECONDS: Final[float] = 60.0
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_DURATION_UNITS: Final[dict[str, float]] = {"h": 3600.0, "m": 60.0, "s": 1.0, "ms": 0.001}
+
+_limiters: dict[str, RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+class _Bucket:
+    """분당 limit만큼 채워지는 토큰 버킷. limit이 None이면 제한하지 않는다."""
+
+    def __init__(self, limit: int | None, now: float) -> None:
+        self.limit = limit
+        self.available = float(limit or 0)
+        self.updated = now
+
+    def refill(self, now: float) -> None:
+        if self.limit:
+            self.available = min(float(self.limit), self.available + (now - self.updated) * self.limit / _WINDOW_SECONDS)
+        self.updated = now
+
+    def wait_seconds(self, amount: int) -> float:
+        if not self.limit:
+            return 0.0
+        needed = min(amount, self.limit)
+        return 0.0 if self.available >= needed else (needed - self.available) * _WINDOW_SECONDS / self.limit
+
+    def take(self, amount: int) -> None:
+        if self.limit:
+            self.available -= min(amount, self.limit)
+
+    def learn(self, limit: int | None, remaining: int | None) -> None:
+        """응답 헤더가 알려준 계정 한도와 남은 양으로 버킷을 맞춘다."""
+        if limit and limit != self.limit:
+            if self.limit is None:
+                self.available = float(limit)
+            self.limit = limit
+        if self.limit and remaining is not None:
+            self.available = min(self.available, float(remaining))
+
+
+class RateLimiter:
+    """요청 전 acquire로 자리를 예약하고, 응답 헤더로 한도를 학습하는 RPM/TPM 리미터.
+
+    - 한도를 넘는 요청은 실패시키지 않고 자리가 날 때까지 기다린다.
+    - 실제 사용량이 예상과 다르면 settle로 차이를 반영하고, 사용량 없이 끝나면 release로 예약을 돌려준다.
+    - 429를 받으면 penalize로 모든 호출을 Retry-After 동안 멈춰 재시도가 한꺼번에 몰리지 않게 한다.
+    """
+
+    def __init__(
+        self,
+        *,
+        requests_per_minute: int | None = None,
+        tokens_per_minute: int | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        now = clock()
+        self._requests = _Bucket(requests_per_minute, now)
+        self._tokens = _Bucket(tokens_per_minute, now)
+        self._blocked_until = now
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+
+    @property
+    def requests_per_minute(self) -> int | None:
+        return self._requests.limit
+
+    @property
+    def tokens_per_minute(self) -> int | None:
+        return self._tokens.limit
+
+    def acquire(self, tokens: int) -> float:
+        """요청 1건과 tokens만큼의 자리가 날 때까지 기다린 뒤 예약한다. 기다린 시간(초)을 돌려준다."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._requests.refill(now)
+                self._tokens.refill(now)
+                wait = max(self._blocked_until - now, self._requests.wait_seconds(1), self._tokens.wait_seconds(tokens))
+                if wait <= 0:
+                    self._requests.take(1)
+                    self._tokens.take(tokens)
+                    return waited
+            self._sleep(wait)
+            waited += wait
+
+    def settle(self, reserved_tokens: int, used_tokens: int) -> None:
+        """예약한 토큰 수와 실제 사용량의 차이를 버킷에 반영한다."""
+        if used_tokens <= 0:
+            return
+        with self._lock:
+            self._tokens.available -= used_tokens - reserved_tokens
+
+    def release(self, reserved_tokens: int) -> None:
+        """사용량을 알 수 없게 끝난 호출(중간에 끊긴 스트림 등)의 예약을 되돌린다."""
+        with self._lock:
+            if self._tokens.limit:
+                self._tokens.available = min(float(self._tokens.limit), self._tokens.available + reserved_tokens)
+
+    def update_from_headers(self, headers: Mapping[str, str]) -> None:
+        """`x-ratelimit-*` 응답 헤더로 계정 한도와 남은 양을 갱신한다."""
+        with self._lock:
+            now = self._clock()
+            for bucket, kind in ((self._requests, "requests"), (self._tokens, "tokens")):
+                bucket.refill(now)
+                remaining = _header_int(headers, f"x-ratelimit-remaining-{kind}")
+                bucket.learn(_header_int(headers, f"x-ratelimit-limit-{kind}"), remaining)
+                reset = parse_reset_duration(headers.get(f"x-ratelimit-reset-{kind}"))
+                if remaining == 0 and reset:
+                    self._blocked_until = max(self._blocked_until, now + reset)
+
+    def penalize(self, seconds: float) -> None:
+        """429 응답 뒤 seconds 동안 새 호출을 멈춘다."""
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, self._clock() + max(seconds, 0.0))
+
+
+def get_rate_limiter(model: str) -> RateLimiter:
+    """모델별로 프로세스에서 공유하는 리미터를 돌려준다.
+
+    OPENAI_REVIEW_RPM/OPENAI_REVIEW_TPM으로 초기 한도를 줄 수 있고, 없으면 첫 응답 헤더에서 학습한다.
+    """
+    with _limiters_lock:
+        limiter = _limiters.get(model)
+        if limiter is None:
+            limiter = RateLimiter(requests_per_minute=_env_int("OPENAI_REVIEW_RPM"), tokens_per_minute=_env_int("OPENAI_REVIEW_TPM"))
+            _limiters[model] = limiter
+        return limiter
+
+
+def parse_reset_duration(value: str | None) -> float | None:
+    """`1s`, `6m0s`, `20ms` 형식의 reset 헤더 값을 초로 바꾼다."""
+    if not value:
+        return None
+    parts = _DURATION_PART.findall(value.strip())
+    if not parts:
+        try:
+            return float(value)
+        except ValueError:
+            return None
+    return sum(float(number) * _DURATION_UNITS[unit] for number, unit in parts)
+
+
+def _header_int(headers: Mapping[str, str], name: str) -> int | None:
+    value = headers.get(name)
+    try:
+        return int(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+def _env_int(name: str) -> int | None:
+    value = os.getenv(name, "").strip()
+    return int(value) if value.isdigit() and int(value) > 0 else None
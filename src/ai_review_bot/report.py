@@ -0,0 +1,278 @@
+"""리뷰 리포트 모델과 파싱·병합·렌더링 로직."""
+
+from __future__ import annotations
+
+import json
+import re
+from collections.abc import Callable, Iterable, Mapping
+from dataclasses import dataclass
+from typing import Any, Final
+
+SUMMARY_TITLE: Final[str] = "핵심 요약"
+STABILITY_TITLE: Final[str] = "안정성을 위해 먼저 살펴보면 좋은 부분"
+IDEAS_TITLE: Final[str] = "추가 개선 아이디어"
+RISK_LABEL: Final[str] = "핵심 위험 요약"
+DOMAIN_ORDER: Final[list[str]] = [
+    "보안",
+    "트랜잭션/동시성",
+    "비즈니스 로직",
+    "성능/리소스",
+    "빌드/CI",
+    "유지보수성",
+]
+
+# 구조화 출력(JSON schema) 모드의 지적 심각도 → 리포트 섹션
+SEVERITY_SECTIONS: Final[dict[str, str]] = {"high": STABILITY_TITLE, "medium": STABILITY_TITLE, "low": IDEAS_TITLE}
+
+_NULLABLE_LINE: Final[dict[str, Any]] = {"type": ["integer", "null"], "description": "변경 후 파일 기준 라인 번호. 모르면 null."}
+REVIEW_JSON_SCHEMA: Final[dict[str, Any]] = {
+    "type": "object",
+    "properties": {
+        "risk_summary": {"type": "string", "description": "가장 중요한 위험 한 줄. 없으면 빈 문자열."},
+        "findings": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "severity": {"type": "string", "enum": list(SEVERITY_SECTIONS)},
+                    "domain": {"type": "string", "enum": DOMAIN_ORDER},
+                    "file": {"type": "string"},
+                    "line_start": _NULLABLE_LINE,
+                    "line_end": _NULLABLE_LINE,
+                    "problem": {"type": "string", "description": "문제 (1~2문장)"},
+                    "impact": {"type": "string", "description": "영향 (1~2문장)"},
+                    "action": {"type": "string", "description": "조치 (1~2문장)"},
+                },
+                "required": ["severity", "domain", "file", "line_start", "line_end", "problem", "impact", "action"],
+                "additionalProperties": False,
+            },
+        },
+    },
+    "required": ["risk_summary", "findings"],
+    "additionalProperties": False,
+}
+
+_EMPTY_MARK: Final[str] = "없음"
+_ISSUE_SECTIONS: Final[tuple[str, str]] = (STABILITY_TITLE, IDEAS_TITLE)
+_HTML_TAG = re.compile(r"</?(?:details|summary)>")
+_HIGHLIGHT = re.compile(r"\{\+\s*(.*?)\s*\+\}")
+# 소유(possessive) 수량자로 되돌아가기 없이 `(경로:라인범위)`를 읽는다. 경로 뒤 공백은 strip으로 지운다.
+_ISSUE_LOCATION = re.compile(r"\(\s*+([^():`\s][^():`]*+)(?::([\d\s,~\-]++))?\)")
+_LINE_NUMBER = re.compile(r"\d+")
+
+
+@dataclass(frozen=True)
+class ReviewIssue:
+    """리포트의 지적 한 건. text는 불릿 첫 줄(`(파일명:라인범위)`)부터 문제/영향/조치 줄까지의 원문 블록이다."""
+
+    section: str
+    domain: str
+    text: str
+    path: str | None = None
+    line_start: int | None = None
+    line_end: int | None = None
+    severity: str | None = None
+
+
+@dataclass(frozen=True)
+class ReviewReport:
+    """핵심 요약·섹션·도메인·이슈로 읽은 리뷰 리포트.
+
+    parse로 리포트를 한 번만 훑어 만들고, render로 정해진 형식(핵심 요약 + 접히는 두 섹션)의 마크다운을 다시 그린다.
+    structured가 False면 아는 섹션 제목이 하나도 없었던 것이므로 원문을 그대로 쓰는 편이 안전하다.
+    """
+
+    issues: tuple[ReviewIssue, ...] = ()
+    risks: tuple[str, ...] = ()
+    notes: tuple[tuple[str, str], ...] = ()
+    structured: bool = False
+
+    @classmethod
+    def parse(cls, report: str) -> ReviewReport:
+        """리포트 한 건을 한 줄씩 한 번 훑어 이슈·핵심 위험 요약·섹션 메모를 뽑는다."""
+        blocks: list[tuple[str, str, list[str]]] = []
+        notes: list[tuple[str, str]] = []
+        risk: str | None = None
+        section: str | None = None
+        domain = ""
+        issue: list[str] | None = None
+        structured = False
+
+        for raw in report.splitlines():
+            line = _HTML_TAG.sub("", raw).rstrip()
+            title = line.lstrip("#").strip()
+            if title in (SUMMARY_TITLE, STABILITY_TITLE, IDEAS_TITLE):
+                section, domain, issue, structured = title, "", None, True
+                continue
+            if section is None or not line.strip():
+                continue
+            if section == SUMMARY_TITLE:
+                label, _, value = line.lstrip("-*• ").partition(":")
+                if label.strip() == RISK_LABEL:
+                    value = _HIGHLIGHT.sub(r"\1", value).strip()
+                    risk = value if value and value != _EMPTY_MARK else None
+                continue
+            if line.startswith("###"):
+                domain, issue = _canonical_domain(line.lstrip("#").strip()), None
+                continue
+            if line.startswith(("-", "*")):
+                if line.lstrip("-*• ").strip() == _EMPTY_MARK:
+                    issue = None
+                    continue
+                issue = [line]
+                blocks.append((section, domain, issue))
+                continue
+            if issue is not None:
+                issue.append(line)
+            elif not line.startswith(">"):
+                # 칭찬·증분 리뷰 꼬리말 같은 인용문은 리포트가 아니라 덧붙인 안내이므로 메모로 남기지 않는다.
+                notes.append((section, line))
+
+        issues = tuple(_build_issue(section, domain, lines) for section, domain, lines in blocks)
+        return cls(issues=issues, risks=(risk,) if risk else (), notes=tuple(notes), structured=structured)
+
+    @classmethod
+    def from_json(cls, output: str) -> ReviewReport:
+        """REVIEW_JSON_SCHEMA를 따르는 구조화 출력을 읽는다. 마크다운 서식은 render가 만든다.
+
+        JSON이 아니거나 스키마와 다르면 ValueError.
+        """
+        try:
+            data = json.loads(output)
+            findings = data["findings"]
+            risk = str(data.get("risk_summary") or "").strip()
+            issues = tuple(_issue_from_finding(finding) for finding in findings)
+        except (TypeError, KeyError, AttributeError) as exc:
+            raise ValueError(f"structured review output does not match the schema: {exc}") from exc
+        return cls(issues=issues, risks=(risk,) if risk and risk != _EMPTY_MARK else (), structured=True)
+
+    @classmethod
+    def merge(cls, reports: Iterable[ReviewReport]) -> ReviewReport:
+        """여러 리포트의 이슈·핵심 위험 요약(중복 제거)·섹션 메모를 순서대로 합친다."""
+        issues: list[ReviewIssue] = []
+        risks: list[str] = []
+        notes: list[tuple[str, str]] = []
+        structured = False
+        for report in reports:
+            issues.extend(report.issues)
+            risks.extend(risk for risk in report.risks if risk not in risks)
+            notes.extend(note for note in report.notes if note not in notes)
+            structured = structured or report.structured
+        return cls(issues=tuple(issues), risks=tuple(risks), notes=tuple(notes), structured=structured)
+
+    @property
+    def stability_count(self) -> int:
+        return self.count(STABILITY_TITLE)
+
+    @property
+    def ideas_count(self) -> int:
+        return self.count(IDEAS_TITLE)
+
+    @property
+    def is_empty(self) -> bool:
+        """형식을 갖춘 리포트인데 지적이 하나도 없는지."""
+        return self.structured and not self.issues
+
+    def count(self, section: str) -> int:
+        return sum(issue.section == section for issue in self.issues)
+
+    def domains(self, section: str) -> dict[str, list[ReviewIssue]]:
+        """section의 이슈를 도메인 순서(DOMAIN_ORDER, 모르는 도메인은 뒤)로 묶는다. 도메인 없는 이슈는 맨 앞."""
+        grouped: dict[str, list[ReviewIssue]] = {}
+        for issue in self.issues:
+            if issue.section == section:
+                grouped.setdefault(issue.domain, []).append(issue)
+        return {domain: grouped[domain] for domain in _ordered_domains(grouped)}
+
+    def filter(self, keep: Callable[[ReviewIssue], bool]) -> ReviewReport:
+        """keep이 참인 이슈만 남긴다. 핵심 위험 요약은 안정성 이슈가 남을 때만, 섹션 메모는 버린다."""
+        kept = tuple(issue for issue in self.issues if keep(issue))
+        risks = self.risks if any(issue.section == STABILITY_TITLE for issue in kept) else ()
+        return ReviewReport(issues=kept, risks=risks, structured=self.structured)
+
+    def render(self) -> str:
+        """정해진 형식의 마크다운. 건수는 이슈 수로 다시 센다."""
+        stability_count = self.stability_count
+        ideas_count = self.ideas_count
+        risk = " / ".join(self.risks) if self.risks else _EMPTY_MARK
+
+        lines = [
+            f"## {SUMMARY_TITLE}",
+            f"- {STABILITY_TITLE}: {_highlight(f'{stability_count}건', stability_count > 0)}",
+            f"- {IDEAS_TITLE}: {_highlight(f'{ideas_count}건', ideas_count > 0)}",
+            f"- {RISK_LABEL}: {_highlight(risk, bool(self.risks) and stability_count > 0)}",
+        ]
+        for title in _ISSUE_SECTIONS:
+            lines.extend(["", "<details>", "", "<summary>", title, "</summary>", ""])
+            lines.append(self._render_section(title))
+            lines.extend(["", "</details>"])
+        return "\n".join(lines).strip() + "\n"
+
+    def _render_section(self, section: str) -> str:
+        blocks = [note for name, note in self.notes if name == section]
+        for domain, issues in self.domains(section).items():
+            text = "\n\n".join(issue.text.strip("\n") for issue in issues)
+            blocks.append(f"### {domain}\n{text}" if domain else text)
+        return "\n\n".join(blocks) if blocks else f"- {_EMPTY_MARK}"
+
+
+def merge_reports(reports: list[str]) -> str:
+    """분할 리뷰 결과들을 하나의 리포트(핵심 요약/안정성/추가 개선 아이디어)로 합친다."""
+    return ReviewReport.merge(ReviewReport.parse(report) for report in reports).render()
+
+
+def _build_issue(section: str, domain: str, lines: list[str]) -> ReviewIssue:
+    """이슈 블록 첫 줄의 `(파일명:라인범위)`에서 파일 경로와 라인 범위를 꺼낸다."""
+    text = "\n".join(lines)
+    match = _ISSUE_LOCATION.search(lines[0])
+    if not match:
+        return ReviewIssue(section, domain, text)
+    numbers = [int(number) for number in _LINE_NUMBER.findall(match.group(2))] if match.group(2) else None
+    if not numbers:
+        return ReviewIssue(section, domain, text, match.group(1).strip())
+    return ReviewIssue(section, domain, text, match.group(1).strip(), min(numbers), max(numbers))
+
+
+def _issue_from_finding(finding: Mapping[str, Any]) -> ReviewIssue:
+    severity = str(finding["severity"])
+    path = str(finding["file"]).strip()
+    start, end = finding.get("line_start"), finding.get("line_end")
+    line_start = int(start) if start is not None else None
+    line_end = int(end) if end is not None else line_start
+    location = path
+    if line_start is not None:
+        location += f":{line_start}" if line_end in (None, line_start) else f":{line_start}-{line_end}"
+    text = "\n".join(
+        [
+            f"- `({location})`",
+            f"  - 문제: {str(finding['problem']).strip()}",
+            f"  - 영향: {str(finding['impact']).strip()}",
+            f"  - 조치: {str(finding['action']).strip()}",
+        ]
+    )
+    return ReviewIssue(
+        section=SEVERITY_SECTIONS.get(severity, STABILITY_TITLE),
+        domain=_canonical_domain(str(finding["domain"]).strip()),
+        text=text,
+        path=path or None,
+        line_start=line_start,
+        line_end=line_end,
+        severity=severity,
+    )
+
+
+def _canonical_domain(heading: str) -> str:
+    for name in DOMAIN_ORDER:
+        if heading.startswith(name):
+            return name
+    return heading
+
+
+def _ordered_domains(domains: Mapping[str, list[ReviewIssue]]) -> list[str]:
+    known = [name for name in DOMAIN_ORDER if domains.get(name)]
+    others = [name for name, issues in domains.items() if issues and name not in DOMAIN_ORDER]
+    return [name for name in others if not name] + known + [name for name in others if name]
+
+
+def _highlight(text: str, enabled: bool) -> str:
+    return f"{{+ {text} +}}" if enabled else text
@@ -0,0 +1,190 @@
+"""LLM 호출의 꼬리 지연을 줄이는 재시도·헤징(hedged request) 도우미."""
+
+from __future__ import annotations
+
+import os
+import random
+import sys
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Final, TypeVar
+
+from ai_review_bot.metrics import incr
+
+_T = TypeVar("_T")
+
+_LATENCY_WINDOW: Final[int] = 200
+_MIN_HEDGE_SAMPLES: Final[int] = 10
+_DEFAULT_ATTEMPT_TIMEOUT: Final[float] = 300.0
+_DEFAULT_MAX_RETRIES: Final[int] = 2
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """시도별 제한 시간, 재시도 횟수, 헤징 기준.
+
+    hedge_percentile이 있으면 최근 성공 지연의 해당 백분위를 넘긴 시도에 같은 요청을 한 번 더 보낸다.
+    표본이 모이기 전(CI처럼 프로세스마다 호출이 한 번뿐인 경우 포함)에는 hedge_after_seconds를 기준으로 쓴다.
+    """
+
+    attempt_timeout: float = _DEFAULT_ATTEMPT_TIMEOUT
+    max_retries: int = _DEFAULT_MAX_RETRIES
+    backoff_base: float = 1.0
+    backoff_max: float = 30.0
+    hedge_percentile: float | None = None
+    hedge_after_seconds: float | None = None
+
+    @classmethod
+    def from_env(cls) -> RetryPolicy:
+        """OPENAI_REVIEW_TIMEOUT, OPENAI_REVIEW_MAX_RETRIES, OPENAI_REVIEW_HEDGE_PERCENTILE, OPENAI_REVIEW_HEDGE_AFTER_SECONDS를 읽는다."""
+        percentile = _env_float("OPENAI_REVIEW_HEDGE_PERCENTILE")
+        hedge_after = _env_float("OPENAI_REVIEW_HEDGE_AFTER_SECONDS")
+        max_retries = os.getenv("OPENAI_REVIEW_MAX_RETRIES", "").strip()
+        return cls(
+            attempt_timeout=_env_float("OPENAI_REVIEW_TIMEOUT") or _DEFAULT_ATTEMPT_TIMEOUT,
+            max_retries=int(max_retries) if max_retries.isdigit() else _DEFAULT_MAX_RETRIES,
+            hedge_percentile=percentile if percentile and 0 < percentile < 100 else None,
+            hedge_after_seconds=hedge_after if hedge_after and hedge_after > 0 else None,
+        )
+
+    def hedge_delay(self, latencies: LatencyTracker) -> float | None:
+        """헤징 요청을 보낼 때까지 기다릴 시간. 백분위를 계산할 표본이 부족하면 고정 지연을, 둘 다 없으면 None."""
+        observed = latencies.percentile(self.hedge_percentile) if self.hedge_percentile else None
+        return observed if observed is not None else self.hedge_after_seconds
+
+    def backoff(self, attempt: int) -> float:
+        """attempt번째 실패 뒤 기다릴 시간(full jitter 지수 백오프)."""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** (attempt - 1))))
+
+
+class LatencyTracker:
+    """최근 성공 호출의 지연 시간으로 헤징 기준 백분위를 계산한다."""
+
+    def __init__(self, window: int = _LATENCY_WINDOW) -> None:
+        self._samples: deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, percent: float) -> float | None:
+        """표본이 충분하지 않으면 None을 돌려 헤징하지 않게 한다."""
+        with self._lock:
+            samples = sorted(self._samples)
+        if len(samples) < _MIN_HEDGE_SAMPLES:
+            return None
+        index = min(int(len(samples) * percent / 100), len(samples) - 1)
+        return samples[index]
+
+
+class CallStats:
+    """호출·시도·재시도·헤징 횟수를 세는 스레드 안전 카운터."""
+
+    _NAMES: Final[tuple[str, ...]] = ("calls", "attempts", "retries", "failures", "hedges", "hedge_wins")
+
+    def __init__(self) -> None:
+        self._counts = dict.fromkeys(self._NAMES, 0)
+        self._lock = threading.Lock()
+
+    def add(self, name: str, count: int = 1) -> None:
+        with self._lock:
+            self._counts[name] += count
+        incr(f"llm_{name}", count)
+
+    def snapshot(self) -> dict[str, int]:
+        with self._lock:
+            return dict(self._counts)
+
+
+def call_with_retries(
+    call: Callable[[], _T],
+    *,
+    policy: RetryPolicy,
+    is_retryable: Callable[[Exception], bool],
+    stats: CallStats,
+    latencies: LatencyTracker,
+    sleep: Callable[[float], None] = time.sleep,
+    on_discard: Callable[[_T], None] | None = None,
+) -> _T:
+    """재시도 가능한 오류면 백오프 후 다시 호출하고, 정책에 따라 느린 시도를 헤징한다.
+
+    on_discard는 헤징에서 진 시도가 나중에 성공했을 때 그 결과로 불린다(사용량 기록 등).
+    """
+    stats.add("calls")
+    attempt = 0
+    while True:
+        attempt += 1
+        started = time.perf_counter()
+        hedge_after = policy.hedge_delay(latencies)
+        try:
+            result = _call_hedged(call, hedge_after, stats, on_discard) if hedge_after is not None else _call_once(call, stats)
+        except Exception as exc:
+            if not is_retryable(exc) or attempt > policy.max_retries:
+                stats.add("failures")
+                raise
+            delay = policy.backoff(attempt)
+            stats.add("retries")
+            print(f"[llm-code-review] WARN: LLM call failed ({exc.__class__.__name__}), retrying in {delay:.1f}s (attempt {attempt})", file=sys.stderr)
+            sleep(delay)
+            continue
+        latencies.record(time.perf_counter() - started)
+        return result
+
+
+def _call_once(call: Callable[[], _T], stats: CallStats) -> _T:
+    stats.add("attempts")
+    return call()
+
+
+def _call_hedged(call: Callable[[], _T], hedge_after: float, stats: CallStats, on_discard: Callable[[_T], None] | None) -> _T:
+    """hedge_after초 안에 끝나지 않으면 같은 요청을 하나 더 보내 먼저 성공한 응답을 쓴다.
+
+    진 쪽은 결과를 기다리지 않는다. 이미 전송된 요청은 중간에 끊을 수 없어 시도별 제한 시간 안에 스스로 끝나며,
+    성공하면 그 결과를 on_discard로 넘겨 소비한 토큰이 누락되지 않게 한다.
+    """
+    pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="llm-hedge")
+    try:
+        primary = pool.submit(_call_once, call, stats)
+        done, _ = wait([primary], timeout=hedge_after)
+        if done:
+            return primary.result()
+
+        stats.add("hedges")
+        print(f"[llm-code-review] LLM call slower than {hedge_after:.1f}s, sending hedged request", file=sys.stderr)
+        hedge = pool.submit(_call_once, call, stats)
+        pending: set[Future[_T]] = {primary, hedge}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is not None:
+                    continue
+                if future is hedge:
+                    stats.add("hedge_wins")
+                for loser in pending:
+                    if not loser.cancel() and on_discard is not None:
+                        loser.add_done_callback(_discarded(on_discard))
+                return future.result()
+        return primary.result()
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _discarded(on_discard: Callable[[_T], None]) -> Callable[[Future[_T]], None]:
+    def _callback(future: Future[_T]) -> None:
+        if not future.cancelled() and future.exception() is None:
+            on_discard(future.result())
+
+    return _callback
+
+
+def _env_float(name: str) -> float | None:
+    value = os.getenv(name, "").strip()
+    try:
+        return float(value) if value else None
+    except ValueError:
+        return None
@@ -4,6 +4,8 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 
+from ai_review_bot.report import ReviewReport
+
 
 @dataclass(frozen=True)
 class ReviewContext:
@@ -14,6 +16,8 @@ class ReviewContext:
     diff: str
     ticket_context: str | None = None
     project_overview: str | None = None
+    # diff 크기 상한 때문에 diff에 담지 못한 파일 경로
+    omitted_paths: tuple[str, ...] = ()
 
     def validate(self) -> None:
         if not self.project_name:
@@ -22,3 +26,51 @@ class ReviewContext:
             raise ValueError("pr_number must not be empty")
         if not self.diff.strip():
             raise ValueError("diff must not be empty")
+
+
+@dataclass(frozen=True)
+class TokenUsage:
+    """LLM 호출에서 보고된 토큰 사용량.
+
+    cached_tokens는 input_tokens 중 프롬프트 캐시에서 읽은 몫이고, reasoning_tokens는 output_tokens에 포함된 추론 토큰이다.
+    """
+
+    input_tokens: int = 0
+    output_tokens: int = 0
+    total_tokens: int = 0
+    cached_tokens: int = 0
+    reasoning_tokens: int = 0
+
+    def __add__(self, other: TokenUsage) -> TokenUsage:
+        return TokenUsage(
+            input_tokens=self.input_tokens + other.input_tokens,
+            output_tokens=self.output_tokens + other.output_tokens,
+            total_tokens=self.total_tokens + other.total_tokens,
+            cached_tokens=self.cached_tokens + other.cached_tokens,
+            reasoning_tokens=self.reasoning_tokens + other.reasoning_tokens,
+        )
+
+    def to_dict(self) -> dict[str, int]:
+        return {
+            "input_tokens": self.input_tokens,
+            "output_tokens": self.output_tokens,
+            "total_tokens": self.total_tokens,
+            "cached_tokens": self.cached_tokens,
+            "reasoning_tokens": self.reasoning_tokens,
+        }
+
+
+@dataclass(frozen=True)
+class ReviewResult:
+    """리뷰 한 건의 최종 리포트와 실행 정보(모델, 소요 시간, 예상 비용).
+
+    parsed는 리포트를 읽은 ReviewReport로, 이슈를 다시 마크다운에서 파싱하지 않고 쓸 수 있다.
+    """
+
+    report: str
+    usage: TokenUsage = TokenUsage()
+    cached: bool = False
+    model: str = ""
+    latency_seconds: float = 0.0
+    cost_usd: float | None = None
+    parsed: ReviewReport | None = None
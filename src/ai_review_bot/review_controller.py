@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+from collections.abc import Callable
+
 from ai_review_bot.review import ReviewContext
 from ai_review_bot.review_service import ReviewService
 
@@ -12,10 +14,17 @@ class ReviewController:
     def __init__(self, service: ReviewService | None = None) -> None:
         self._service = service or ReviewService()
 
-    def run(self, *, project_name: str, pr_number: str, raw_diff: str) -> str:
+    def run(
+        self,
+        *,
+        project_name: str,
+        pr_number: str,
+        raw_diff: str,
+        on_delta: Callable[[str], None] | None = None,
+    ) -> str:
         context = ReviewContext(
             project_name=project_name,
             pr_number=pr_number,
             diff=raw_diff,
         )
-        return self._service.create_review(context)
+        return self._service.create_review(context, on_delta=on_delta)
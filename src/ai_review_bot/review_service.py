@@ -2,112 +2,203 @@
 
 from __future__ import annotations
 
+import os
+import sys
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
 from typing import Final
 
-from ai_review_bot.llm import ReviewLLMClient
-from ai_review_bot.prompt import PromptBundle, build_review_prompt
-from ai_review_bot.review import ReviewContext
+from ai_review_bot.chunking import split_diff
+from ai_review_bot.compaction import compact_diff, compaction_context_from_env
+from ai_review_bot.llm import LLMResult, ReviewLLMClient
+from ai_review_bot.metrics import incr, span
+from ai_review_bot.pricing import estimate_cost
+from ai_review_bot.prompt import STRUCTURED_SYSTEM_PROMPT, SYSTEM_PROMPT, PromptBundle, build_review_prompt
+from ai_review_bot.report import ReviewReport
+from ai_review_bot.review import ReviewContext, ReviewResult, TokenUsage
+from ai_review_bot.support.review_cache import ReviewCache, build_cache_key
+from ai_review_bot.tokens import prompt_token_budget
 
-_HEADERS: Final[list[str]] = ["Summary", "Must Fix", "Nice to Have"]
-_PRAISE_MESSAGE: Final[str] = "> 👏 Summary, Must Fix, Nice to Have 모두 비어 있습니다. 가이드를 잘 지킨 안정적인 변경이에요!"
+_PRAISE_MESSAGE: Final[str] = "> 👏 먼저 살펴볼 부분도, 추가 개선 아이디어도 없습니다. 가이드를 잘 지킨 안정적인 변경이에요!"
+_DEFAULT_CHUNK_CHARS: Final[int] = 60_000
+_DEFAULT_MAX_WORKERS: Final[int] = 4
 
 
 class ReviewService:
-    """리뷰 생성 워크플로를 조합한다."""
-
-    def __init__(self, llm_client: ReviewLLMClient | None = None) -> None:
+    """리뷰 생성 워크플로를 조합한다.
+
+    diff는 프롬프트를 만들기 전에 압축한다. diff_context(기본 LLM_REVIEW_DIFF_CONTEXT)는 변경 줄 주변에 남길 문맥 줄 수다.
+    """
+
+    def __init__(
+        self,
+        llm_client: ReviewLLMClient | None = None,
+        *,
+        chunk_chars: int | None = None,
+        max_workers: int | None = None,
+        token_budget: int | None = None,
+        cache: ReviewCache | None = None,
+        diff_context: int | None = None,
+    ) -> None:
         self._llm_client = llm_client or ReviewLLMClient()
-
-    def create_review(self, context: ReviewContext) -> str:
+        self._cache = cache
+        self._diff_context = diff_context if diff_context is not None else compaction_context_from_env()
+        self._token_budget = token_budget or prompt_token_budget(self._llm_client.model)
+        self._chunk_chars = chunk_chars or _env_int("OPENAI_REVIEW_CHUNK_CHARS", _DEFAULT_CHUNK_CHARS)
+        self._max_workers = max(max_workers or _env_int("OPENAI_REVIEW_MAX_WORKERS", _DEFAULT_MAX_WORKERS), 1)
+
+    def create_review(self, context: ReviewContext, *, on_delta: Callable[[str], None] | None = None) -> str:
+        """리뷰 리포트를 생성한다.
+
+        on_delta가 주어지면 단일 호출 리뷰에서 모델 출력 조각을 도착하는 대로 전달한다.
+        분할 리뷰와 캐시 적중 시에는 호출되지 않으며, 반환값은 항상 정규화를 거친 최종 리포트다.
+        """
+        return self.review(context, on_delta=on_delta).report
+
+    def review(self, context: ReviewContext, *, on_delta: Callable[[str], None] | None = None) -> ReviewResult:
+        """create_review와 같되 토큰 사용량·캐시 적중 여부를 함께 돌려준다."""
         context.validate()
+        context = self._compact(context)
+        cache_key = self._cache_key(context) if self._cache else None
+        if self._cache and cache_key:
+            with span("review.cache_lookup"):
+                cached = self._cache.get(cache_key)
+            if cached:
+                incr("review_cache_hits")
+                print(f"[llm-code-review] review cache hit: key={cache_key[:12]} (skipped LLM call, saved ~{cached.latency_seconds:.1f}s)", file=sys.stderr)
+                return ReviewResult(report=cached.report, cached=True, model=self._llm_client.model, cost_usd=0.0, parsed=ReviewReport.parse(cached.report))
+            incr("review_cache_misses")
+            print(f"[llm-code-review] review cache miss: key={cache_key[:12]}", file=sys.stderr)
+
         if not self._llm_client.is_available:
             raise RuntimeError("OpenAI API를 사용할 수 없습니다. 환경 변수 OPENAI_API_KEY와 패키지 의존성(openai)이 올바르게 설정되었는지 확인해 주세요.")
-        bundle: PromptBundle = build_review_prompt(context)
-        report = self._llm_client.generate(bundle)
-        report = self._normalize_markdown(report)
-        return self._append_praise_if_empty(report)
-
-    @staticmethod
-    def _normalize_markdown(report: str) -> str:
-        if not report:
-            return report
-
-        formatted_sections: list[str] = []
-        for header in _HEADERS:
-            marker = f"## {header}"
-            if marker not in report:
-                # 헤더가 하나라도 빠져 있으면 원본 형식을 유지한다.
-                return report
-            section = _extract_section(report, header)
-            formatted = _format_section(section)
-            formatted_sections.append(f"## {header}\n{formatted}")
-
-        return "\n\n".join(formatted_sections).strip()
-
-    @staticmethod
-    def _append_praise_if_empty(report: str) -> str:
-        if _is_review_empty(report):
-            return f"{report.rstrip()}\n\n{_PRAISE_MESSAGE}\n"
-        return report
-
-
-def _is_review_empty(report: str) -> bool:
-    """모든 헤더 섹션이 비어있는지 확인한다."""
-    if any(f"## {header}" not in report for header in _HEADERS):
-        return False
-    for header in _HEADERS:
-        section = _extract_section(report, header)
-        if not _is_section_empty(section):
-            return False
-    return True
-
-
-def _extract_section(report: str, header: str) -> str:
-    """헤더 마커(## ...)를 기준으로 섹션을 추출한다."""
-    marker = f"## {header}"
-    if marker not in report:
-        return ""
-    start = report.index(marker) + len(marker)
-    section = report[start:]
-    section = section.lstrip("\n")
-    for other in _HEADERS:
-        if other == header:
-            continue
-        other_marker = f"## {other}"
-        idx = section.find(other_marker)
-        if idx != -1:
-            section = section[:idx]
-            break
-    return section.strip()
-
-
-def _is_section_empty(section: str) -> bool:
-    if not section:
-        return True
-    lines = [line.strip() for line in section.splitlines() if line.strip()]
-    if not lines:
-        return True
-    for line in lines:
-        normalized = line.lstrip("-*•").strip()
-        if normalized != "없음":
-            return False
-    return True
-
-
-def _format_section(section: str) -> str:
-    raw_lines = section.splitlines()
-    cleaned: list[str] = []
-    previous_blank = False
-    for raw in raw_lines:
-        if not raw.strip():
-            if cleaned and not previous_blank:
-                cleaned.append("")
-            previous_blank = True
-            continue
-        cleaned.append(raw.rstrip())
-        previous_blank = False
-
-    if not cleaned:
-        return "- 없음"
-
-    return "\n".join(cleaned)
+        started = time.perf_counter()
+        with span("review.split_diff"):
+            chunks = split_diff(context.diff, self._chunk_chars)
+        if len(chunks) == 1:
+            with span("review.prompt_build"):
+                bundle: PromptBundle = build_review_prompt(context, token_budget=self._token_budget, structured=self._llm_client.structured_output)
+            with span("review.llm_call", streaming=on_delta is not None):
+                result = self._generate(bundle, on_delta)
+            with span("review.parse"):
+                parsed = self._parse_output(result.text)
+        else:
+            result, parsed = self._review_in_chunks(context, chunks)
+        with span("review.normalize"):
+            report = _render_review(result.text, parsed)
+
+        latency = time.perf_counter() - started
+        if self._cache and cache_key:
+            with span("review.cache_store"):
+                self._cache.put(cache_key, report, latency_seconds=latency)
+        model = result.model or self._llm_client.model
+        cost = estimate_cost(model, result.usage)
+        _record_usage(model, result.usage, cost)
+        return ReviewResult(report=report, usage=result.usage, model=model, latency_seconds=latency, cost_usd=cost, parsed=parsed)
+
+    def _compact(self, context: ReviewContext) -> ReviewContext:
+        """리뷰 신호가 없는 헝크를 덜어 낸 diff로 바꾸고 MR별 전후 토큰 수를 남긴다."""
+        if self._diff_context is None:
+            return context
+        with span("review.compact_diff"):
+            compacted = compact_diff(context.diff, context=self._diff_context)
+        incr("diff_tokens_before", compacted.tokens_before)
+        incr("diff_tokens_after", compacted.tokens_after)
+        print(
+            f"[llm-code-review] diff compaction: {compacted.tokens_before} -> {compacted.tokens_after} tokens (-{compacted.saved_ratio:.0%}; "
+            f"whitespace hunks={compacted.whitespace_hunks}, renames={compacted.renames}, deleted files={compacted.deleted_files}, "
+            f"context lines={compacted.context_lines})",
+            file=sys.stderr,
+        )
+        return replace(context, diff=compacted.diff)
+
+    def _cache_key(self, context: ReviewContext) -> str:
+        settings = {
+            "model": self._llm_client.model,
+            "reasoning_effort": self._llm_client.reasoning_effort,
+            "text_verbosity": self._llm_client.text_verbosity,
+            "chunk_chars": self._chunk_chars,
+            "token_budget": self._token_budget,
+            "structured_output": self._llm_client.structured_output,
+        }
+        system_prompt = STRUCTURED_SYSTEM_PROMPT if self._llm_client.structured_output else SYSTEM_PROMPT
+        return build_cache_key(context, system_prompt=system_prompt, settings=settings)
+
+    def _parse_output(self, text: str) -> ReviewReport:
+        """모델 출력 한 건을 ReviewReport로 읽는다. 구조화 출력 모드면 JSON, 아니면 마크다운이다."""
+        if not self._llm_client.structured_output:
+            return ReviewReport.parse(text)
+        try:
+            return ReviewReport.from_json(text)
+        except ValueError as exc:
+            raise RuntimeError(f"구조화 리뷰 출력(JSON)을 해석하지 못했습니다: {exc}") from exc
+
+    def _generate(self, bundle: PromptBundle, on_delta: Callable[[str], None] | None) -> LLMResult:
+        if on_delta is None:
+            return self._llm_client.complete(bundle)
+        parts: list[str] = []
+        usages: list[TokenUsage] = []
+        for delta in self._llm_client.generate_stream(bundle, on_usage=usages.append):
+            parts.append(delta)
+            on_delta(delta)
+        return LLMResult(text="".join(parts), usage=sum(usages, TokenUsage()))
+
+    def _review_in_chunks(self, context: ReviewContext, chunks: list[str]) -> tuple[LLMResult, ReviewReport]:
+        """diff 묶음을 병렬로 리뷰한 뒤 하나의 리포트로 합친다. 결과 텍스트는 합친 리포트를 그린 마크다운이다."""
+        total = len(chunks)
+        structured = self._llm_client.structured_output
+        with span("review.prompt_build", chunks=total):
+            bundles = [
+                build_review_prompt(replace(context, diff=chunk), part=(index, total), token_budget=self._token_budget, structured=structured)
+                for index, chunk in enumerate(chunks, start=1)
+            ]
+        workers = min(self._max_workers, total)
+        print(f"[llm-code-review] reviewing diff in {total} chunks (workers={workers})", file=sys.stderr)
+        with span("review.llm_call", chunks=total), ThreadPoolExecutor(max_workers=workers) as pool:
+            partials = list(pool.map(self._complete_chunk, bundles))
+        with span("review.merge"):
+            merged = ReviewReport.merge(self._parse_output(partial.text) for partial in partials)
+            text = merged.render()
+        usage = sum((partial.usage for partial in partials), TokenUsage())
+        return LLMResult(text=text, usage=usage, model=partials[0].model), merged
+
+    def _complete_chunk(self, bundle: PromptBundle) -> LLMResult:
+        with span("review.llm_chunk"):
+            return self._llm_client.complete(bundle)
+
+
+def _render_review(text: str, parsed: ReviewReport) -> str:
+    """모델 출력을 정해진 형식으로 다시 그리고, 지적이 하나도 없으면 칭찬 문구를 붙인다.
+
+    아는 섹션 제목이 하나도 없으면(형식을 벗어난 출력) 내용을 잃지 않도록 원문을 그대로 돌려준다.
+    """
+    if not parsed.structured:
+        return text
+    report = parsed.render()
+    if parsed.is_empty:
+        return f"{report.rstrip()}\n\n{_PRAISE_MESSAGE}\n"
+    return report
+
+
+def _record_usage(model: str, usage: TokenUsage, cost: float | None) -> None:
+    """리뷰 한 건의 토큰 사용량과 예상 비용을 로그와 메트릭 카운터에 남긴다."""
+    cost_text = f"${cost:.4f}" if cost is not None else "unknown (no price for model)"
+    print(
+        f"[llm-code-review] review usage: model={model} input={usage.input_tokens} cached={usage.cached_tokens} "
+        f"output={usage.output_tokens} reasoning={usage.reasoning_tokens} cost≈{cost_text}",
+        file=sys.stderr,
+    )
+    for name, value in usage.to_dict().items():
+        incr(f"llm_{name}", value)
+    if cost is not None:
+        incr("llm_cost_usd", cost)
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.getenv(name, "").strip()
+    try:
+        return int(value) if value else default
+    except ValueError:
+        return default
@@ -0,0 +1,269 @@
+"""GitLab MR 웹훅을 받아 프로세스 안의 워커 풀에서 리뷰하는 상주 서버 모드."""
+
+from __future__ import annotations
+
+import hmac
+import json
+import sys
+import threading
+from collections.abc import Callable, Mapping, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Final
+from urllib.parse import urlsplit
+
+from ai_review_bot.incremental import build_review_marker
+from ai_review_bot.metrics import span
+from ai_review_bot.review import ReviewContext
+from ai_review_bot.review_service import ReviewService
+from ai_review_bot.supersede import LeaseStore, SupersedeGuard, debounce_seconds_from_env, lease_key
+from ai_review_bot.support.asana import build_ticket_context_from_asana
+from ai_review_bot.support.git import diff_excludes_from_env
+from ai_review_bot.support.gitlab import (
+    collect_issue_descriptions,
+    fetch_merge_request_diff,
+    fetch_merge_request_head_sha,
+    fetch_repository_file,
+    post_merge_request_note,
+)
+
+_REVIEW_ACTIONS: Final[frozenset[str]] = frozenset({"open", "reopen", "update"})
+_MAX_BODY_BYTES: Final[int] = 5 * 1024 * 1024
+_DEFAULT_QUEUE_SIZE: Final[int] = 100
+
+
+@dataclass(frozen=True)
+class MergeRequestJob:
+    """웹훅 페이로드에서 읽은 리뷰 작업."""
+
+    api_url: str
+    project_id: str
+    project_name: str
+    mr_iid: str
+    head_sha: str
+    description: str = ""
+
+
+def parse_merge_request_event(payload: Mapping[str, Any], *, api_url: str) -> MergeRequestJob | None:
+    """리뷰가 필요한 MR 이벤트면 작업으로 바꾸고, 아니면 None을 돌려준다.
+
+    - open/reopen과 새 커밋이 올라온 update(`oldrev`가 있는 경우)만 리뷰한다. 제목·라벨만 바뀐 update는 무시한다.
+    - Draft MR과 닫힌 MR은 무시한다.
+    - GITLAB_TOKEN을 보낼 곳은 설정된 api_url로만 정한다. 프로젝트 web_url의 호스트가 api_url과 다르면
+      다른 GitLab(또는 위조된 페이로드)에서 온 이벤트로 보고 무시한다.
+    """
+    if payload.get("object_kind") != "merge_request":
+        return None
+    attrs = payload.get("object_attributes") or {}
+    project = payload.get("project") or {}
+    action = str(attrs.get("action") or "")
+    if action not in _REVIEW_ACTIONS or (action == "update" and not attrs.get("oldrev")):
+        return None
+    if attrs.get("state") not in (None, "opened") or attrs.get("draft") or attrs.get("work_in_progress"):
+        return None
+
+    head_sha = str((attrs.get("last_commit") or {}).get("id") or "")
+    project_id = str(project.get("id") or attrs.get("target_project_id") or "")
+    mr_iid = str(attrs.get("iid") or "")
+    if not (head_sha and project_id and mr_iid):
+        return None
+    web_host = urlsplit(str(project.get("web_url") or "")).hostname
+    if web_host and web_host != urlsplit(api_url).hostname:
+        return None
+    return MergeRequestJob(
+        api_url=api_url.rstrip("/"),
+        project_id=project_id,
+        project_name=str(project.get("path") or project.get("name") or project_id),
+        mr_iid=mr_iid,
+        head_sha=head_sha,
+        description=str(attrs.get("description") or ""),
+    )
+
+
+class ReviewWorker:
+    """하나의 ReviewService와 공유 HTTP 연결 풀을 재사용해 MR 리뷰를 처리하는 워커 풀.
+
+    대기 중인 작업이 queue_size를 넘으면 submit이 False를 돌려 호출자가 요청을 거절하게 한다.
+    같은 MR에 새 push가 들어오면 대기·진행 중인 이전 작업은 LLM 호출 전·코멘트 등록 전에 멈추고,
+    debounce_seconds(기본 LLM_REVIEW_DEBOUNCE_SECONDS) 안에 연달아 온 push는 마지막 것만 리뷰한다.
+    API로 받은 diff에도 CI 모드와 같은 제외 목록(diff_excludes, 기본 LLM_REVIEW_DIFF_EXCLUDE)을 적용한다.
+    GitLab 호출 함수는 테스트에서 바꿔 끼울 수 있다.
+    """
+
+    def __init__(
+        self,
+        service: ReviewService,
+        *,
+        token: str,
+        max_workers: int = 4,
+        queue_size: int = _DEFAULT_QUEUE_SIZE,
+        fetch_diff: Callable[..., str] = fetch_merge_request_diff,
+        fetch_file: Callable[..., str | None] = fetch_repository_file,
+        post_note: Callable[..., None] = post_merge_request_note,
+        fetch_head_sha: Callable[..., str | None] = fetch_merge_request_head_sha,
+        collect_tickets: Callable[[MergeRequestJob, str], str | None] | None = None,
+        leases: LeaseStore | None = None,
+        debounce_seconds: float | None = None,
+        diff_excludes: Sequence[str] | None = None,
+    ) -> None:
+        self._service = service
+        self._token = token
+        self._pool = ThreadPoolExecutor(max_workers=max(max_workers, 1), thread_name_prefix="review-worker")
+        self._slots = threading.BoundedSemaphore(max(queue_size, 1))
+        self._fetch_diff = fetch_diff
+        self._fetch_file = fetch_file
+        self._post_note = post_note
+        self._fetch_head_sha = fetch_head_sha
+        self._leases = leases or LeaseStore()
+        self._debounce_seconds = debounce_seconds_from_env() if debounce_seconds is None else debounce_seconds
+        self._collect_tickets = collect_tickets or _collect_ticket_context
+        self._diff_excludes = diff_excludes_from_env() if diff_excludes is None else tuple(diff_excludes)
+        self._lock = threading.Lock()
+        self._pending = 0
+
+    @property
+    def pending(self) -> int:
+        with self._lock:
+            return self._pending
+
+    def submit(self, job: MergeRequestJob) -> bool:
+        if not self._slots.acquire(blocking=False):
+            return False
+        with self._lock:
+            self._pending += 1
+        future = self._pool.submit(self._run, job, self._guard(job))
+        future.add_done_callback(lambda _future: self._release())
+        return True
+
+    def shutdown(self, *, wait: bool = True) -> None:
+        self._pool.shutdown(wait=wait)
+
+    def _release(self) -> None:
+        with self._lock:
+            self._pending -= 1
+        self._slots.release()
+
+    def _guard(self, job: MergeRequestJob) -> SupersedeGuard:
+        """작업을 큐에 넣을 때 리스를 잡아 같은 MR의 이전 작업을 대체한다."""
+        gitlab = {"api_url": job.api_url, "project_id": job.project_id, "mr_iid": job.mr_iid, "token": self._token}
+        return SupersedeGuard(
+            self._leases,
+            self._leases.claim(lease_key(job.api_url, job.project_id, job.mr_iid), job.head_sha),
+            latest_head_sha=lambda: self._fetch_head_sha(**gitlab),
+            debounce_seconds=self._debounce_seconds,
+        )
+
+    def _run(self, job: MergeRequestJob, guard: SupersedeGuard) -> None:
+        label = f"project={job.project_id} mr={job.mr_iid} sha={job.head_sha[:8]}"
+        try:
+            if guard.wait_debounce():
+                return
+            with span("server.review", project=job.project_name):
+                posted = self.process(job, guard=guard)
+            if posted:
+                print(f"[llm-code-review] server review posted: {label}")
+        except Exception as exc:  # 한 MR의 실패가 워커를 멈추지 않게 한다
+            print(f"[llm-code-review] ERROR: server review failed ({label}): {exc}", file=sys.stderr)
+
+    def process(self, job: MergeRequestJob, *, guard: SupersedeGuard | None = None) -> bool:
+        """diff·AGENTS.md·티켓을 API로 모아 리뷰하고 결과를 MR 코멘트로 남긴다. 코멘트를 남겼으면 True."""
+        gitlab = {"api_url": job.api_url, "project_id": job.project_id, "token": self._token}
+        diff = self._fetch_diff(mr_iid=job.mr_iid, excludes=self._diff_excludes, **gitlab)
+        if not diff.strip():
+            print(f"[llm-code-review] MR {job.mr_iid} has no diff – skipping.")
+            return False
+        overview = self._fetch_file(path="AGENTS.md", ref=job.head_sha, **gitlab)
+        ticket_context = self._collect_tickets(job, self._token) if job.description else None
+        if guard and guard.superseded("the LLM call"):
+            return False
+        report = self._service.create_review(
+            ReviewContext(
+                project_name=job.project_name,
+                pr_number=job.mr_iid,
+                diff=diff,
+                ticket_context=ticket_context,
+                project_overview=overview,
+            )
+        )
+        if guard and guard.superseded("posting the review"):
+            return False
+        body = f"{report.rstrip()}\n\n{build_review_marker(job.head_sha)}\n"
+        self._post_note(mr_iid=job.mr_iid, body=body, **gitlab)
+        return True
+
+
+def make_handler(worker: ReviewWorker, *, secret: str, api_url: str) -> type[BaseHTTPRequestHandler]:
+    """웹훅 요청을 검증해 워커에 넘기는 요청 핸들러 클래스를 만든다. secret이 맞지 않는 요청은 모두 401이다."""
+
+    class _WebhookHandler(BaseHTTPRequestHandler):
+        server_version = "ai-review-bot"
+
+        def do_GET(self) -> None:  # BaseHTTPRequestHandler 규약
+            if self.path.rstrip("/") != "/healthz":
+                self._reply(404, {"status": "not_found"})
+                return
+            self._reply(200, {"status": "ok", "pending": worker.pending})
+
+        def do_POST(self) -> None:  # BaseHTTPRequestHandler 규약
+            if not hmac.compare_digest(self.headers.get("X-Gitlab-Token", ""), secret):
+                self._reply(401, {"status": "unauthorized"})
+                return
+            try:
+                length = int(self.headers.get("Content-Length") or 0)
+            except ValueError:
+                length = 0
+            if length <= 0 or length > _MAX_BODY_BYTES:
+                self._reply(400, {"status": "bad_request", "error": "invalid body size"})
+                return
+            try:
+                payload = json.loads(self.rfile.read(length))
+            except ValueError:
+                self._reply(400, {"status": "bad_request", "error": "invalid JSON"})
+                return
+
+            job = parse_merge_request_event(payload, api_url=api_url) if isinstance(payload, dict) else None
+            if job is None:
+                self._reply(200, {"status": "ignored"})
+                return
+            if not worker.submit(job):
+                self._reply(503, {"status": "busy"})
+                return
+            print(f"[llm-code-review] webhook accepted: project={job.project_id} mr={job.mr_iid} sha={job.head_sha[:8]}")
+            self._reply(202, {"status": "queued", "project_id": job.project_id, "mr_iid": job.mr_iid})
+
+        def log_message(self, format: str, *args: Any) -> None:  # BaseHTTPRequestHandler 시그니처
+            print(f"[llm-code-review] http {self.address_string()} {format % args}")
+
+        def _reply(self, status: int, body: Mapping[str, Any]) -> None:
+            encoded = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(encoded)))
+            self.end_headers()
+            self.wfile.write(encoded)
+
+    return _WebhookHandler
+
+
+def create_server(
+    worker: ReviewWorker,
+    *,
+    host: str = "0.0.0.0",
+    port: int = 8080,
+    secret: str,
+    api_url: str,
+) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer((host, port), make_handler(worker, secret=secret, api_url=api_url))
+    server.daemon_threads = True
+    return server
+
+
+def _collect_ticket_context(job: MergeRequestJob, token: str) -> str | None:
+    """웹훅에 담긴 MR 설명으로 연결된 이슈·Asana 티켓을 모은다(MR 조회 호출은 생략)."""
+    try:
+        issue_bodies = collect_issue_descriptions(job.description, api_url=job.api_url, project_id=job.project_id, token=token)
+        return build_ticket_context_from_asana(job.description, extra_texts=issue_bodies)
+    except Exception as exc:  # pragma: no cover - 방어적 로깅
+        print(f"[llm-code-review] WARN: failed to collect ticket context: {exc}", file=sys.stderr)
+        return None
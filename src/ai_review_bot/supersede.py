@@ -0,0 +1,168 @@
+"""같은 MR에 push가 연달아 올 때 마지막 커밋만 리뷰하도록 하는 MR별 리스(lease).
+
+리뷰를 시작할 때 project+MR 키로 리스를 잡으면 세대 번호가 올라가고, 이전 세대의 리뷰는
+LLM 호출 전·코멘트 등록 전 확인 지점에서 스스로 멈춘다. GitLab API의 현재 head SHA도 함께 확인해
+저장소를 공유하지 않는 러너끼리도 오래된 리뷰를 건너뛴다.
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import sys
+import threading
+import time
+from collections.abc import Callable
+from contextlib import closing
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Final
+
+from ai_review_bot.metrics import incr
+
+_SCHEMA: Final[str] = "CREATE TABLE IF NOT EXISTS leases (key TEXT PRIMARY KEY, head_sha TEXT NOT NULL, generation INTEGER NOT NULL, claimed_at REAL NOT NULL)"
+
+
+@dataclass(frozen=True)
+class Lease:
+    """한 번의 리뷰가 잡은 MR 리스."""
+
+    key: str
+    head_sha: str
+    generation: int
+    claimed_at: float
+
+
+def lease_key(api_url: str, project_id: str, mr_iid: str) -> str:
+    return f"{api_url.rstrip('/')}|{project_id}|{mr_iid}"
+
+
+class LeaseStore:
+    """MR별 최신 head SHA와 세대 번호를 기록한다.
+
+    path가 있으면 SQLite(WAL) 파일에 저장해 같은 호스트의 CI 작업끼리 공유하고, 없으면 프로세스 메모리에 둔다.
+    """
+
+    def __init__(self, path: str | Path | None = None, *, clock: Callable[[], float] = time.time) -> None:
+        self._path = Path(path) if path else None
+        self._clock = clock
+        self._memory: dict[str, Lease] = {}
+        self._lock = threading.Lock()
+        if self._path:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            with closing(self._connect()) as conn, conn:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute(_SCHEMA)
+
+    @classmethod
+    def from_env(cls) -> LeaseStore:
+        """LLM_REVIEW_LEASE_PATH가 있으면 SQLite 파일을, 없으면 메모리 저장소를 쓴다."""
+        path = os.getenv("LLM_REVIEW_LEASE_PATH", "").strip()
+        if path:
+            try:
+                return cls(path)
+            except (OSError, sqlite3.Error) as exc:  # pragma: no cover - 리스 저장소 실패는 리뷰를 막지 않는다
+                print(f"[llm-code-review] WARN: lease store disabled: {exc}", file=sys.stderr)
+        return cls()
+
+    def claim(self, key: str, head_sha: str, *, latest_head_sha: str | None = None) -> Lease:
+        """key의 세대 번호를 올리고 새 리스를 돌려준다. 이전 리스는 더 이상 현재 리스가 아니다.
+
+        latest_head_sha(MR의 현재 head)를 알고 head_sha와 다르면 이미 오래된 push이므로 세대를 올리지 않는다.
+        재시도된 이전 파이프라인이 더 새 head를 리뷰 중인 작업을 대체하지 않게 하려는 것으로, 이때 돌려주는
+        리스(세대 0)는 처음부터 현재 리스가 아니다.
+        """
+        now = self._clock()
+        if latest_head_sha and latest_head_sha != head_sha:
+            return Lease(key=key, head_sha=head_sha, generation=0, claimed_at=now)
+        if self._path is None:
+            with self._lock:
+                previous = self._memory.get(key)
+                lease = Lease(key=key, head_sha=head_sha, generation=(previous.generation if previous else 0) + 1, claimed_at=now)
+                self._memory[key] = lease
+                return lease
+
+        with closing(self._connect()) as conn, conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute("SELECT generation FROM leases WHERE key = ?", (key,)).fetchone()
+            generation = (row[0] if row else 0) + 1
+            conn.execute("INSERT OR REPLACE INTO leases (key, head_sha, generation, claimed_at) VALUES (?, ?, ?, ?)", (key, head_sha, generation, now))
+        return Lease(key=key, head_sha=head_sha, generation=generation, claimed_at=now)
+
+    def current(self, key: str) -> Lease | None:
+        if self._path is None:
+            with self._lock:
+                return self._memory.get(key)
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT head_sha, generation, claimed_at FROM leases WHERE key = ?", (key,)).fetchone()
+        return Lease(key=key, head_sha=row[0], generation=row[1], claimed_at=row[2]) if row else None
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self._path, timeout=10, isolation_level=None)
+
+
+class SupersedeGuard:
+    """리스 하나에 대해 더 새로운 push가 있었는지 확인한다.
+
+    - debounce_seconds 동안 기다리는 사이 같은 MR에 새 push가 오면 이 리뷰는 건너뛴다.
+    - latest_head_sha는 GitLab API로 MR의 현재 head SHA를 돌려주는 함수다. 실패(None·예외)하면 무시한다.
+    """
+
+    def __init__(
+        self,
+        store: LeaseStore,
+        lease: Lease,
+        *,
+        latest_head_sha: Callable[[], str | None] | None = None,
+        debounce_seconds: float = 0.0,
+        clock: Callable[[], float] = time.time,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.lease = lease
+        self._store = store
+        self._latest_head_sha = latest_head_sha
+        self._debounce_seconds = debounce_seconds
+        self._clock = clock
+        self._sleep = sleep
+
+    def newer_head_sha(self) -> str | None:
+        """이 리뷰를 대체한 더 새로운 head SHA. 여전히 최신이면 None."""
+        current = self._store.current(self.lease.key)
+        if current is not None and current.generation != self.lease.generation:
+            return current.head_sha
+        if self._latest_head_sha is None:
+            return None
+        try:
+            latest = self._latest_head_sha()
+        except Exception:  # 확인 실패는 리뷰를 막지 않는다
+            return None
+        return latest if latest and latest != self.lease.head_sha else None
+
+    def superseded(self, stage: str) -> bool:
+        """stage 직전에 확인해 대체됐으면 로그와 카운터를 남기고 True를 돌려준다."""
+        newer = self.newer_head_sha()
+        if newer is None:
+            return False
+        incr("review_superseded")
+        print(f"[llm-code-review] {self.lease.head_sha[:8]} superseded by {newer[:8]} – skipping {stage}.", file=sys.stderr)
+        return True
+
+    def wait_debounce(self) -> bool:
+        """리스를 잡은 뒤 debounce_seconds가 지날 때까지 기다린다. 그동안 대체됐으면 True."""
+        if self.superseded("the review"):
+            return True
+        remaining = self.lease.claimed_at + self._debounce_seconds - self._clock()
+        if remaining <= 0:
+            return False
+        print(f"[llm-code-review] waiting {remaining:.1f}s for newer pushes to {self.lease.key}", file=sys.stderr)
+        self._sleep(remaining)
+        return self.superseded("the review")
+
+
+def debounce_seconds_from_env() -> float:
+    """LLM_REVIEW_DEBOUNCE_SECONDS(기본 0: 기다리지 않음)."""
+    value = os.getenv("LLM_REVIEW_DEBOUNCE_SECONDS", "").strip()
+    try:
+        return max(float(value), 0.0) if value else 0.0
+    except ValueError:
+        return 0.0
@@ -7,7 +7,9 @@ import re
 import sys
 from typing import Any, Callable, Mapping
 
-import requests
+from ai_review_bot.metrics import span
+from ai_review_bot.support.http import fetch_all
+from ai_review_bot.support.ticket_cache import get_json_cached, get_ticket_cache
 
 _ASANA_URL_PATTERN = re.compile(
     r"https://app\.asana\.com/"
@@ -33,6 +35,7 @@ def _default_fetcher(task_id: str) -> Mapping[str, Any] | None:
     """Asana API를 호출해 태스크 정보를 가져온다.
 
     ASANA_ACCESS_TOKEN이 없거나 호출 실패 시 None을 반환한다.
+    LLM_REVIEW_TICKET_CACHE_PATH가 있으면 TTL/ETag 캐시를 거친다.
     """
     token = os.getenv("ASANA_ACCESS_TOKEN")
     if not token:
@@ -40,23 +43,19 @@ def _default_fetcher(task_id: str) -> Mapping[str, Any] | None:
         return None
 
     url = f"https://app.asana.com/api/1.0/tasks/{task_id}"
-    try:
-        resp = requests.get(
+    with span("asana.task_fetch", task=task_id):
+        return get_json_cached(
             url,
+            key=f"asana:{url}",
             headers={"Authorization": f"Bearer {token}"},
-            timeout=10,
+            extract=_extract_task_data,
+            cache=get_ticket_cache(),
         )
-    except Exception:
-        return None
 
-    if not resp.ok:
-        return None
 
-    try:
-        data = resp.json()
-    except ValueError:
+def _extract_task_data(data: Any) -> Mapping[str, Any] | None:
+    if not isinstance(data, Mapping):
         return None
-
     return data.get("data") or None
 
 
@@ -64,11 +63,13 @@ def build_ticket_context_from_asana(
     description: str,
     fetcher: Callable[[str], Mapping[str, Any] | None] | None = None,
     extra_texts: list[str] | None = None,
+    max_workers: int | None = None,
 ) -> str | None:
     """MR description에서 Asana 링크를 찾아 티켓 요약 텍스트를 생성한다.
 
     - Asana 링크가 없으면 None을 반환한다.
     - ASANA_ACCESS_TOKEN이 없거나 API 호출이 실패하면 None을 반환한다.
+    - 태스크는 최대 max_workers개씩 동시에 가져오고, 출력 순서는 링크가 등장한 순서를 따른다.
     - 테스트에서는 fetcher를 주입해 네트워크 호출 없이 동작을 검증할 수 있다.
     """
     texts = [description] + (extra_texts or [])
@@ -87,8 +88,7 @@ def build_ticket_context_from_asana(
     fetch = fetcher or _default_fetcher
     lines: list[str] = []
 
-    for task_id in task_ids:
-        data = fetch(task_id)
+    for task_id, data in zip(task_ids, fetch_all(fetch, task_ids, max_workers=max_workers), strict=True):
         if not data:
             continue
         name = str(data.get("name") or "").strip()
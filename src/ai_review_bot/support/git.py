@@ -0,0 +1,182 @@
+"""`git diff`를 한 번의 프로세스로 실행해 파일 단위로 스트리밍하는 유틸리티.
+
+merge-base 계산(`target...sha`), 이름 변경 감지(-M), 경로 제외(pathspec), 바이너리 본문 생략을 모두 git 안에서
+처리하고, 출력은 파이프에서 한 줄씩 읽어 파일 단위로 넘긴다. 잠금 파일·벤더 코드·스냅샷·압축 자산은 애초에
+diff에 들어오지 않으며, 크기 상한을 넘은 뒤의 파일은 메모리에 쌓지 않고 건너뛴다.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import subprocess
+import sys
+import tempfile
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Final
+
+from ai_review_bot.diff import parse_diff
+
+# 리뷰할 내용이 없는 생성·벤더 파일(packing의 생성 파일 분류와 같은 종류)
+DEFAULT_DIFF_EXCLUDES: Final[tuple[str, ...]] = (
+    "**/package-lock.json",
+    "**/yarn.lock",
+    "**/pnpm-lock.yaml",
+    "**/poetry.lock",
+    "**/Pipfile.lock",
+    "**/Cargo.lock",
+    "**/go.sum",
+    "**/composer.lock",
+    "**/Gemfile.lock",
+    "**/*.min.js",
+    "**/*.min.css",
+    "**/*.map",
+    "**/*.snap",
+    "**/__snapshots__/**",
+    "**/vendor/**",
+    "**/node_modules/**",
+)
+_DEFAULT_MAX_BYTES: Final[int] = 16 * 1024 * 1024
+_FILE_HEADER: Final[str] = "diff --git "
+
+
+@dataclass(frozen=True)
+class DiffOutput:
+    """읽어 들인 diff와 크기 상한 때문에 건너뛴 파일 경로."""
+
+    text: str
+    files: int
+    skipped_paths: tuple[str, ...] = ()
+
+    @property
+    def skipped_files(self) -> int:
+        return len(self.skipped_paths)
+
+
+def build_diff_args(base: str, head: str, *, excludes: Sequence[str] = DEFAULT_DIFF_EXCLUDES, merge_base: bool = True) -> list[str]:
+    """`git diff` 인자를 만든다. merge_base가 True면 `base...head`로 git이 merge-base를 직접 계산한다."""
+    revision = f"{base}...{head}" if merge_base else f"{base}..{head}"
+    pathspecs = [f":(exclude,glob){pattern}" for pattern in excludes]
+    # --no-textconv/--no-ext-diff: 바이너리는 본문 없이 "Binary files ... differ" 한 줄만 남긴다.
+    return [
+        "git",
+        "-c",
+        "core.quotePath=false",
+        "diff",
+        "--no-color",
+        "--no-ext-diff",
+        "--no-textconv",
+        "-M",
+        revision,
+        "--",
+        ".",
+        *pathspecs,
+    ]
+
+
+def iter_diff_chunks(args: Sequence[str], *, cwd: str) -> Iterator[str]:
+    """git diff를 실행해 stdout을 파이프로 읽으며 파일 하나(`diff --git` 헤더부터)씩 내보낸다.
+
+    git이 실패하면 RuntimeError. stderr는 임시 파일로 받아, 경고가 많아도 파이프가 차서 git이 멈추지 않게 한다.
+    """
+    print(f"[llm-code-review] run: {' '.join(args)}")
+    with (
+        tempfile.TemporaryFile() as stderr_file,
+        subprocess.Popen(args, cwd=cwd, stdout=subprocess.PIPE, stderr=stderr_file, encoding="utf-8", errors="replace") as proc,
+    ):
+        finished = False
+        try:
+            chunk: list[str] = []
+            for line in proc.stdout:
+                if line.startswith(_FILE_HEADER) and chunk:
+                    yield "".join(chunk)
+                    chunk = []
+                chunk.append(line)
+            if chunk:
+                yield "".join(chunk)
+            finished = True
+        finally:
+            # 소비자가 중간에 멈추면 파이프가 차서 git이 끝나지 않으므로 직접 종료한다.
+            if not finished:
+                proc.kill()
+        if proc.wait() != 0:
+            stderr_file.seek(0)
+            stderr = stderr_file.read().decode("utf-8", errors="replace")
+            raise RuntimeError(f"git diff failed (exit={proc.returncode}): {stderr.strip()}")
+
+
+def read_diff(args: Sequence[str], *, cwd: str, max_bytes: int | None = None) -> DiffOutput:
+    """diff를 스트리밍으로 읽어 max_bytes(기본 LLM_REVIEW_DIFF_MAX_BYTES)까지만 모은다.
+
+    상한을 넘는 파일부터는 본문을 버리고 경로만 남긴다(프롬프트 예산을 한참 넘는 diff는 어차피 잘린다).
+    """
+    limit = max_bytes if max_bytes is not None else diff_max_bytes_from_env()
+    parts: list[str] = []
+    skipped: list[str] = []
+    size = 0
+    for chunk in iter_diff_chunks(args, cwd=cwd):
+        chunk_size = len(chunk.encode("utf-8"))
+        if skipped or size + chunk_size > limit:
+            skipped.append(_chunk_path(chunk))
+            continue
+        parts.append(chunk)
+        size += chunk_size
+    if skipped:
+        print(f"[llm-code-review] WARN: diff exceeds {limit} bytes – skipped {len(skipped)} file(s)", file=sys.stderr)
+    return DiffOutput(text="".join(parts), files=len(parts), skipped_paths=tuple(skipped))
+
+
+def _chunk_path(chunk: str) -> str:
+    """파일 청크의 경로. 경로에 `" b/"`가 들어가도 packing·제외 규칙과 같은 경로가 되도록 diff 모듈의 해석을 쓴다."""
+    file = next(parse_diff(chunk), None)
+    return file.path if file is not None and file.path else chunk.split("\n", 1)[0].removeprefix(_FILE_HEADER)
+
+
+def is_excluded_path(path: str, excludes: Sequence[str]) -> bool:
+    """경로가 제외 glob 중 하나에 맞는지 본다. `git diff`의 `:(exclude,glob)` pathspec과 같은 규칙을 따른다.
+
+    `*`·`?`는 `/`를 넘지 않고, `**/`는 0개 이상의 디렉터리, 끝의 `/**`는 그 아래 모든 경로에 맞는다.
+    API로 받은 diff(웹훅 모드)에도 로컬 git diff와 같은 제외 목록을 적용할 때 쓴다.
+    """
+    return any(_glob_regex(pattern).fullmatch(path) for pattern in excludes)
+
+
+@lru_cache(maxsize=128)
+def _glob_regex(pattern: str) -> re.Pattern[str]:
+    parts: list[str] = []
+    index = 0
+    while index < len(pattern):
+        if pattern.startswith("**/", index) and (index == 0 or pattern[index - 1] == "/"):
+            parts.append("(?:.*/)?")
+            index += 3
+        elif pattern.startswith("**", index) and index + 2 == len(pattern) and (index == 0 or pattern[index - 1] == "/"):
+            parts.append(".*")
+            index += 2
+        elif pattern[index] == "*":
+            parts.append("[^/]*")
+            index += 1
+        elif pattern[index] == "?":
+            parts.append("[^/]")
+            index += 1
+        else:
+            parts.append(re.escape(pattern[index]))
+            index += 1
+    return re.compile("".join(parts))
+
+
+def diff_excludes_from_env() -> tuple[str, ...]:
+    """LLM_REVIEW_DIFF_EXCLUDE(쉼표·줄바꿈 구분 glob). 설정하면 기본 제외 목록을 대체하고, `none`이면 아무것도 제외하지 않는다."""
+    value = os.getenv("LLM_REVIEW_DIFF_EXCLUDE")
+    if value is None or not value.strip():
+        return DEFAULT_DIFF_EXCLUDES
+    if value.strip().lower() == "none":
+        return ()
+    return tuple(pattern.strip() for pattern in value.replace("\n", ",").split(",") if pattern.strip())
+
+
+def diff_max_bytes_from_env() -> int:
+    """LLM_REVIEW_DIFF_MAX_BYTES(기본 16MiB): 메모리에 모을 diff 크기 상한."""
+    value = os.getenv("LLM_REVIEW_DIFF_MAX_BYTES", "").strip()
+    return int(value) if value.isdigit() and int(value) > 0 else _DEFAULT_MAX_BYTES
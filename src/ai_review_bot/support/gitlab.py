@@ -3,9 +3,13 @@
 from __future__ import annotations
 
 import re
-from typing import Any, Callable, Mapping
+from typing import Any, Callable, Mapping, Sequence
+from urllib.parse import quote
 
-import requests
+from ai_review_bot.metrics import span
+from ai_review_bot.support.git import is_excluded_path
+from ai_review_bot.support.http import fetch_all, get_http_client
+from ai_review_bot.support.ticket_cache import get_json_cached, get_ticket_cache
 
 _ISSUE_IID_PATTERN = re.compile(
     r"(?:https?://[^\s]+?/"
@@ -36,20 +40,14 @@ def _default_issue_fetcher(
     token: str,
 ) -> Mapping[str, Any] | None:
     url = f"{api_url}/projects/{project_id}/issues/{issue_iid}"
-    try:
-        resp = requests.get(
+    with span("gitlab.issue_fetch", issue=issue_iid):
+        return get_json_cached(
             url,
+            key=f"gitlab:{url}",
             headers={"PRIVATE-TOKEN": token},
-            timeout=10,
+            extract=lambda data: data if isinstance(data, Mapping) else None,
+            cache=get_ticket_cache(),
         )
-    except Exception:
-        return None
-    if not resp.ok:
-        return None
-    try:
-        return resp.json()
-    except ValueError:
-        return None
 
 
 def collect_issue_descriptions(
@@ -59,8 +57,12 @@ def collect_issue_descriptions(
     project_id: str,
     token: str,
     fetcher: Callable[[str, str, str, str], Mapping[str, Any] | None] | None = None,
+    max_workers: int | None = None,
 ) -> list[str]:
-    """PR/MR 설명에 포함된 이슈 링크를 따라가 이슈 본문을 수집한다."""
+    """PR/MR 설명에 포함된 이슈 링크를 따라가 이슈 본문을 수집한다.
+
+    이슈는 최대 max_workers개씩 동시에 가져오며, 결과 순서는 설명에 등장한 순서를 따른다.
+    """
     issue_iids = extract_issue_iids(description)
     if not issue_iids:
         return []
@@ -68,8 +70,12 @@ def collect_issue_descriptions(
     fetch = fetcher or _default_issue_fetcher
     bodies: list[str] = []
 
-    for issue_iid in issue_iids:
-        data = fetch(issue_iid, api_url=api_url, project_id=project_id, token=token)
+    results = fetch_all(
+        lambda issue_iid: fetch(issue_iid, api_url=api_url, project_id=project_id, token=token),
+        issue_iids,
+        max_workers=max_workers,
+    )
+    for data in results:
         if not data:
             continue
         body = str(data.get("description") or "").strip()
@@ -77,3 +83,171 @@ def collect_issue_descriptions(
             bodies.append(body)
 
     return bodies
+
+
+def fetch_merge_request_notes(
+    *,
+    api_url: str,
+    project_id: str,
+    mr_iid: str,
+    token: str,
+    per_page: int = 100,
+) -> list[Mapping[str, Any]]:
+    """MR 노트를 최신순으로 한 페이지 가져온다. 실패하면 빈 목록을 돌려준다."""
+    url = f"{api_url}/projects/{project_id}/merge_requests/{mr_iid}/notes"
+    try:
+        with span("gitlab.notes_fetch"):
+            resp = get_http_client().get(
+                url,
+                headers={"PRIVATE-TOKEN": token},
+                params={"sort": "desc", "order_by": "created_at", "per_page": per_page},
+                timeout=10,
+            )
+    except Exception:
+        return []
+    if not resp.ok:
+        return []
+    try:
+        data = resp.json()
+    except ValueError:
+        return []
+    return [note for note in data if isinstance(note, Mapping)] if isinstance(data, list) else []
+
+
+def fetch_merge_request_diff(
+    *,
+    api_url: str,
+    project_id: str,
+    mr_iid: str,
+    token: str,
+    per_page: int = 100,
+    excludes: Sequence[str] = (),
+) -> str:
+    """MR 변경분을 API(`/diffs`)로 받아 git diff와 같은 unified diff 텍스트로 조립한다.
+
+    excludes(glob)에 맞는 파일은 로컬 `git diff`의 제외 pathspec처럼 결과에서 뺀다.
+    """
+    url = f"{api_url}/projects/{project_id}/merge_requests/{mr_iid}/diffs"
+    parts: list[str] = []
+    page = 1
+    while True:
+        with span("gitlab.diff_fetch", page=page):
+            resp = get_http_client().get(url, headers={"PRIVATE-TOKEN": token}, params={"page": page, "per_page": per_page}, timeout=30)
+        if not resp.ok:
+            raise RuntimeError(f"GitLab MR diff를 가져오지 못했습니다 (status={resp.status_code}): {url}")
+        entries = resp.json()
+        parts.extend(_render_diff_entry(entry) for entry in entries if isinstance(entry, Mapping) and not _is_excluded_entry(entry, excludes))
+        next_page = resp.headers.get("X-Next-Page", "").strip()
+        if not next_page or not entries:
+            break
+        page = int(next_page)
+    return "".join(parts)
+
+
+def fetch_repository_file(*, api_url: str, project_id: str, path: str, ref: str, token: str) -> str | None:
+    """저장소 파일 원문을 가져온다. 없거나 실패하면 None."""
+    encoded = quote(path, safe="")
+    url = f"{api_url}/projects/{project_id}/repository/files/{encoded}/raw"
+    try:
+        with span("gitlab.file_fetch", path=path):
+            resp = get_http_client().get(url, headers={"PRIVATE-TOKEN": token}, params={"ref": ref}, timeout=10)
+    except Exception:
+        return None
+    return resp.text if resp.ok else None
+
+
+def fetch_merge_request_head_sha(*, api_url: str, project_id: str, mr_iid: str, token: str) -> str | None:
+    """MR의 현재 head 커밋 SHA. 조회에 실패하면 None."""
+    url = f"{api_url}/projects/{project_id}/merge_requests/{mr_iid}"
+    try:
+        with span("gitlab.mr_head_fetch"):
+            resp = get_http_client().get(url, headers={"PRIVATE-TOKEN": token}, timeout=10)
+        if not resp.ok:
+            return None
+        return str(resp.json().get("sha") or "") or None
+    except Exception:
+        return None
+
+
+def fetch_current_user(*, api_url: str, token: str) -> dict[str, Any] | None:
+    """토큰 주인(봇 계정)의 `id`와 `username`. 조회에 실패하면 None."""
+    try:
+        with span("gitlab.current_user_fetch"):
+            resp = get_http_client().get(f"{api_url}/user", headers={"PRIVATE-TOKEN": token}, timeout=10)
+        if not resp.ok:
+            return None
+        data = resp.json()
+    except Exception:
+        return None
+    if not isinstance(data, dict) or data.get("id") is None:
+        return None
+    return {"id": data["id"], "username": data.get("username")}
+
+
+def fetch_merge_request_diff_refs(*, api_url: str, project_id: str, mr_iid: str, token: str) -> dict[str, str] | None:
+    """인라인 토론 위치에 쓸 MR의 `diff_refs`(base_sha, start_sha, head_sha). 조회에 실패하면 None."""
+    url = f"{api_url}/projects/{project_id}/merge_requests/{mr_iid}"
+    try:
+        with span("gitlab.mr_diff_refs_fetch"):
+            resp = get_http_client().get(url, headers={"PRIVATE-TOKEN": token}, timeout=10)
+        if not resp.ok:
+            return None
+        refs = resp.json().get("diff_refs") or {}
+    except Exception:
+        return None
+    keys = ("base_sha", "start_sha", "head_sha")
+    return {key: str(refs[key]) for key in keys} if all(refs.get(key) for key in keys) else None
+
+
+def post_merge_request_note(*, api_url: str, project_id: str, mr_iid: str, token: str, body: str) -> None:
+    """MR에 코멘트(노트)를 남긴다. 실패하면 RuntimeError."""
+    url = f"{api_url}/projects/{project_id}/merge_requests/{mr_iid}/notes"
+    print(f"[llm-code-review] posting comment to GitLab: {url}")
+    with span("gitlab.note_post"):
+        resp = get_http_client().post(
+            url,
+            headers={"PRIVATE-TOKEN": token, "Content-Type": "application/json"},
+            json={"body": body},
+            timeout=30,
+        )
+    if not resp.ok:
+        raise RuntimeError(f"failed to post comment (status={resp.status_code}): {resp.text}")
+
+
+def post_merge_request_discussion(*, api_url: str, project_id: str, mr_iid: str, token: str, body: str, position: Mapping[str, Any]) -> None:
+    """MR diff의 position 위치에 인라인 토론을 연다. 실패하면 RuntimeError(429는 공유 클라이언트가 Retry-After를 따라 재시도)."""
+    url = f"{api_url}/projects/{project_id}/merge_requests/{mr_iid}/discussions"
+    with span("gitlab.discussion_post"):
+        resp = get_http_client().post(
+            url,
+            headers={"PRIVATE-TOKEN": token, "Content-Type": "application/json"},
+            json={"body": body, "position": dict(position)},
+            timeout=30,
+        )
+    if not resp.ok:
+        raise RuntimeError(f"failed to post discussion (status={resp.status_code}): {resp.text}")
+
+
+def _is_excluded_entry(entry: Mapping[str, Any], excludes: Sequence[str]) -> bool:
+    path = str(entry.get("new_path") or entry.get("old_path") or "")
+    return bool(excludes) and is_excluded_path(path, excludes)
+
+
+def _render_diff_entry(entry: Mapping[str, Any]) -> str:
+    old_path = str(entry.get("old_path") or entry.get("new_path") or "")
+    new_path = str(entry.get("new_path") or old_path)
+    lines = [f"diff --git a/{old_path} b/{new_path}"]
+    if entry.get("new_file"):
+        lines.append(f"new file mode {entry.get('b_mode') or '100644'}")
+    elif entry.get("deleted_file"):
+        lines.append(f"deleted file mode {entry.get('a_mode') or '100644'}")
+    if entry.get("renamed_file"):
+        lines.extend([f"rename from {old_path}", f"rename to {new_path}"])
+    body = str(entry.get("diff") or "")
+    if body:
+        lines.append("--- /dev/null" if entry.get("new_file") else f"--- a/{old_path}")
+        lines.append("+++ /dev/null" if entry.get("deleted_file") else f"+++ b/{new_path}")
+    header = "\n".join(lines) + "\n"
+    if body and not body.endswith("\n"):
+        body += "\n"
+    return header + body
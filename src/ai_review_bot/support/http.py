@@ -0,0 +1,147 @@
+"""GitLab/Asana 연동이 함께 쓰는 HTTP 클라이언트(연결 풀, 재시도, 요청 시간 기록)."""
+
+from __future__ import annotations
+
+import os
+import random
+import sys
+import threading
+import time
+from collections.abc import Callable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
+from typing import TYPE_CHECKING, Any, Final, TypeVar
+
+if TYPE_CHECKING:
+    import requests
+
+_RETRY_STATUSES: Final[frozenset[int]] = frozenset({429, 500, 502, 503, 504})
+_IDEMPOTENT_METHODS: Final[frozenset[str]] = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+_DEFAULT_TIMEOUT: Final[float] = 10.0
+_DEFAULT_MAX_RETRIES: Final[int] = 3
+_DEFAULT_MAX_PER_HOST: Final[int] = 8
+_DEFAULT_FETCH_CONCURRENCY: Final[int] = 8
+
+_K = TypeVar("_K")
+_V = TypeVar("_V")
+
+_shared_client: HttpClient | None = None
+_shared_lock = threading.Lock()
+
+
+class HttpClient:
+    """requests.Session 하나를 공유해 호스트별 keep-alive 연결을 재사용한다.
+
+    - 호스트마다 최대 max_per_host개의 연결을 두고, 초과 요청은 빈 연결을 기다린다.
+    - 429/5xx와 연결 오류는 지수 백오프(full jitter)로 재시도하고 `Retry-After`가 있으면 그 값을 따른다.
+    - POST처럼 멱등이 아닌 요청은 서버가 처리하지 않은 것이 확실한 429와 연결 실패만 재시도한다.
+    """
+
+    def __init__(
+        self,
+        *,
+        session: requests.Session | None = None,
+        max_retries: int = _DEFAULT_MAX_RETRIES,
+        max_per_host: int = _DEFAULT_MAX_PER_HOST,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self._session = session or _build_session(max_per_host)
+        self._max_retries = max(max_retries, 0)
+        self._backoff_base = backoff_base
+        self._backoff_max = backoff_max
+        self._sleep = sleep
+
+    def get(self, url: str, **kwargs: Any) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs: Any) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def request(self, method: str, url: str, *, timeout: float = _DEFAULT_TIMEOUT, **kwargs: Any) -> requests.Response:
+        import requests
+
+        method = method.upper()
+        idempotent = method in _IDEMPOTENT_METHODS
+        attempt = 0
+        while True:
+            attempt += 1
+            started = time.perf_counter()
+            try:
+                resp = self._session.request(method, url, timeout=timeout, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as exc:
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                print(f"[llm-code-review] http {method} {url} failed after {elapsed_ms:.0f}ms (attempt {attempt}): {exc.__class__.__name__}", file=sys.stderr)
+                retryable = idempotent or isinstance(exc, requests.ConnectTimeout)
+                if not retryable or attempt > self._max_retries:
+                    raise
+                self._sleep(self._backoff(attempt))
+                continue
+
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            print(f"[llm-code-review] http {method} {url} -> {resp.status_code} in {elapsed_ms:.0f}ms (attempt {attempt})", file=sys.stderr)
+            retryable = resp.status_code == 429 or (idempotent and resp.status_code in _RETRY_STATUSES)
+            if not retryable or attempt > self._max_retries:
+                return resp
+            delay = _retry_after_seconds(resp)
+            self._sleep(min(delay, self._backoff_max) if delay is not None else self._backoff(attempt))
+
+    def _backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self._backoff_max, self._backoff_base * (2 ** (attempt - 1))))
+
+
+def get_http_client() -> HttpClient:
+    """프로세스 전체에서 공유하는 HttpClient를 돌려준다."""
+    global _shared_client
+    if _shared_client is None:
+        with _shared_lock:
+            if _shared_client is None:
+                _shared_client = HttpClient(
+                    max_retries=_env_int("LLM_REVIEW_HTTP_MAX_RETRIES", _DEFAULT_MAX_RETRIES),
+                    max_per_host=_env_int("LLM_REVIEW_HTTP_MAX_PER_HOST", _DEFAULT_MAX_PER_HOST),
+                )
+    return _shared_client
+
+
+def fetch_all(fetch: Callable[[_K], _V], keys: Sequence[_K], *, max_workers: int | None = None) -> list[_V]:
+    """keys 순서를 유지한 채 최대 max_workers개씩 동시에 fetch를 호출한다.
+
+    max_workers를 생략하면 LLM_REVIEW_FETCH_CONCURRENCY(기본 8)를 쓴다.
+    """
+    workers = max_workers or _env_int("LLM_REVIEW_FETCH_CONCURRENCY", _DEFAULT_FETCH_CONCURRENCY)
+    if len(keys) <= 1 or workers <= 1:
+        return [fetch(key) for key in keys]
+    with ThreadPoolExecutor(max_workers=min(workers, len(keys))) as pool:
+        return list(pool.map(fetch, keys))
+
+
+def _build_session(max_per_host: int) -> requests.Session:
+    # requests는 import 비용이 커서 실제로 HTTP 호출을 할 때(첫 HttpClient 생성 시)만 가져온다.
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=16, pool_maxsize=max(max_per_host, 1), pool_block=True, max_retries=0)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def _retry_after_seconds(resp: requests.Response) -> float | None:
+    value = resp.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.getenv(name, "").strip()
+    return int(value) if value.isdigit() else default
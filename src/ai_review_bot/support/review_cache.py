@@ -0,0 +1,132 @@
+"""리뷰 결과를 디스크에 저장해 같은 입력의 LLM 재호출을 건너뛰는 콘텐츠 주소 캐시."""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import json
+import os
+import re
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Final
+
+from ai_review_bot.review import ReviewContext
+
+_DEFAULT_MAX_BYTES: Final[int] = 256 * 1024 * 1024
+_INDEX_LINE = re.compile(r"^index [0-9a-f]+\.\.[0-9a-f]+(?: \d+)?$", re.MULTILINE)
+_SUFFIX: Final[str] = ".json"
+
+
+@dataclass(frozen=True)
+class CachedReview:
+    """캐시에 저장된 리뷰 리포트와 원래 생성에 걸린 시간."""
+
+    report: str
+    latency_seconds: float
+    created_at: float
+
+
+def normalize_diff(diff: str) -> str:
+    """재실행·리베이스로만 달라지는 부분(blob 해시 index 줄, 줄바꿈 형식)을 걷어낸다."""
+    text = diff.replace("\r\n", "\n")
+    return _INDEX_LINE.sub("", text).strip()
+
+
+def build_cache_key(context: ReviewContext, *, system_prompt: str, settings: dict[str, Any]) -> str:
+    """모델 설정·시스템 프롬프트·정규화한 diff와 컨텍스트로 SHA-256 키를 만든다."""
+    payload = {
+        "settings": settings,
+        "system_prompt": system_prompt,
+        "project_name": context.project_name,
+        "project_overview": context.project_overview or "",
+        "ticket_context": context.ticket_context or "",
+        "diff": normalize_diff(context.diff),
+    }
+    if context.omitted_paths:
+        payload["omitted_paths"] = list(context.omitted_paths)
+    encoded = json.dumps(payload, ensure_ascii=False, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+class ReviewCache:
+    """파일 하나에 항목 하나를 두는 크기 제한 LRU 캐시.
+
+    - 쓰기는 임시 파일 작성 후 os.replace로 교체해 동시 작업이 반쯤 쓴 파일을 읽지 않게 한다.
+    - 조회 시 mtime을 갱신하고, 전체 크기가 max_bytes를 넘으면 오래 쓰이지 않은 항목부터 지운다.
+    """
+
+    def __init__(self, directory: str | Path, *, max_bytes: int = _DEFAULT_MAX_BYTES) -> None:
+        self._directory = Path(directory)
+        self._max_bytes = max_bytes
+
+    @classmethod
+    def from_env(cls) -> ReviewCache | None:
+        """LLM_REVIEW_CACHE_DIR이 설정된 경우에만 캐시를 만든다."""
+        directory = os.getenv("LLM_REVIEW_CACHE_DIR", "").strip()
+        if not directory:
+            return None
+        max_bytes = os.getenv("LLM_REVIEW_CACHE_MAX_BYTES", "").strip()
+        return cls(directory, max_bytes=int(max_bytes) if max_bytes.isdigit() else _DEFAULT_MAX_BYTES)
+
+    def get(self, key: str) -> CachedReview | None:
+        path = self._path(key)
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+            if not isinstance(data, dict):
+                return None
+            cached = CachedReview(
+                report=str(data.get("report") or ""),
+                latency_seconds=float(data.get("latency_seconds") or 0.0),
+                created_at=float(data.get("created_at") or 0.0),
+            )
+            os.utime(path)
+        except (OSError, TypeError, ValueError):
+            # 읽을 수 없거나 형식이 다른 항목(다른 버전이 쓴 값 포함)은 미스로 본다.
+            return None
+        return cached
+
+    def put(self, key: str, report: str, *, latency_seconds: float) -> None:
+        entry = {"report": report, "latency_seconds": latency_seconds, "created_at": time.time()}
+        tmp_name: str | None = None
+        try:
+            self._directory.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=self._directory, prefix=".tmp-", suffix=_SUFFIX)
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                json.dump(entry, handle, ensure_ascii=False)
+            os.replace(tmp_name, self._path(key))
+        except OSError as exc:
+            # 캐시 실패는 리뷰를 막지 않는다. _evict는 임시 파일을 세지 않으므로 남은 임시 파일은 여기서 지운다.
+            if tmp_name is not None:
+                with contextlib.suppress(OSError):
+                    os.unlink(tmp_name)
+            print(f"[llm-code-review] WARN: failed to write review cache: {exc}", file=sys.stderr)
+            return
+        self._evict()
+
+    def _path(self, key: str) -> Path:
+        return self._directory / f"{key}{_SUFFIX}"
+
+    def _evict(self) -> None:
+        entries: list[tuple[float, int, Path]] = []
+        for path in self._directory.glob(f"*{_SUFFIX}"):
+            if path.name.startswith(".tmp-"):
+                continue
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries, key=lambda entry: entry[0]):
+            if total <= self._max_bytes:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total -= size
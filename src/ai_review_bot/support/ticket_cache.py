@@ -0,0 +1,164 @@
+"""Asana 태스크·GitLab 이슈 응답을 CI 작업 간에 재사용하는 SQLite 캐시(TTL + ETag 재검증)."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from collections.abc import Callable, Mapping
+from contextlib import closing
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Final
+
+from ai_review_bot.support.http import HttpClient, get_http_client
+
+_DEFAULT_TTL_SECONDS: Final[int] = 3600
+_SCHEMA: Final[str] = "CREATE TABLE IF NOT EXISTS tickets (key TEXT PRIMARY KEY, payload TEXT NOT NULL, etag TEXT, fetched_at REAL NOT NULL)"
+
+_shared_cache: TicketCache | None = None
+_shared_loaded = False
+_shared_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class CachedTicket:
+    """캐시에 저장된 티켓 응답."""
+
+    payload: Mapping[str, Any]
+    etag: str | None
+    fetched_at: float
+
+
+class TicketCache:
+    """키별 JSON 응답과 ETag를 SQLite 파일에 저장한다.
+
+    호출마다 새 연결을 열고 WAL 모드를 써서 스레드·동시 CI 작업이 같은 파일을 안전하게 공유한다.
+    """
+
+    def __init__(self, path: str | Path, *, ttl_seconds: float = _DEFAULT_TTL_SECONDS) -> None:
+        self._path = Path(path)
+        self.ttl_seconds = ttl_seconds
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as conn, conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(_SCHEMA)
+
+    @classmethod
+    def from_env(cls) -> TicketCache | None:
+        """LLM_REVIEW_TICKET_CACHE_PATH가 설정된 경우에만 캐시를 만든다(TTL은 LLM_REVIEW_TICKET_CACHE_TTL초)."""
+        path = os.getenv("LLM_REVIEW_TICKET_CACHE_PATH", "").strip()
+        if not path:
+            return None
+        ttl = os.getenv("LLM_REVIEW_TICKET_CACHE_TTL", "").strip()
+        return cls(path, ttl_seconds=float(ttl) if ttl.isdigit() else _DEFAULT_TTL_SECONDS)
+
+    def get(self, key: str) -> CachedTicket | None:
+        """저장된 항목. 없거나 DB를 읽지 못하면(잠김·손상) 캐시 미스로 본다."""
+        try:
+            with closing(self._connect()) as conn:
+                row = conn.execute("SELECT payload, etag, fetched_at FROM tickets WHERE key = ?", (key,)).fetchone()
+        except sqlite3.Error as exc:
+            print(f"[llm-code-review] WARN: ticket cache read failed: {exc}", file=sys.stderr)
+            return None
+        if row is None:
+            return None
+        try:
+            payload = json.loads(row[0])
+        except ValueError:
+            return None
+        return CachedTicket(payload=payload, etag=row[1], fetched_at=row[2])
+
+    def put(self, key: str, payload: Mapping[str, Any], *, etag: str | None = None) -> None:
+        try:
+            with closing(self._connect()) as conn, conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO tickets (key, payload, etag, fetched_at) VALUES (?, ?, ?, ?)",
+                    (key, json.dumps(payload, ensure_ascii=False), etag, time.time()),
+                )
+        except sqlite3.Error as exc:
+            print(f"[llm-code-review] WARN: ticket cache write failed: {exc}", file=sys.stderr)
+
+    def touch(self, key: str) -> None:
+        """304 Not Modified 응답으로 재검증된 항목의 TTL을 새로 시작한다."""
+        try:
+            with closing(self._connect()) as conn, conn:
+                conn.execute("UPDATE tickets SET fetched_at = ? WHERE key = ?", (time.time(), key))
+        except sqlite3.Error as exc:
+            print(f"[llm-code-review] WARN: ticket cache write failed: {exc}", file=sys.stderr)
+
+    def is_fresh(self, entry: CachedTicket) -> bool:
+        return time.time() - entry.fetched_at < self.ttl_seconds
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self._path, timeout=10)
+
+
+def get_ticket_cache() -> TicketCache | None:
+    """환경 변수로 설정된 프로세스 공유 티켓 캐시(없으면 None)."""
+    global _shared_cache, _shared_loaded
+    if not _shared_loaded:
+        with _shared_lock:
+            if not _shared_loaded:
+                try:
+                    _shared_cache = TicketCache.from_env()
+                except (OSError, sqlite3.Error) as exc:  # pragma: no cover - 캐시 실패는 수집을 막지 않는다
+                    print(f"[llm-code-review] WARN: ticket cache disabled: {exc}", file=sys.stderr)
+                _shared_loaded = True
+    return _shared_cache
+
+
+def scoped_cache_key(key: str, headers: Mapping[str, str]) -> str:
+    """인증 헤더의 해시를 붙인 캐시 키. 다른 토큰으로 가져온 응답을 재사용하지 않게 한다."""
+    credentials = "\n".join(f"{name.lower()}:{value}" for name, value in sorted(headers.items()))
+    return f"{key}|{hashlib.sha256(credentials.encode('utf-8')).hexdigest()[:16]}"
+
+
+def get_json_cached(
+    url: str,
+    *,
+    key: str,
+    headers: Mapping[str, str],
+    extract: Callable[[Any], Mapping[str, Any] | None] = lambda data: data,
+    cache: TicketCache | None = None,
+    client: HttpClient | None = None,
+) -> Mapping[str, Any] | None:
+    """캐시를 거쳐 JSON 응답을 가져온다.
+
+    - 캐시 키에는 인증 헤더(headers)의 해시가 붙어, 같은 URL이라도 토큰이 다르면 따로 저장한다.
+    - TTL 안의 항목은 네트워크 없이 돌려준다.
+    - 만료된 항목은 저장된 ETag로 `If-None-Match` 요청을 보내 304면 그대로 재사용한다.
+    - 연결 실패와 5xx에만 만료된 항목을 돌려준다(stale-if-error). 401/403/404 등은 권한 회수·삭제로 보고 None.
+    """
+    key = scoped_cache_key(key, headers)
+    cached = cache.get(key) if cache else None
+    if cache and cached and cache.is_fresh(cached):
+        return cached.payload
+
+    request_headers = dict(headers)
+    if cached and cached.etag:
+        request_headers["If-None-Match"] = cached.etag
+    try:
+        resp = (client or get_http_client()).get(url, headers=request_headers, timeout=10)
+    except Exception:
+        return cached.payload if cached else None
+
+    if resp.status_code == 304 and cache and cached:
+        cache.touch(key)
+        return cached.payload
+    if resp.status_code >= 500:
+        return cached.payload if cached else None
+    if not resp.ok:
+        return None
+    try:
+        payload = extract(resp.json())
+    except ValueError:
+        return None
+
+    if cache and payload:
+        cache.put(key, payload, etag=resp.headers.get("ETag"))
+    return payload
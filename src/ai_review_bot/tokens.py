@@ -0,0 +1,41 @@
+"""네트워크 없이 쓰는 토큰 수 추정과 모델별 프롬프트 예산."""
+
+from __future__ import annotations
+
+import os
+from typing import Final
+
+# 사용자 프롬프트에 쓸 기본 토큰 예산. 시스템 프롬프트·추론·출력 토큰 몫을 남겨 둔 값이다.
+_MODEL_PROMPT_BUDGETS: Final[dict[str, int]] = {
+    "gpt-5": 200_000,
+    "gpt-4.1": 800_000,
+    "gpt-4o": 100_000,
+}
+_DEFAULT_PROMPT_BUDGET: Final[int] = 100_000
+_ASCII_CHARS_PER_TOKEN: Final[int] = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """BPE 토크나이저 없이 토큰 수를 근사한다.
+
+    ASCII는 약 4자당 1토큰, 한글 등 멀티바이트 문자는 글자당 1토큰으로 센다.
+    UTF-8 길이와 문자 길이의 차이로 멀티바이트 문자 수를 구하므로 큰 diff에서도 빠르다.
+    """
+    if not text:
+        return 0
+    chars = len(text)
+    extra_bytes = len(text.encode("utf-8", errors="surrogatepass")) - chars
+    wide = min(extra_bytes // 2, chars)
+    ascii_chars = chars - wide
+    return wide + (ascii_chars + _ASCII_CHARS_PER_TOKEN - 1) // _ASCII_CHARS_PER_TOKEN
+
+
+def prompt_token_budget(model: str) -> int:
+    """모델별 사용자 프롬프트 토큰 예산. OPENAI_REVIEW_PROMPT_TOKEN_BUDGET으로 재정의할 수 있다."""
+    override = os.getenv("OPENAI_REVIEW_PROMPT_TOKEN_BUDGET", "").strip()
+    if override.isdigit():
+        return int(override)
+    for prefix, budget in _MODEL_PROMPT_BUDGETS.items():
+        if model.startswith(prefix):
+            return budget
+    return _DEFAULT_PROMPT_BUDGET
@@ -0,0 +1,79 @@
+"""배치 리뷰 모드 테스트."""
+
+import json
+
+from ai_review_bot.batch import load_jobs, run_batch
+from ai_review_bot.cli import main
+from ai_review_bot.llm import LLMResult
+from ai_review_bot.review import TokenUsage
+from ai_review_bot.review_service import ReviewService
+
+_DIFF = "diff --git a/app.py b/app.py\n--- a/app.py\n+++ b/app.py\n@@ -1 +1 @@\n-a\n+b\n"
+
+
+class _FakeLLM:
+    is_available = True
+    model = "gpt-5.1"
+    structured_output = False
+    reasoning_effort = "medium"
+    text_verbosity = "medium"
+
+    def complete(self, prompt):
+        if "fail-me" in prompt.user:
+            raise RuntimeError("boom")
+        return LLMResult(text="## 핵심 요약\n- 문제 없음", usage=TokenUsage(input_tokens=100, output_tokens=20, total_tokens=120))
+
+
+def test_load_jobs_should_resolve_diff_file_and_report_bad_lines(tmp_path):
+    """diff_file은 매니페스트 위치 기준으로 읽고, 읽을 수 없는 줄은 오류 작업으로 남긴다."""
+    (tmp_path / "mr1.diff").write_text(_DIFF, encoding="utf-8")
+    lines = [
+        '{"id": "mr-1", "project": "kop-web", "pr_number": 1, "diff_file": "mr1.diff"}',
+        "",
+        "{not json",
+        '{"project": "kop-web", "pr_number": 3, "diff_file": "missing.diff"}',
+    ]
+
+    jobs = list(load_jobs(lines, base_dir=tmp_path))
+
+    assert [job.id for job in jobs] == ["mr-1", "line-3", "line-4"]
+    assert jobs[0].diff == _DIFF and jobs[0].pr_number == "1"
+    assert jobs[1].error and jobs[2].error
+
+
+def test_run_batch_should_isolate_failures_and_keep_order():
+    """실패한 작업은 error 행으로 남고 나머지 작업은 입력 순서대로 결과를 낸다."""
+    lines = [
+        json.dumps({"id": "a", "project": "kop-web", "pr_number": "1", "diff": _DIFF}),
+        json.dumps({"id": "b", "project": "kop-web", "pr_number": "2", "diff": _DIFF + "+fail-me\n"}),
+        json.dumps({"id": "c", "project": "kop-web", "pr_number": "3", "diff": ""}),
+        json.dumps({"id": "d", "project": "kop-api", "pr_number": "4", "diff": _DIFF}),
+    ]
+
+    rows = list(run_batch(ReviewService(_FakeLLM()), load_jobs(lines), concurrency=3))
+
+    assert [row["id"] for row in rows] == ["a", "b", "c", "d"]
+    assert [row["status"] for row in rows] == ["ok", "error", "error", "ok"]
+    assert rows[0]["usage"] == {"input_tokens": 100, "output_tokens": 20, "total_tokens": 120, "cached_tokens": 0, "reasoning_tokens": 0}
+    assert rows[1]["error"] == "boom"
+    assert "핵심 요약" in rows[3]["report"]
+
+
+def test_cli_batch_should_write_jsonl_and_fail_when_any_job_fails(tmp_path, monkeypatch, capsys):
+    """batch 서브커맨드는 결과를 JSONL로 쓰고 실패한 작업이 있으면 1을 반환한다."""
+    manifest = tmp_path / "jobs.jsonl"
+    manifest.write_text(
+        json.dumps({"id": "ok", "project": "kop-web", "pr_number": "1", "diff": _DIFF}) + "\n" + json.dumps({"id": "bad", "project": "", "pr_number": "2", "diff": _DIFF}) + "\n",
+        encoding="utf-8",
+    )
+    output = tmp_path / "results.jsonl"
+    monkeypatch.setattr("ai_review_bot.cli.ReviewService", lambda: ReviewService(_FakeLLM()))
+
+    exit_code = main(["batch", "--manifest", str(manifest), "--output", str(output), "--concurrency", "2"])
+
+    rows = [json.loads(line) for line in output.read_text(encoding="utf-8").splitlines()]
+    assert exit_code == 1
+    assert [(row["id"], row["status"]) for row in rows] == [("ok", "ok"), ("bad", "error")]
+    assert "batch finished: ok=1 error=1 input=100" in capsys.readouterr().err
+    assert rows[0]["model"] == "gpt-5.1"
+    assert rows[0]["cost_usd"] == round((100 * 1.25 + 20 * 10.0) / 1_000_000, 6)
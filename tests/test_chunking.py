@@ -0,0 +1,33 @@
+"""diff 분할 로직 테스트."""
+
+from ai_review_bot.chunking import split_diff
+
+_FILE_A = "diff --git a/a.py b/a.py\n--- a/a.py\n+++ b/a.py\n@@ -1,1 +1,1 @@\n-old\n+new\n"
+_FILE_B = "diff --git a/b.py b/b.py\n--- a/b.py\n+++ b/b.py\n@@ -1,1 +1,1 @@\n-foo\n+bar\n"
+
+
+def test_split_diff_should_return_single_chunk_when_under_budget():
+    """예산 안에 들어오면 원본 그대로 한 묶음이어야 한다."""
+    diff = _FILE_A + _FILE_B
+
+    assert split_diff(diff, 10_000) == [diff]
+
+
+def test_split_diff_should_split_on_file_boundaries():
+    """예산을 넘으면 파일 경계로 나누고 내용은 빠짐없이 유지해야 한다."""
+    diff = _FILE_A + _FILE_B
+
+    chunks = split_diff(diff, len(_FILE_A) + 5)
+
+    assert chunks == [_FILE_A, _FILE_B]
+
+
+def test_split_diff_should_repeat_file_header_when_splitting_hunks():
+    """큰 파일은 헝크 단위로 나누고 각 묶음에 파일 헤더를 반복해야 한다."""
+    header = "diff --git a/big.py b/big.py\n--- a/big.py\n+++ b/big.py\n"
+    hunk_1 = "@@ -1,1 +1,1 @@\n-a\n+b\n"
+    hunk_2 = "@@ -10,1 +10,1 @@\n-c\n+d\n"
+
+    chunks = split_diff(header + hunk_1 + hunk_2, len(header) + len(hunk_2) + 1)
+
+    assert chunks == [header + hunk_1, header + hunk_2]
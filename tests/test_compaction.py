@@ -0,0 +1,95 @@
+"""diff 압축 단계 테스트."""
+
+from ai_review_bot.compaction import compact_diff, compaction_context_from_env
+from ai_review_bot.diff import parse_diff
+
+
+def _context(start: int, stop: int) -> str:
+    return "".join(f" line {number}\n" for number in range(start, stop))
+
+
+def test_compact_diff_should_split_long_context_and_keep_line_numbers():
+    """먼 문맥 줄을 버리고 나눈 헝크의 헤더가 원본 라인 번호를 가리켜야 한다."""
+    diff = (
+        "diff --git a/app.ts b/app.ts\n"
+        "index 1111111..2222222 100644\n"
+        "--- a/app.ts\n"
+        "+++ b/app.ts\n"
+        "@@ -1,20 +1,20 @@ class App {\n" + _context(1, 3) + "-old 3\n+new 3\n" + _context(4, 17) + "-old 17\n+new 17\n" + _context(18, 21)
+    )
+
+    result = compact_diff(diff, context=2)
+
+    assert "index 1111111" not in result.diff
+    assert "@@ -1,5 +1,5 @@ class App {\n line 1\n line 2\n-old 3\n+new 3\n line 4\n line 5\n" in result.diff
+    assert "@@ -15,5 +15,5 @@\n line 15\n line 16\n-old 17\n+new 17\n line 18\n line 19\n" in result.diff
+    assert " line 10\n" not in result.diff
+    hunks = next(parse_diff(result.diff)).hunks
+    assert [(hunk.new_start, hunk.new_count, hunk.added) for hunk in hunks] == [(1, 5, 1), (15, 5, 1)]
+    assert result.context_lines == 10
+    assert result.tokens_after < result.tokens_before
+
+
+def test_compact_diff_should_drop_whitespace_only_hunks_but_keep_python_indentation():
+    """재포맷 헝크는 빼고 안내를 남기되, 들여쓰기가 의미 있는 파일의 들여쓰기 변경은 남겨야 한다."""
+    diff = (
+        "diff --git a/a.ts b/a.ts\n--- a/a.ts\n+++ b/a.ts\n"
+        "@@ -1,2 +1,4 @@\n-call(a, b)\n-next()\n+call(a,\n+    b)\n+\n+next()\n"
+        "@@ -10 +11 @@\n-x = 1\n+x = 2\n"
+        "diff --git a/b.py b/b.py\n--- a/b.py\n+++ b/b.py\n"
+        "@@ -1 +1 @@\n-    return value\n+        return value\n"
+    )
+
+    result = compact_diff(diff)
+
+    assert "call(a," not in result.diff
+    assert "(공백·줄바꿈만 바뀐 헝크 1개 생략)\n" in result.diff
+    assert "+x = 2\n" in result.diff
+    assert "+        return value\n" in result.diff
+    assert result.whitespace_hunks == 1
+
+
+def test_compact_diff_should_keep_hunks_that_remove_a_space_inside_a_string():
+    """문자열 안 공백을 지우거나 토큰을 붙이는 변경은 공백만 바뀐 헝크로 보지 않아야 한다."""
+    diff = (
+        "diff --git a/label.ts b/label.ts\n--- a/label.ts\n+++ b/label.ts\n"
+        '@@ -1 +1 @@\n-const label = "Hello World";\n+const label = "HelloWorld";\n'
+        "@@ -10 +10 @@\n-  return x\n+  returnx\n"
+        "@@ -20 +20 @@\n-y = a - -b\n+y = a --b\n"
+    )
+
+    result = compact_diff(diff)
+
+    assert '+const label = "HelloWorld";\n' in result.diff
+    assert "+  returnx\n" in result.diff
+    assert "+y = a --b\n" in result.diff
+    assert "생략" not in result.diff
+    assert result.whitespace_hunks == 0
+
+
+def test_compact_diff_should_summarize_deleted_files_and_pure_renames():
+    """삭제된 파일은 본문 대신 한 줄 안내를, 내용 변경 없는 이름 변경은 헤더만 남겨야 한다."""
+    diff = (
+        "diff --git a/gone.ts b/gone.ts\ndeleted file mode 100644\nindex 1111111..0000000\n--- a/gone.ts\n+++ /dev/null\n"
+        "@@ -1,3 +0,0 @@\n-a\n-b\n-c\n"
+        "diff --git a/old.ts b/new.ts\nsimilarity index 100%\nrename from old.ts\nrename to new.ts\n"
+    )
+
+    result = compact_diff(diff)
+
+    assert result.diff == (
+        "diff --git a/gone.ts b/gone.ts\ndeleted file mode 100644\n--- a/gone.ts\n+++ /dev/null\n(삭제된 파일: 본문 3줄 생략)\n"
+        "diff --git a/old.ts b/new.ts\nrename from old.ts\nrename to new.ts\n"
+    )
+    files = list(parse_diff(result.diff))
+    assert [(file.path, file.is_deleted, file.is_rename) for file in files] == [("gone.ts", True, False), ("new.ts", False, True)]
+    assert (result.deleted_files, result.renames) == (1, 1)
+
+
+def test_compaction_context_from_env_should_allow_disabling(monkeypatch):
+    """LLM_REVIEW_DIFF_CONTEXT로 문맥 줄 수를 바꾸고 off로 압축을 끌 수 있어야 한다."""
+    monkeypatch.setenv("LLM_REVIEW_DIFF_CONTEXT", "1")
+    assert compaction_context_from_env() == 1
+
+    monkeypatch.setenv("LLM_REVIEW_DIFF_CONTEXT", "off")
+    assert compaction_context_from_env() is None
@@ -0,0 +1,108 @@
+"""Unified diff 스트리밍 파서 테스트."""
+
+import io
+
+from ai_review_bot.diff import iter_diff_files, parse_diff
+
+_DIFF = """diff --git a/src/app.py b/src/app.py
+index 1111111..2222222 100644
+--- a/src/app.py
++++ b/src/app.py
+@@ -1,3 +1,4 @@
+ import os
+-import sys
++import json
++import logging
+ 
+@@ -20,2 +21,2 @@ def main():
+--- removed line that looks like a header
++++ added line that looks like a header
+diff --git a/old_name.py b/new_name.py
+similarity index 100%
+rename from old_name.py
+rename to new_name.py
+diff --git a/logo.png b/logo.png
+new file mode 100644
+index 0000000..3333333
+Binary files /dev/null and b/logo.png differ
+diff --git a/gone.txt b/gone.txt
+deleted file mode 100644
+--- a/gone.txt
++++ /dev/null
+@@ -1 +0,0 @@
+-bye
+\\ No newline at end of file
+"""
+
+
+def test_parse_diff_should_yield_file_records_with_flags():
+    """파일별 경로와 rename/binary/new/deleted 플래그를 채워야 한다."""
+    files = list(parse_diff(_DIFF))
+
+    assert [f.path for f in files] == ["src/app.py", "new_name.py", "logo.png", "gone.txt"]
+    assert files[1].is_rename and files[1].old_path == "old_name.py"
+    assert files[2].is_binary and files[2].is_new
+    assert files[3].is_deleted and files[3].new_path is None
+
+
+def test_parse_diff_should_track_hunk_ranges_and_counts():
+    """헝크 라인 범위와 추가/삭제 수를 계산하고 헤더처럼 보이는 본문 줄을 오인하지 않아야 한다."""
+    app = next(parse_diff(_DIFF))
+
+    assert [(h.old_start, h.old_count, h.new_start, h.new_count) for h in app.hunks] == [(1, 3, 1, 4), (20, 2, 21, 2)]
+    assert (app.added, app.removed) == (3, 2)
+    assert app.old_path == "src/app.py"
+
+
+def test_parse_diff_offsets_should_slice_original_text():
+    """파일/헝크 오프셋으로 원본을 자르면 해당 구간이 그대로 나와야 한다."""
+    files = list(parse_diff(_DIFF))
+
+    assert "".join(_DIFF[f.start : f.end] for f in files) == _DIFF
+    deleted = files[3]
+    assert _DIFF[deleted.hunks[0].start : deleted.hunks[0].end] == "@@ -1 +0,0 @@\n-bye\n\\ No newline at end of file\n"
+
+
+def test_iter_diff_files_should_report_byte_offsets_for_streams():
+    """바이너리 스트림은 바이트 오프셋 기준으로 같은 구조를 돌려줘야 한다."""
+    raw = ("diff --git a/한글.py b/한글.py\n--- a/한글.py\n+++ b/한글.py\n@@ -1 +1 @@\n-가\n+나\n" + _DIFF).encode("utf-8")
+
+    files = list(iter_diff_files(io.BytesIO(raw)))
+
+    assert files[0].path == "한글.py"
+    assert raw[files[1].start : files[1].end].startswith(b"diff --git a/src/app.py")
+    assert files[-1].end == len(raw)
+
+
+def test_parse_diff_should_support_plain_unified_diff():
+    """diff --git 헤더 없는 `diff -u` 출력도 파일 단위로 나눠야 한다."""
+    text = "--- a.txt\n+++ a.txt\n@@ -1 +1 @@\n-a\n+b\n--- b.txt\n+++ b.txt\n@@ -1 +1 @@\n-c\n+d\n"
+
+    files = list(parse_diff(text))
+
+    assert [f.path for f in files] == ["a.txt", "b.txt"]
+
+
+def test_parse_diff_should_split_header_paths_containing_spaces():
+    """---/+++ 줄이 없는 헤더도 `a/docs b/x.md` 같은 공백 경로를 올바르게 나눠야 한다."""
+    text = (
+        "diff --git a/docs b/x.md b/docs b/x.md\n"
+        "old mode 100644\n"
+        "new mode 100755\n"
+        "diff --git a/my docs/a b/c.png b/my docs/a b/c.png\n"
+        "index 1111111..2222222 100644\n"
+        "Binary files a/my docs/a b/c.png and b/my docs/a b/c.png differ\n"
+        "diff --git a/old b/name.md b/new b/name.md\n"
+        "similarity index 100%\n"
+        "rename from old b/name.md\n"
+        "rename to new b/name.md\n"
+    )
+
+    files = list(parse_diff(text))
+
+    assert [(f.old_path, f.new_path) for f in files] == [
+        ("docs b/x.md", "docs b/x.md"),
+        ("my docs/a b/c.png", "my docs/a b/c.png"),
+        ("old b/name.md", "new b/name.md"),
+    ]
+    assert files[1].is_binary and files[2].is_rename
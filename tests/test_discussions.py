@@ -0,0 +1,115 @@
+"""인라인 토론 위치 인덱스와 동시 등록 테스트."""
+
+import threading
+import time
+
+from ai_review_bot.discussions import DiffPositionIndex, build_inline_note, post_inline_discussions
+from ai_review_bot.report import ReviewIssue, ReviewReport
+
+_REFS = {"base_sha": "b" * 40, "start_sha": "s" * 40, "head_sha": "h" * 40}
+_DIFF = """diff --git a/src/order/OrderService.ts b/src/order/OrderService.ts
+--- a/src/order/OrderService.ts
++++ b/src/order/OrderService.ts
+@@ -10,4 +10,5 @@ class OrderService {
+ context10
+-removed11
++added11
++added12
+ context12
+ context13
+diff --git a/old.py b/old.py
+deleted file mode 100644
+--- a/old.py
++++ /dev/null
+@@ -1 +0,0 @@
+-gone
+"""
+
+
+def _issue(path: str | None, start: int | None, end: int | None = None, section: str = "안정성을 위해 먼저 살펴보면 좋은 부분") -> ReviewIssue:
+    return ReviewIssue(section=section, domain="보안", text=f"- `({path}:{start})`\n  - 문제: 문제", path=path, line_start=start, line_end=end)
+
+
+def test_position_should_map_added_and_context_lines():
+    """추가된 줄은 new_line만, 문맥 줄은 old_line/new_line을 함께 담아야 한다."""
+    index = DiffPositionIndex.from_diff(_DIFF, _REFS)
+
+    added = index.position("src/order/OrderService.ts", 11)
+    context = index.position("src/order/OrderService.ts", 13)
+
+    assert added == {
+        "position_type": "text",
+        "base_sha": "b" * 40,
+        "start_sha": "s" * 40,
+        "head_sha": "h" * 40,
+        "old_path": "src/order/OrderService.ts",
+        "new_path": "src/order/OrderService.ts",
+        "new_line": 11,
+    }
+    assert (context["old_line"], context["new_line"]) == (12, 13)
+
+
+def test_position_should_prefer_added_line_in_range_and_match_file_name_suffix():
+    """범위 안에서는 추가된 줄을 고르고, 파일명만 적힌 지적도 경로 끝으로 찾아야 한다."""
+    index = DiffPositionIndex.from_diff(_DIFF, _REFS)
+
+    position = index.position("OrderService.ts", 10, 14)
+
+    assert position["new_line"] == 11
+    assert position["new_path"] == "src/order/OrderService.ts"
+
+
+def test_position_should_return_none_outside_diff():
+    """diff에 없는 라인·삭제된 파일·라인 없는 지적은 위치를 찾지 못해야 한다."""
+    index = DiffPositionIndex.from_diff(_DIFF, _REFS)
+
+    assert index.position("src/order/OrderService.ts", 40) is None
+    assert index.position("old.py", 1) is None
+    assert index.position("src/order/OrderService.ts", None) is None
+
+
+def test_post_inline_discussions_should_leave_unmapped_and_failed_findings_in_summary():
+    """diff 밖이거나 등록에 실패한 지적은 남은 리포트에 있어야 한다."""
+    issues = (
+        _issue("OrderService.ts", 11),
+        _issue("OrderService.ts", 99),
+        _issue("OrderService.ts", 13, section="추가 개선 아이디어"),
+    )
+    report = ReviewReport(issues=issues, risks=("권한 검증 누락",), structured=True)
+    posted_lines: list[int] = []
+
+    def _post(body, position):
+        if position["new_line"] == 13:
+            raise RuntimeError("400 line_code invalid")
+        assert body.startswith("**안정성을 위해 먼저 살펴보면 좋은 부분** · 보안")
+        posted_lines.append(position["new_line"])
+
+    remaining, posted = post_inline_discussions(report, DiffPositionIndex.from_diff(_DIFF, _REFS), _post, max_workers=2)
+
+    assert posted == 1
+    assert posted_lines == [11]
+    assert remaining.issues == issues[1:]
+    assert remaining.risks == ("권한 검증 누락",)
+    assert "1건(안정성을 위해 먼저 살펴보면 좋은 부분 1건, 추가 개선 아이디어 0건)" in build_inline_note(report, remaining)
+
+
+def test_post_inline_discussions_should_bound_concurrency():
+    """동시에 등록하는 토론 수는 max_workers를 넘지 않아야 한다."""
+    report = ReviewReport(issues=tuple(_issue("OrderService.ts", line) for line in (10, 11, 12, 13, 14)), structured=True)
+    lock = threading.Lock()
+    active = peak = 0
+
+    def _post(body, position):
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.02)
+        with lock:
+            active -= 1
+
+    remaining, posted = post_inline_discussions(report, DiffPositionIndex.from_diff(_DIFF, _REFS), _post, max_workers=2)
+
+    assert posted == 5
+    assert not remaining.issues
+    assert peak == 2
@@ -0,0 +1,243 @@
+"""CI 엔트리포인트의 단계 조합 테스트."""
+
+import threading
+import time
+
+import pytest
+
+import entrypoint
+from ai_review_bot import review_service
+from ai_review_bot.incremental import PreviousReview
+from ai_review_bot.support import gitlab
+from ai_review_bot.support.git import DiffOutput
+
+_REFS = {"base_sha": "b" * 40, "start_sha": "s" * 40, "head_sha": "h" * 40}
+_ORDER_DIFF = (
+    "diff --git a/src/order/OrderService.ts b/src/order/OrderService.ts\n--- a/src/order/OrderService.ts\n+++ b/src/order/OrderService.ts\n@@ -1,2 +1,2 @@\n line1\n-old2\n+new2\n"
+)
+_INTERDIFF = _ORDER_DIFF
+_FULL_DIFF = (
+    _ORDER_DIFF + "diff --git a/src/user/UserRepo.ts b/src/user/UserRepo.ts\n--- a/src/user/UserRepo.ts\n+++ b/src/user/UserRepo.ts\n@@ -40 +40,3 @@\n line40\n+added41\n+added42\n"
+)
+_REPORT = """## 핵심 요약
+- 안정성을 위해 먼저 살펴보면 좋은 부분: {+ 2건 +}
+- 추가 개선 아이디어: 0건
+- 핵심 위험 요약: 없음
+
+<details>
+
+<summary>
+안정성을 위해 먼저 살펴보면 좋은 부분
+</summary>
+
+### 보안
+- `(OrderService.ts:2)`
+  - 문제: 권한 검증 누락
+
+### 성능/리소스
+- `(UserRepo.ts:42)`
+  - 문제: N+1 쿼리
+
+</details>"""
+
+
+def test_inline_mode_should_map_carried_findings_against_full_mr_diff(monkeypatch):
+    """증분 모드에서도 인라인 위치는 interdiff가 아닌 전체 MR diff에서 찾아, 이어받은 지적까지 토론으로 남겨야 한다."""
+    monkeypatch.setattr(entrypoint, "generate_diff", lambda target, sha: DiffOutput(text=_FULL_DIFF if (target, sha) == ("main", "h" * 40) else "", files=2))
+    monkeypatch.setattr(gitlab, "fetch_merge_request_diff_refs", lambda **_: _REFS)
+    posted: list[tuple[str, int]] = []
+    monkeypatch.setattr(gitlab, "post_merge_request_discussion", lambda *, position, **_: posted.append((position["new_path"], position["new_line"])))
+
+    mr_diff = entrypoint.merge_request_diff(_INTERDIFF, PreviousReview(sha="a" * 40, report=""), "main", "h" * 40)
+    summary = entrypoint.post_inline_findings(_REPORT, mr_diff, api_url="https://gitlab.example.com/api/v4", project_id="1", mr_iid="7", token="t")
+
+    assert sorted(posted) == [("src/order/OrderService.ts", 2), ("src/user/UserRepo.ts", 42)]
+    assert "UserRepo.ts:42" not in summary
+    assert entrypoint.merge_request_diff(_INTERDIFF, None, "main", "h" * 40) == _INTERDIFF
+
+
+def test_build_skipped_note_should_list_paths_and_count_the_rest():
+    """크기 상한으로 건너뛴 파일은 앞의 20개만 나열하고 나머지는 개수로 알려야 한다."""
+    paths = tuple(f"src/file{index}.py" for index in range(22))
+
+    note = entrypoint.build_skipped_note(paths)
+
+    assert note.startswith("> ⚠️ diff가 크기 상한을 넘어 다음 파일 22개는 리뷰하지 못했습니다: `src/file0.py`, ")
+    assert "`src/file19.py` 외 2개" in note
+    assert "src/file20.py" not in note
+
+
+_REAL_CLAIM_REVIEW_LEASE = entrypoint.claim_review_lease
+
+
+class _NoSupersede:
+    def wait_debounce(self) -> bool:
+        return False
+
+    def superseded(self, stage: str) -> bool:
+        return False
+
+
+class _CapturingService:
+    contexts: list = []
+
+    def __init__(self, **_):
+        pass
+
+    def create_review(self, context):
+        self.contexts.append(context)
+        return "## 핵심 요약\n- 없음\n"
+
+
+def _stub_run(monkeypatch, tmp_path, *, prepare_diff, load_project_overview, collect_ticket_context) -> list[str]:
+    env = {
+        "CI_MERGE_REQUEST_TARGET_BRANCH_NAME": "main",
+        "CI_COMMIT_SHA": "h" * 40,
+        "CI_PROJECT_ID": "1",
+        "CI_MERGE_REQUEST_IID": "7",
+        "CI_API_V4_URL": "https://gitlab.example.com/api/v4",
+        "GITLAB_TOKEN": "t",
+    }
+    for name, value in env.items():
+        monkeypatch.setenv(name, value)
+    for name in (
+        "LLM_REVIEW_CACHE_DIR",
+        "LLM_REVIEW_INLINE_COMMENTS",
+        "LLM_REVIEW_INCREMENTAL",
+        "LLM_REVIEW_LEASE_PATH",
+        "LLM_REVIEW_DEBOUNCE_SECONDS",
+        "CI_MERGE_REQUEST_SOURCE_BRANCH_SHA",
+    ):
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setattr(entrypoint, "_REVIEW_PATH", str(tmp_path / "llm_review.txt"))
+    monkeypatch.setattr(entrypoint, "claim_review_lease", lambda *_, **__: _NoSupersede())
+    monkeypatch.setattr(entrypoint, "prepare_diff", prepare_diff)
+    monkeypatch.setattr(entrypoint, "load_project_overview", load_project_overview)
+    monkeypatch.setattr(entrypoint, "collect_ticket_context", collect_ticket_context)
+    monkeypatch.setattr(review_service, "ReviewService", _CapturingService)
+    _CapturingService.contexts = []
+    posted: list[str] = []
+    monkeypatch.setattr(entrypoint, "post_comment_to_gitlab", posted.append)
+    return posted
+
+
+def test_run_should_gather_diff_overview_and_tickets_concurrently(monkeypatch, tmp_path):
+    """diff·AGENTS.md·티켓 수집은 동시에 실행되고, 결과가 ReviewContext의 제자리에 들어가야 한다."""
+    # 세 작업이 모두 동시에 barrier에 도착해야 풀리므로, 순차 실행이면 BrokenBarrierError로 실패한다.
+    barrier = threading.Barrier(3, timeout=2)
+
+    def slow(value):
+        def task(*_, **__):
+            barrier.wait()
+            time.sleep(0.05)
+            return value
+
+        return task
+
+    diff_output = DiffOutput(text=_ORDER_DIFF, files=1, skipped_paths=("big.lock",))
+    posted = _stub_run(
+        monkeypatch,
+        tmp_path,
+        prepare_diff=slow((diff_output, None)),
+        load_project_overview=slow("# 개요"),
+        collect_ticket_context=slow("ASANA-1 결제 개선"),
+    )
+
+    started = time.perf_counter()
+    entrypoint._run()
+
+    assert time.perf_counter() - started < 0.5
+    [context] = _CapturingService.contexts
+    assert (context.pr_number, context.diff) == ("7", _ORDER_DIFF)
+    assert context.project_overview == "# 개요"
+    assert context.ticket_context == "ASANA-1 결제 개선"
+    assert context.omitted_paths == ("big.lock",)
+    assert len(posted) == 1 and "`big.lock`" in posted[0]
+
+
+def test_run_should_continue_without_context_when_a_side_task_fails(monkeypatch, tmp_path, capsys):
+    """AGENTS.md나 티켓 수집이 예외를 던져도 리뷰는 그 컨텍스트 없이 진행하고 원인을 WARN으로 남겨야 한다."""
+
+    def broken(*_, **__):
+        raise RuntimeError("asana down")
+
+    posted = _stub_run(
+        monkeypatch,
+        tmp_path,
+        prepare_diff=lambda *_, **__: (DiffOutput(text=_ORDER_DIFF, files=1), None),
+        load_project_overview=lambda: "# 개요",
+        collect_ticket_context=broken,
+    )
+
+    entrypoint._run()
+
+    [context] = _CapturingService.contexts
+    assert context.project_overview == "# 개요"
+    assert context.ticket_context is None
+    assert len(posted) == 1
+    assert "WARN: failed to load ticket context: asana down" in capsys.readouterr().err
+
+
+def test_run_should_propagate_diff_failures(monkeypatch, tmp_path):
+    """diff 준비가 실패하면 다른 작업이 끝난 뒤에도 예외가 그대로 올라와야 한다."""
+
+    def broken(*_, **__):
+        raise RuntimeError("git failed")
+
+    posted = _stub_run(monkeypatch, tmp_path, prepare_diff=broken, load_project_overview=lambda: None, collect_ticket_context=lambda **_: None)
+
+    with pytest.raises(RuntimeError, match="git failed"):
+        entrypoint._run()
+    assert not posted and not _CapturingService.contexts
+
+
+def test_run_should_compare_mr_head_with_source_branch_sha_in_merged_results_pipelines(monkeypatch, tmp_path, capsys):
+    """merged results 파이프라인에서는 CI_COMMIT_SHA(임시 머지 커밋)가 아닌 소스 브랜치 SHA로 대체 여부를 판단해야 한다."""
+    posted = _stub_run(
+        monkeypatch,
+        tmp_path,
+        prepare_diff=lambda *_, **__: (DiffOutput(text=_ORDER_DIFF, files=1), None),
+        load_project_overview=lambda: None,
+        collect_ticket_context=lambda **_: None,
+    )
+    monkeypatch.setattr(entrypoint, "claim_review_lease", _REAL_CLAIM_REVIEW_LEASE)
+    monkeypatch.setattr(gitlab, "fetch_merge_request_head_sha", lambda **_: "s" * 40)
+    monkeypatch.setenv("CI_COMMIT_SHA", "m" * 40)
+    monkeypatch.setenv("CI_MERGE_REQUEST_SOURCE_BRANCH_SHA", "s" * 40)
+
+    entrypoint._run()
+
+    assert len(_CapturingService.contexts) == 1 and len(posted) == 1
+    assert "superseded" not in capsys.readouterr().err
+
+
+def test_run_should_review_and_mark_the_source_branch_sha_in_merged_results_pipelines(monkeypatch, tmp_path):
+    """merged results 파이프라인에서는 diff 기준과 리뷰 마커에 임시 머지 커밋 대신 소스 브랜치 SHA를 써야 한다."""
+    prepared: list[str] = []
+
+    def prepare_diff(target_branch, commit_sha, **_):
+        prepared.append(commit_sha)
+        return DiffOutput(text=_ORDER_DIFF, files=1), None
+
+    posted = _stub_run(monkeypatch, tmp_path, prepare_diff=prepare_diff, load_project_overview=lambda: None, collect_ticket_context=lambda **_: None)
+    monkeypatch.setenv("CI_COMMIT_SHA", "m" * 40)
+    monkeypatch.setenv("CI_MERGE_REQUEST_SOURCE_BRANCH_SHA", "s" * 40)
+
+    entrypoint._run()
+
+    assert prepared == ["s" * 40]
+    assert posted[0].rstrip().endswith(f"<!-- ai-review-bot:reviewed-sha={'s' * 40} -->")
+
+
+def test_claim_review_lease_should_not_take_over_from_newer_head(monkeypatch, tmp_path):
+    """재시도된 이전 파이프라인(MR의 현재 head가 아닌 SHA)은 더 새 head의 리스를 넘겨받지 않고 스스로 건너뛰어야 한다."""
+    monkeypatch.setenv("LLM_REVIEW_LEASE_PATH", str(tmp_path / "leases.sqlite3"))
+    monkeypatch.delenv("LLM_REVIEW_DEBOUNCE_SECONDS", raising=False)
+    monkeypatch.setattr(gitlab, "fetch_merge_request_head_sha", lambda **_: "n" * 40)
+    gitlab_args = {"api_url": "https://gitlab.example.com/api/v4", "project_id": "1", "mr_iid": "7", "token": "t"}
+
+    newer = _REAL_CLAIM_REVIEW_LEASE("n" * 40, **gitlab_args)
+    stale = _REAL_CLAIM_REVIEW_LEASE("o" * 40, **gitlab_args)
+
+    assert stale.wait_debounce() is True
+    assert newer.superseded("the LLM call") is False
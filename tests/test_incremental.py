@@ -0,0 +1,93 @@
+"""증분 리뷰 로직 테스트."""
+
+from ai_review_bot.incremental import (
+    PreviousReview,
+    build_incremental_note,
+    build_review_marker,
+    carry_forward_findings,
+    changed_paths,
+    find_previous_review,
+)
+
+_PREVIOUS = """## 핵심 요약
+- 안정성을 위해 먼저 살펴보면 좋은 부분: {+ 2건 +}
+- 추가 개선 아이디어: 0건
+- 핵심 위험 요약: {+ 권한 검증 누락 +}
+
+<details>
+
+<summary>
+안정성을 위해 먼저 살펴보면 좋은 부분
+</summary>
+
+### 보안
+- `(OrderService.ts:88-107)`
+  - 문제: 권한 검증 누락
+  - 영향: 타인 주문 조회
+  - 조치: 소유자 검증 추가
+
+### 성능/리소스
+- `(UserRepo.ts:42-55)`
+  - 문제: N+1 쿼리
+  - 영향: 응답 지연
+  - 조치: 배치 조회
+
+</details>"""
+
+_BOT = {"id": 7, "username": "review-bot"}
+_HUMAN = {"id": 8, "username": "alice"}
+
+_NEW = """## 핵심 요약
+- 안정성을 위해 먼저 살펴보면 좋은 부분: 0건
+- 추가 개선 아이디어: 0건
+- 핵심 위험 요약: 없음"""
+
+
+def test_find_previous_review_should_pick_latest_marked_note():
+    """마커가 있는 노트 중 가장 최근 것을 고르고 마커·꼬리말은 본문에서 제거해야 한다."""
+    notes = [
+        {"body": "사람이 남긴 코멘트", "created_at": "2024-05-03T00:00:00Z", "author": _HUMAN},
+        {"body": f"old\n\n{build_review_marker('aaaaaaa1')}", "created_at": "2024-05-01T00:00:00Z", "author": _BOT},
+        {
+            "body": f"{_PREVIOUS}\n\n{build_incremental_note('aaaaaaa1', 'bbbbbbb2', 0)}\n\n{build_review_marker('bbbbbbb2')}",
+            "created_at": "2024-05-02T00:00:00Z",
+            "author": _BOT,
+        },
+    ]
+
+    previous = find_previous_review(notes, author=_BOT)
+
+    assert previous is not None
+    assert previous.sha == "bbbbbbb2"
+    assert previous.report == _PREVIOUS
+
+
+def test_find_previous_review_should_ignore_markers_from_other_authors():
+    """다른 사용자가 마커를 복사해 남긴 노트는 더 최근이어도 이전 리뷰로 쓰지 않아야 한다."""
+    notes = [
+        {"body": f"봇 리뷰\n\n{build_review_marker('aaaaaaa1')}", "created_at": "2024-05-01T00:00:00Z", "author": _BOT},
+        {"body": f"가짜 리뷰\n\n{build_review_marker('ccccccc3')}", "created_at": "2024-05-02T00:00:00Z", "author": _HUMAN},
+        {"body": f"이름만 같은 계정\n\n{build_review_marker('ddddddd4')}", "created_at": "2024-05-03T00:00:00Z", "author": {"id": 99, "username": "review-bot"}},
+    ]
+
+    assert find_previous_review(notes, author=_BOT) == PreviousReview(sha="aaaaaaa1", report="봇 리뷰")
+    assert find_previous_review(notes[1:2], author={"username": "review-bot"}) is None
+
+
+def test_carry_forward_findings_should_keep_issues_for_unchanged_files():
+    """이번 변경분에 없는 파일의 지적만 새 리포트로 이어받아야 한다."""
+    interdiff = "diff --git a/src/order/OrderService.ts b/src/order/OrderService.ts\n@@ -1 +1 @@\n-a\n+b\n"
+
+    merged, carried = carry_forward_findings(_PREVIOUS, _NEW, changed_paths(interdiff))
+
+    assert carried == 1
+    assert "UserRepo.ts:42-55" in merged
+    assert "OrderService.ts" not in merged
+    assert "- 안정성을 위해 먼저 살펴보면 좋은 부분: {+ 1건 +}" in merged
+
+
+def test_carry_forward_findings_should_return_new_report_when_nothing_carried():
+    """모든 지적 파일이 다시 바뀌었으면 새 리포트를 그대로 돌려줘야 한다."""
+    changed = {"OrderService.ts", "UserRepo.ts"}
+
+    assert carry_forward_findings(_PREVIOUS, _NEW, changed) == (_NEW, 0)
@@ -0,0 +1,72 @@
+"""단계별 계측(span)과 메트릭 파일 출력 테스트."""
+
+import json
+
+import pytest
+
+from ai_review_bot import metrics
+from ai_review_bot.llm import LLMResult
+from ai_review_bot.metrics import MetricsRecorder, configure_from_env, incr, set_recorder, span, write_metrics
+from ai_review_bot.review import ReviewContext, TokenUsage
+from ai_review_bot.review_service import ReviewService
+
+
+class _LLM:
+    is_available = True
+    model = "gpt-5.1"
+    structured_output = False
+
+    def complete(self, prompt):
+        return LLMResult(text="## 핵심 요약\n- 없음", usage=TokenUsage())
+
+
+@pytest.fixture(autouse=True)
+def _reset_recorder():
+    yield
+    set_recorder(None)
+
+
+def test_span_should_be_noop_when_metrics_are_disabled(monkeypatch):
+    """출력 경로가 없으면 기록기를 만들지 않고 span은 공유 nullcontext를 돌려줘야 한다."""
+    monkeypatch.delenv("LLM_REVIEW_METRICS_FILE", raising=False)
+    monkeypatch.delenv("LLM_REVIEW_METRICS_PROM_FILE", raising=False)
+
+    assert configure_from_env() is None
+    assert span("stage.review") is span("stage.diff")
+    incr("review_cache_hits")
+    write_metrics()
+
+
+def test_metrics_should_write_json_and_prometheus_files(tmp_path, monkeypatch):
+    """단계별 span·카운터를 JSON과 Prometheus textfile로 남겨야 한다."""
+    monkeypatch.setenv("LLM_REVIEW_METRICS_FILE", str(tmp_path / "metrics.json"))
+    monkeypatch.setenv("LLM_REVIEW_METRICS_PROM_FILE", str(tmp_path / "textfile" / "review.prom"))
+    configure_from_env()
+
+    with span("stage.review", project="kop-web"):
+        with span("review.llm_call"):
+            pass
+    with pytest.raises(RuntimeError), span("stage.post_comment"):
+        raise RuntimeError("boom")
+    incr("llm_attempts", 2)
+    write_metrics()
+
+    data = json.loads((tmp_path / "metrics.json").read_text(encoding="utf-8"))
+    assert set(data["stages"]) == {"stage.review", "review.llm_call", "stage.post_comment"}
+    assert data["stages"]["stage.post_comment"]["errors"] == 1
+    assert data["counters"] == {"llm_attempts": 2}
+    assert [record["name"] for record in data["spans"]][0] == "stage.review"
+    assert data["spans"][0]["attrs"] == {"project": "kop-web"}
+
+    prom = (tmp_path / "textfile" / "review.prom").read_text(encoding="utf-8")
+    assert 'ai_review_bot_stage_seconds_count{stage="stage.review"} 1' in prom
+    assert "ai_review_bot_llm_attempts_total 2" in prom
+
+
+def test_review_service_should_record_stage_spans():
+    """ReviewService는 프롬프트 생성·LLM 호출·정규화 단계를 span으로 남겨야 한다."""
+    recorder = set_recorder(MetricsRecorder())
+    ReviewService(_LLM()).create_review(ReviewContext(project_name="kop-web", pr_number="1", diff="diff --git a/a b/a\n"))  # type: ignore[arg-type]
+
+    assert recorder is metrics._recorder
+    assert {"review.prompt_build", "review.llm_call", "review.normalize"} <= set(recorder.snapshot()["stages"])
@@ -0,0 +1,120 @@
+"""토큰 예산 기반 프롬프트 패킹 테스트."""
+
+from ai_review_bot.packing import classify_path, pack_review_inputs
+from ai_review_bot.prompt import build_review_prompt
+from ai_review_bot.review import ReviewContext
+from ai_review_bot.tokens import estimate_tokens, prompt_token_budget
+
+
+def _file_diff(path: str, lines: int) -> str:
+    body = "".join(f"+line {i} of {path}\n" for i in range(lines))
+    return f"diff --git a/{path} b/{path}\n--- a/{path}\n+++ b/{path}\n@@ -0,0 +1,{lines} @@\n{body}"
+
+
+def test_estimate_tokens_should_count_hangul_per_character():
+    """ASCII는 4자당 1토큰, 한글은 글자당 1토큰으로 근사해야 한다."""
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("abcdefgh") == 2
+    assert estimate_tokens("가나다") == 3
+
+
+def test_prompt_token_budget_should_follow_model_and_env(monkeypatch):
+    """모델 접두사별 기본 예산을 쓰고 환경 변수로 재정의할 수 있어야 한다."""
+    monkeypatch.delenv("OPENAI_REVIEW_PROMPT_TOKEN_BUDGET", raising=False)
+    assert prompt_token_budget("gpt-5.1") == 200_000
+
+    monkeypatch.setenv("OPENAI_REVIEW_PROMPT_TOKEN_BUDGET", "1234")
+    assert prompt_token_budget("gpt-5.1") == 1234
+
+
+def test_classify_path_should_rank_source_test_generated():
+    """소스 → 테스트 → 생성 파일 순으로 우선순위를 매겨야 한다."""
+    assert classify_path("src/app/service.py") == 0
+    assert classify_path("tests/test_service.py") == 1
+    assert classify_path("web/src/App.spec.ts") == 1
+    assert classify_path("package-lock.json") == 2
+    assert classify_path("static/app.min.js") == 2
+
+
+def test_pack_review_inputs_should_keep_input_when_within_budget():
+    """예산 안이면 입력을 손대지 않고 생략 안내도 없어야 한다."""
+    diff = _file_diff("src/a.py", 3)
+
+    packed = pack_review_inputs(diff, project_overview="개요", ticket_context=None, budget=10_000)
+
+    assert packed.diff == diff
+    assert packed.omission_note is None
+
+
+def test_pack_review_inputs_should_keep_full_overview_when_prompt_fits():
+    """전체가 예산 안이면 예산의 1/4을 넘는 개요도 자르지 않아야 한다."""
+    overview = "프로젝트 규칙\n" * 300
+    diff = _file_diff("src/a.py", 3)
+
+    packed = pack_review_inputs(diff, project_overview=overview, ticket_context=None, budget=estimate_tokens(overview) * 2)
+
+    assert packed.project_overview == overview
+    assert packed.omission_note is None
+
+
+def test_pack_review_inputs_should_drop_generated_and_tests_before_source():
+    """예산을 넘으면 생성 파일·테스트를 먼저 빼고 생략 내역을 안내해야 한다."""
+    source = _file_diff("src/service.py", 40)
+    diff = _file_diff("package-lock.json", 200) + _file_diff("tests/test_service.py", 40) + source
+
+    packed = pack_review_inputs(diff, project_overview=None, ticket_context=None, budget=estimate_tokens(source) + 400)
+
+    assert packed.diff == source
+    assert packed.omission_note is not None
+    assert "package-lock.json" in packed.omission_note
+    assert "tests/test_service.py" in packed.omission_note
+
+
+def test_pack_review_inputs_should_drop_low_priority_hunks_before_trimming_ticket():
+    """테스트·생성 파일을 빼서 자리가 나면 티켓은 자르지 않아야 한다."""
+    source = _file_diff("src/service.py", 20)
+    diff = _file_diff("package-lock.json", 200) + source
+    ticket = "요구사항 설명\n" * 300
+
+    packed = pack_review_inputs(diff, project_overview=None, ticket_context=ticket, budget=estimate_tokens(source) + estimate_tokens(ticket) + 400)
+
+    assert packed.ticket_context == ticket
+    assert packed.diff == source
+    assert "티켓/요구사항 일부" not in (packed.omission_note or "")
+
+
+def test_pack_review_inputs_should_trim_ticket_only_down_to_half_when_source_does_not_fit():
+    """소스 diff만으로도 넘치면 티켓을 자르되 남은 예산의 절반은 티켓에 남겨야 한다."""
+    diff = "".join(_file_diff(f"src/m{i}.py", 100) for i in range(10))
+    ticket = "요구사항 설명\n" * 1_000
+
+    packed = pack_review_inputs(diff, project_overview=None, ticket_context=ticket, budget=4_300)
+
+    assert packed.ticket_context is not None
+    assert 1_500 <= estimate_tokens(packed.ticket_context) <= 2_000
+    assert "티켓/요구사항 일부" in (packed.omission_note or "")
+
+
+def test_build_review_prompt_should_cap_overview_independent_of_diff_size():
+    """개요는 diff 크기와 무관하게 같은 길이로 잘려 shared 접두사가 MR마다 같아야 한다."""
+    overview = "프로젝트 규칙\n" * 2_000
+    small = ReviewContext(project_name="kop-web", pr_number="1", diff=_file_diff("src/a.py", 5), project_overview=overview)
+    large = ReviewContext(project_name="kop-web", pr_number="2", diff="".join(_file_diff(f"src/m{i}.py", 100) for i in range(20)), project_overview=overview)
+
+    small_bundle = build_review_prompt(small, token_budget=4_000)
+    large_bundle = build_review_prompt(large, token_budget=4_000)
+
+    assert small_bundle.shared == large_bundle.shared
+    assert estimate_tokens(small_bundle.shared) <= 1_000 + 20
+    assert "프로젝트 개요(AGENTS.md) 일부" in small_bundle.user
+
+
+def test_build_review_prompt_should_pack_diff_into_token_budget():
+    """token_budget을 주면 사용자 프롬프트가 예산 안에 들어가야 한다."""
+    diff = "".join(_file_diff(f"src/m{i}.py", 100) for i in range(20))
+    context = ReviewContext(project_name="kop-web", pr_number="1", diff=diff)
+
+    bundle = build_review_prompt(context, token_budget=3_000)
+
+    assert estimate_tokens(bundle.shared) + estimate_tokens(bundle.user) <= 3_000
+    assert "[생략 안내]" in bundle.user
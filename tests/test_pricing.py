@@ -0,0 +1,29 @@
+"""토큰 사용량 비용 환산 테스트."""
+
+import pytest
+
+from ai_review_bot.pricing import estimate_cost, model_price
+from ai_review_bot.review import TokenUsage
+
+
+def test_model_price_should_prefer_longest_matching_prefix():
+    """모델 스냅샷·파생 모델 이름은 가장 구체적인 단가를 써야 한다."""
+    assert model_price("gpt-5.1") == model_price("gpt-5")
+    assert model_price("gpt-5-mini-2025-08-07") == model_price("gpt-5-mini")
+    assert model_price("gpt-4o-mini") != model_price("gpt-4o")
+    assert model_price("claude-unknown") is None
+
+
+def test_estimate_cost_should_bill_cached_input_at_discount():
+    """캐시된 입력 토큰은 할인 단가로, 추론 토큰은 출력 토큰에 포함해 계산해야 한다."""
+    usage = TokenUsage(input_tokens=200_000, cached_tokens=100_000, output_tokens=50_000, reasoning_tokens=40_000, total_tokens=250_000)
+
+    assert estimate_cost("gpt-5.1", usage) == pytest.approx((100_000 * 1.25 + 100_000 * 0.125 + 50_000 * 10.0) / 1_000_000)
+    assert estimate_cost("unknown-model", usage) is None
+
+
+def test_estimate_cost_should_use_pricing_override_from_env(monkeypatch):
+    """OPENAI_REVIEW_PRICING에 적은 단가가 기본 표보다 우선해야 한다."""
+    monkeypatch.setenv("OPENAI_REVIEW_PRICING", '{"gpt-5.1": {"input": 2, "output": 20}}')
+
+    assert estimate_cost("gpt-5.1", TokenUsage(input_tokens=1_000_000, output_tokens=1_000_000)) == pytest.approx(22.0)
@@ -1,6 +1,7 @@
 """Prompt 규칙 검증 테스트."""
 
-from ai_review_bot.prompt import SYSTEM_PROMPT
+from ai_review_bot.prompt import STRUCTURED_SYSTEM_PROMPT, SYSTEM_PROMPT, build_review_prompt
+from ai_review_bot.review import ReviewContext
 
 
 def test_system_prompt_should_forbid_bullets_on_headings() -> None:
@@ -25,3 +26,23 @@ def test_system_prompt_should_prioritize_requirement_based_review() -> None:
     """티켓/요구사항 컨텍스트를 기준으로 리뷰하라는 지침이 있어야 한다."""
     assert "티켓/요구사항" in SYSTEM_PROMPT
     assert "요구사항을 충족하는지" in SYSTEM_PROMPT
+
+
+def test_structured_prompt_should_drop_markdown_formatting_rules() -> None:
+    """구조화 출력 프롬프트는 서식 규칙 없이 리뷰 기준만 담아 기본 프롬프트보다 훨씬 짧아야 한다."""
+    bundle = build_review_prompt(ReviewContext(project_name="kop-web", pr_number="1", diff="diff --git a/a b/a\n"), structured=True)
+
+    assert bundle.system == STRUCTURED_SYSTEM_PROMPT
+    assert "<details>" not in STRUCTURED_SYSTEM_PROMPT and "{+" not in STRUCTURED_SYSTEM_PROMPT
+    assert "요구사항을 충족하는지" in STRUCTURED_SYSTEM_PROMPT
+    assert len(STRUCTURED_SYSTEM_PROMPT) * 3 < len(SYSTEM_PROMPT)
+
+
+def test_build_review_prompt_should_list_paths_omitted_by_diff_size_limit() -> None:
+    """diff 크기 상한으로 빠진 파일은 user 프롬프트의 생략 안내에 나열하고 shared 접두사는 건드리지 않아야 한다."""
+    context = ReviewContext(project_name="kop-web", pr_number="1", diff="diff --git a/a b/a\n", omitted_paths=("big/data.sql", "big/dump.csv"))
+
+    bundle = build_review_prompt(context)
+
+    assert "diff 크기 상한 때문에 다음 파일 2개는 diff에 포함되지 않았습니다: big/data.sql, big/dump.csv." in bundle.user
+    assert "big/data.sql" not in bundle.shared
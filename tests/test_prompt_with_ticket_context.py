@@ -31,5 +31,20 @@ def test_build_review_prompt_includes_project_overview_when_present():
 
     bundle = build_review_prompt(context)
 
-    assert "[프로젝트 개요]" in bundle.user
-    assert "GraphQL API 서버" in bundle.user
+    assert "[프로젝트 개요]" in bundle.shared
+    assert "GraphQL API 서버" in bundle.shared
+    assert "[프로젝트 개요]" not in bundle.user
+
+
+def test_build_review_prompt_keeps_stable_prefix_identical_across_merge_requests():
+    """같은 프로젝트의 MR이면 시스템 프롬프트와 공유 접두사가 바이트 단위로 같고, MR 정보는 뒤쪽에만 있어야 한다."""
+    overview = "이 프로젝트는 GraphQL API 서버입니다.\n- 모든 쿼리는 인증이 필요합니다."
+    first = build_review_prompt(ReviewContext(project_name="kop-api", pr_number="1", diff="diff --git a/a.py b/a.py\n", project_overview=overview))
+    second = build_review_prompt(
+        ReviewContext(project_name="kop-api", pr_number="2", diff="diff --git a/b.py b/b.py\n", project_overview=overview, ticket_context="주문 취소 개선")
+    )
+
+    assert (first.system, first.shared) == (second.system, second.shared)
+    assert first.shared == "[프로젝트] kop-api\n[프로젝트 개요]\n" + overview
+    assert "[PR/MR]" not in first.shared
+    assert second.user.startswith("[PR/MR] 2\n[티켓/요구사항]\n주문 취소 개선")
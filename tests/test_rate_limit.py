@@ -0,0 +1,94 @@
+"""RPM/TPM 리미터 테스트."""
+
+from ai_review_bot.rate_limit import RateLimiter, parse_reset_duration
+
+
+class _FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.sleeps: list[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def _limiter(clock: _FakeClock, **limits) -> RateLimiter:
+    return RateLimiter(clock=clock, sleep=clock.sleep, **limits)
+
+
+def test_acquire_should_pace_requests_instead_of_failing():
+    """분당 요청 한도를 넘으면 실패하지 않고 다음 자리가 날 때까지 기다려야 한다."""
+    clock = _FakeClock()
+    limiter = _limiter(clock, requests_per_minute=2)
+
+    waits = [limiter.acquire(10) for _ in range(3)]
+
+    assert waits[:2] == [0.0, 0.0]
+    assert abs(waits[2] - 30.0) < 1e-6
+
+
+def test_acquire_should_pace_by_token_budget_and_settle_actual_usage():
+    """토큰 한도는 예약량으로 막고, 실제 사용량이 적으면 남은 자리를 돌려줘야 한다."""
+    clock = _FakeClock()
+    limiter = _limiter(clock, tokens_per_minute=1000)
+
+    limiter.acquire(800)
+    limiter.settle(800, 200)
+
+    assert limiter.acquire(800) == 0.0
+    assert limiter.acquire(600) > 0
+
+
+def test_release_should_return_reservation_without_exceeding_limit():
+    """사용량 없이 끝난 호출의 예약은 돌려주되 한도를 넘겨 채우지는 않아야 한다."""
+    clock = _FakeClock()
+    limiter = _limiter(clock, tokens_per_minute=1000)
+
+    limiter.acquire(800)
+    limiter.release(800)
+    limiter.release(800)
+
+    assert limiter.acquire(1000) == 0.0
+    assert limiter.acquire(1) > 0
+
+
+def test_update_from_headers_should_learn_limits_and_block_until_reset():
+    """응답 헤더의 한도를 학습하고 남은 요청이 0이면 reset까지 기다려야 한다."""
+    clock = _FakeClock()
+    limiter = _limiter(clock)
+
+    limiter.update_from_headers(
+        {
+            "x-ratelimit-limit-requests": "500",
+            "x-ratelimit-remaining-requests": "0",
+            "x-ratelimit-reset-requests": "1.5s",
+            "x-ratelimit-limit-tokens": "30000",
+            "x-ratelimit-remaining-tokens": "29000",
+        }
+    )
+
+    assert (limiter.requests_per_minute, limiter.tokens_per_minute) == (500, 30000)
+    assert limiter.acquire(100) >= 1.5
+
+
+def test_penalize_should_hold_all_calls_for_retry_after():
+    """429 이후에는 Retry-After 동안 새 호출을 멈춰야 한다."""
+    clock = _FakeClock()
+    limiter = _limiter(clock)
+
+    limiter.penalize(4.0)
+
+    assert limiter.acquire(1) == 4.0
+
+
+def test_parse_reset_duration_should_handle_openai_formats():
+    """OpenAI reset 헤더 형식(`6m0s`, `20ms`, `1s`)을 초로 바꿔야 한다."""
+    assert parse_reset_duration("6m0s") == 360.0
+    assert parse_reset_duration("20ms") == 0.02
+    assert parse_reset_duration("1s") == 1.0
+    assert parse_reset_duration("2") == 2.0
+    assert parse_reset_duration("") is None
@@ -0,0 +1,130 @@
+"""리뷰 리포트 병합 테스트."""
+
+import json
+
+import pytest
+
+from ai_review_bot.report import IDEAS_TITLE, STABILITY_TITLE, ReviewReport, merge_reports
+
+_PARTIAL_1 = """## 핵심 요약
+- 안정성을 위해 먼저 살펴보면 좋은 부분: {+ 1건 +}
+- 추가 개선 아이디어: 0건
+- 핵심 위험 요약: {+ 트랜잭션 경계 누락 +}
+
+<details>
+
+<summary>
+안정성을 위해 먼저 살펴보면 좋은 부분
+</summary>
+
+### 성능/리소스
+- `(UserRepo.ts:42-55)`
+  - 문제: N+1 쿼리
+  - 영향: 응답 지연
+  - 조치: 배치 조회
+
+</details>
+
+<details>
+
+<summary>
+추가 개선 아이디어
+</summary>
+
+- 없음
+
+</details>"""
+
+_PARTIAL_2 = """## 핵심 요약
+- 안정성을 위해 먼저 살펴보면 좋은 부분: {+ 1건 +}
+- 추가 개선 아이디어: {+ 1건 +}
+- 핵심 위험 요약: 권한 검증 누락
+
+<details>
+<summary>안정성을 위해 먼저 살펴보면 좋은 부분</summary>
+
+### 보안(Security)
+- `(OrderService.ts:88-107)`
+  - 문제: 권한 검증 누락
+  - 영향: 타인 주문 조회
+  - 조치: 소유자 검증 추가
+
+</details>
+
+<details>
+<summary>추가 개선 아이디어</summary>
+
+### 유지보수성
+- `(CommentUtils.ts:12-18)`
+  - 문제: 중복 로직
+  - 영향: 수정 누락
+  - 조치: 헬퍼 추출
+
+</details>"""
+
+
+def test_merge_reports_should_recount_and_order_domains():
+    """병합 결과는 건수를 다시 세고 도메인 순서(보안 → 성능)로 정렬해야 한다."""
+    merged = merge_reports([_PARTIAL_1, _PARTIAL_2])
+
+    assert "- 안정성을 위해 먼저 살펴보면 좋은 부분: {+ 2건 +}" in merged
+    assert "- 추가 개선 아이디어: {+ 1건 +}" in merged
+    assert "- 핵심 위험 요약: {+ 트랜잭션 경계 누락 / 권한 검증 누락 +}" in merged
+    assert merged.index("### 보안") < merged.index("### 성능/리소스") < merged.index("### 유지보수성")
+    assert "  - 조치: 배치 조회" in merged
+
+
+def test_merge_reports_should_render_empty_sections():
+    """지적 사항이 없으면 각 섹션에 `- 없음`만 남겨야 한다."""
+    empty = _PARTIAL_1.split("<details>")[0].replace("{+ 1건 +}", "0건").replace("{+ 트랜잭션 경계 누락 +}", "없음")
+
+    merged = merge_reports([empty, empty])
+
+    assert "- 안정성을 위해 먼저 살펴보면 좋은 부분: 0건" in merged
+    assert "- 핵심 위험 요약: 없음" in merged
+    assert merged.count("- 없음") == 2
+
+
+def test_review_report_should_expose_issues_with_locations_and_line_ranges():
+    """한 번의 파싱으로 섹션·도메인·파일·라인 범위를 가진 이슈와 핵심 위험 요약을 읽어야 한다."""
+    report = ReviewReport.parse(_PARTIAL_2)
+
+    assert report.structured is True
+    assert (report.stability_count, report.ideas_count) == (1, 1)
+    assert report.risks == ("권한 검증 누락",)
+    assert [(issue.section, issue.domain, issue.path, issue.line_start, issue.line_end) for issue in report.issues] == [
+        (STABILITY_TITLE, "보안", "OrderService.ts", 88, 107),
+        (IDEAS_TITLE, "유지보수성", "CommentUtils.ts", 12, 18),
+    ]
+    assert report.issues[0].text.splitlines()[-1] == "  - 조치: 소유자 검증 추가"
+
+
+def test_review_report_filter_should_drop_risk_without_stability_issues():
+    """안정성 이슈가 모두 걸러지면 핵심 위험 요약도 함께 빠져야 한다."""
+    report = ReviewReport.parse(_PARTIAL_2).filter(lambda issue: issue.section == IDEAS_TITLE)
+
+    assert report.risks == ()
+    assert "- 핵심 위험 요약: 없음" in report.render()
+    assert ReviewReport.parse("자유 형식 리뷰").structured is False
+
+
+def test_review_report_from_json_should_map_severity_to_sections():
+    """구조화 출력의 high/medium은 안정성 섹션, low는 추가 개선 아이디어로 그려야 한다."""
+    output = json.dumps(
+        {
+            "risk_summary": "",
+            "findings": [
+                {"severity": "medium", "domain": "성능/리소스", "file": "UserRepo.ts", "line_start": 42, "line_end": 42, "problem": "N+1", "impact": "지연", "action": "배치"},
+                {"severity": "low", "domain": "유지보수성", "file": "Utils.ts", "line_start": None, "line_end": None, "problem": "중복", "impact": "누락", "action": "추출"},
+            ],
+        }
+    )
+
+    report = ReviewReport.from_json(output)
+
+    assert (report.stability_count, report.ideas_count) == (1, 1)
+    assert report.issues[0].text.splitlines()[0] == "- `(UserRepo.ts:42)`"
+    assert report.issues[1].text.splitlines()[0] == "- `(Utils.ts)`"
+    assert "- 핵심 위험 요약: 없음" in report.render()
+    with pytest.raises(ValueError):
+        ReviewReport.from_json('{"findings": [{"severity": "low"}]}')
@@ -0,0 +1,141 @@
+"""LLM 호출 재시도·헤징 테스트."""
+
+import threading
+
+import pytest
+
+from ai_review_bot.resilience import CallStats, LatencyTracker, RetryPolicy, call_with_retries
+
+
+class _Flaky:
+    def __init__(self, failures: list[Exception]) -> None:
+        self.failures = failures
+        self.calls = 0
+
+    def __call__(self) -> str:
+        self.calls += 1
+        if self.failures:
+            raise self.failures.pop(0)
+        return "ok"
+
+
+def _retry(call, *, policy: RetryPolicy, stats: CallStats, latencies: LatencyTracker | None = None, sleeps: list[float] | None = None):
+    return call_with_retries(
+        call,
+        policy=policy,
+        is_retryable=lambda exc: isinstance(exc, TimeoutError),
+        stats=stats,
+        latencies=latencies or LatencyTracker(),
+        sleep=(sleeps if sleeps is not None else []).append,
+    )
+
+
+def test_call_with_retries_should_back_off_and_retry_retryable_errors():
+    """재시도 가능한 오류는 백오프 후 다시 호출하고 시도 횟수를 기록해야 한다."""
+    call = _Flaky([TimeoutError(), TimeoutError()])
+    stats = CallStats()
+    sleeps: list[float] = []
+
+    assert _retry(call, policy=RetryPolicy(max_retries=2, backoff_base=1.0), stats=stats, sleeps=sleeps) == "ok"
+    assert call.calls == 3
+    assert len(sleeps) == 2 and all(0 <= delay <= 2.0 for delay in sleeps)
+    assert stats.snapshot() == {"calls": 1, "attempts": 3, "retries": 2, "failures": 0, "hedges": 0, "hedge_wins": 0}
+
+
+def test_call_with_retries_should_not_retry_other_errors_or_exceed_limit():
+    """재시도 대상이 아닌 오류나 재시도 한도를 넘긴 오류는 그대로 올려야 한다."""
+    stats = CallStats()
+    with pytest.raises(ValueError):
+        _retry(_Flaky([ValueError("bad request")]), policy=RetryPolicy(max_retries=3), stats=stats)
+    with pytest.raises(TimeoutError):
+        _retry(_Flaky([TimeoutError()] * 3), policy=RetryPolicy(max_retries=1), stats=stats)
+    assert stats.snapshot()["failures"] == 2
+
+
+def test_call_with_retries_should_hedge_slow_attempt_and_take_first_response():
+    """백분위를 넘긴 시도에는 같은 요청을 한 번 더 보내고 먼저 끝난 응답을 써야 한다."""
+    latencies = LatencyTracker()
+    for _ in range(10):
+        latencies.record(0.01)
+    release = threading.Event()
+    calls: list[int] = []
+    lock = threading.Lock()
+
+    def _call() -> str:
+        with lock:
+            calls.append(len(calls))
+            index = len(calls)
+        if index == 1:
+            release.wait(5)
+            return "slow"
+        return "fast"
+
+    stats = CallStats()
+    try:
+        result = _retry(_call, policy=RetryPolicy(hedge_percentile=90), stats=stats, latencies=latencies)
+    finally:
+        release.set()
+
+    assert result == "fast"
+    assert stats.snapshot()["hedges"] == 1
+    assert stats.snapshot()["hedge_wins"] == 1
+    assert stats.snapshot()["attempts"] == 2
+
+
+def test_call_with_retries_should_hedge_on_cold_start_and_report_discarded_result():
+    """표본이 없으면 고정 지연으로 헤징하고, 진 시도가 나중에 끝나면 그 결과를 on_discard로 넘겨야 한다."""
+    release = threading.Event()
+    discarded: list[str] = []
+    finished = threading.Event()
+    calls: list[int] = []
+    lock = threading.Lock()
+
+    def _call() -> str:
+        with lock:
+            calls.append(len(calls))
+            index = len(calls)
+        if index == 1:
+            release.wait(5)
+            return "slow"
+        return "fast"
+
+    def _on_discard(result: str) -> None:
+        discarded.append(result)
+        finished.set()
+
+    stats = CallStats()
+    result = call_with_retries(
+        _call,
+        policy=RetryPolicy(hedge_percentile=95, hedge_after_seconds=0.01),
+        is_retryable=lambda exc: False,
+        stats=stats,
+        latencies=LatencyTracker(),
+        on_discard=_on_discard,
+    )
+    release.set()
+
+    assert result == "fast"
+    assert stats.snapshot()["hedges"] == 1
+    assert finished.wait(5)
+    assert discarded == ["slow"]
+
+
+def test_retry_policy_from_env_should_read_hedge_after_seconds(monkeypatch):
+    """OPENAI_REVIEW_HEDGE_AFTER_SECONDS는 양수일 때만 헤징 고정 지연으로 쓰여야 한다."""
+    monkeypatch.setenv("OPENAI_REVIEW_HEDGE_AFTER_SECONDS", "45")
+    assert RetryPolicy.from_env().hedge_after_seconds == 45.0
+
+    monkeypatch.setenv("OPENAI_REVIEW_HEDGE_AFTER_SECONDS", "0")
+    assert RetryPolicy.from_env().hedge_after_seconds is None
+
+
+def test_latency_tracker_should_wait_for_enough_samples():
+    """표본이 부족하면 헤징 기준을 만들지 않아야 한다."""
+    latencies = LatencyTracker()
+    for value in range(9):
+        latencies.record(float(value))
+    assert latencies.percentile(95) is None
+
+    latencies.record(9.0)
+    assert latencies.percentile(95) == 9.0
+    assert latencies.percentile(50) == 5.0
@@ -1,69 +1,193 @@
 """ReviewService 관련 테스트."""
 
-from ai_review_bot.review_service import _extract_section, _format_section
+import json
 
+import pytest
 
-def test_extract_section_should_find_by_marker_not_plain_text():
-    """본문에 헤더 이름이 포함되어 있어도 마커(## ...) 기준으로 찾아야 한다."""
-    report = """## Summary
-This is a summary section. The word Summary appears here but should not be confused.
+from ai_review_bot.llm import LLMResult
+from ai_review_bot.prompt import STRUCTURED_SYSTEM_PROMPT
+from ai_review_bot.report import ReviewReport
+from ai_review_bot.review import ReviewContext, TokenUsage
+from ai_review_bot.review_service import _PRAISE_MESSAGE, ReviewService, _render_review
 
-## Must Fix
-- Issue 1
-- Issue 2
+_MODEL_OUTPUT = """## 핵심 요약
+- 안정성을 위해 먼저 살펴보면 좋은 부분: 3건
+- 추가 개선 아이디어: 0건
+- 핵심 위험 요약: {+ 권한 검증 누락 +}
 
-## Nice to Have
-- Suggestion 1"""
 
-    result = _extract_section(report, "Summary")
-    assert "This is a summary section" in result
-    assert "Must Fix" not in result
-    assert "Nice to Have" not in result
+<details>
+<summary>안정성을 위해 먼저 살펴보면 좋은 부분</summary>
 
+### 성능/리소스
+- `(UserRepo.ts:42-55)`
+  - 문제: N+1 쿼리
 
-def test_extract_section_should_handle_header_in_content():
-    """본문 내용에 헤더 이름이 포함된 경우에도 올바르게 추출해야 한다."""
-    report = """## Summary
-The word Summary appears in this content, but we should extract correctly.
 
-## Must Fix
-- Fix the Summary section issue
-- Another issue
 
-## Nice to Have
-- Nice suggestion"""
+### 보안(Security)
+- `(OrderService.ts:88-107)`
+  - 문제: 권한 검증 누락
+</details>"""
 
-    result = _extract_section(report, "Summary")
-    assert "The word Summary appears" in result
-    assert "Fix the Summary section issue" not in result
-    assert "Must Fix" not in result
 
+def test_render_review_should_rewrite_korean_report_in_canonical_form():
+    """한국어 섹션 리포트는 건수를 다시 세고 도메인 순서·빈 줄을 정해진 형식으로 맞춰야 한다."""
+    parsed = ReviewReport.parse(_MODEL_OUTPUT)
 
-def test_format_section_should_keep_existing_headings_without_prefix():
-    """도메인 헤딩과 파일명은 불릿 없이 그대로 유지되어야 한다."""
-    section = """### Maintainability
-(unknown.py:2-2)
-  - 문제: 내용
-""".strip()
+    report = _render_review(_MODEL_OUTPUT, parsed)
 
-    formatted = _format_section(section)
+    assert "- 안정성을 위해 먼저 살펴보면 좋은 부분: {+ 2건 +}" in report
+    assert report.index("### 보안") < report.index("### 성능/리소스")
+    assert "\n\n\n" not in report
+    assert "<summary>\n추가 개선 아이디어\n</summary>\n\n- 없음" in report
 
-    assert formatted.startswith("### Maintainability")
-    assert "(unknown.py:2-2)" in formatted
-    assert formatted.splitlines()[0] == "### Maintainability"
-    assert not formatted.startswith("- ")
 
+def test_render_review_should_keep_unstructured_output_and_praise_empty_reviews():
+    """형식을 벗어난 출력은 그대로 두고, 지적이 없는 리포트에는 칭찬 문구를 붙여야 한다."""
+    free_form = "## Summary\n- 모든 변경이 좋아 보입니다."
+    empty = "## 핵심 요약\n- 안정성을 위해 먼저 살펴보면 좋은 부분: 0건\n- 추가 개선 아이디어: 0건\n- 핵심 위험 요약: 없음"
 
-def test_format_section_should_preserve_single_blank_lines_between_issues():
-    """원본 섹션에 있는 단일 빈 줄은 유지해야 한다."""
-    section = """### Maintainability
-(unknown.py:2-2)
+    assert _render_review(free_form, ReviewReport.parse(free_form)) == free_form
+    assert _render_review(empty, ReviewReport.parse(empty)).rstrip().endswith(_PRAISE_MESSAGE)
 
-### Performance
-(foo.py:10-12)
-""".strip()
 
-    formatted = _format_section(section)
+class _RecordingLLM:
+    is_available = True
+    model = "gpt-5.1"
+    structured_output = False
 
-    assert "\n\n" in formatted
-    assert formatted.split("\n\n")[1].startswith("### Performance")
+    def __init__(self) -> None:
+        self.prompts: list[str] = []
+
+    def complete(self, prompt):
+        return LLMResult(text=self.generate(prompt), usage=TokenUsage(input_tokens=10, output_tokens=5, total_tokens=15))
+
+    def generate(self, prompt):
+        self.prompts.append(prompt.user)
+        return "## 핵심 요약\n- 안정성을 위해 먼저 살펴보면 좋은 부분: 0건\n- 추가 개선 아이디어: 0건\n- 핵심 위험 요약: 없음\n"
+
+
+def test_create_review_should_review_large_diff_in_chunks():
+    """diff가 분할 예산을 넘으면 묶음마다 LLM을 호출하고 결과를 하나로 합쳐야 한다."""
+    diff = "".join(f"diff --git a/f{i}.py b/f{i}.py\n@@ -1 +1 @@\n-a\n+b\n" for i in range(3))
+    llm = _RecordingLLM()
+    service = ReviewService(llm, chunk_chars=60, max_workers=2)  # type: ignore[arg-type]
+
+    report = service.create_review(ReviewContext(project_name="kop-web", pr_number="1", diff=diff))
+
+    assert len(llm.prompts) == 3
+    assert all("[분할 리뷰]" in prompt for prompt in llm.prompts)
+    assert report.count("## 핵심 요약") == 1
+
+
+def test_review_should_sum_token_usage_across_chunks():
+    """분할 리뷰의 토큰 사용량은 묶음별 사용량의 합이어야 한다."""
+    diff = "".join(f"diff --git a/f{i}.py b/f{i}.py\n@@ -1 +1 @@\n-a\n+b\n" for i in range(3))
+    service = ReviewService(_RecordingLLM(), chunk_chars=60, max_workers=2)  # type: ignore[arg-type]
+
+    result = service.review(ReviewContext(project_name="kop-web", pr_number="1", diff=diff))
+
+    assert result.usage == TokenUsage(input_tokens=30, output_tokens=15, total_tokens=45)
+    assert result.cached is False
+
+
+def test_review_should_compact_diff_before_building_prompt(capsys):
+    """프롬프트에는 공백만 바뀐 헝크와 삭제된 파일 본문을 덜어 낸 diff가 들어가야 하고, 압축 로그는 stdout 리포트에 섞이지 않아야 한다."""
+    diff = (
+        "diff --git a/a.ts b/a.ts\n--- a/a.ts\n+++ b/a.ts\n@@ -1 +1,2 @@\n-call(a, b)\n+call(a,\n+     b)\n@@ -5 +5 @@\n-x = 1\n+x = 2\n"
+        "diff --git a/gone.ts b/gone.ts\ndeleted file mode 100644\n--- a/gone.ts\n+++ /dev/null\n@@ -1,2 +0,0 @@\n-secret body 1\n-secret body 2\n"
+    )
+    llm = _RecordingLLM()
+
+    ReviewService(llm, diff_context=3).review(ReviewContext(project_name="kop-web", pr_number="1", diff=diff))  # type: ignore[arg-type]
+
+    assert "+x = 2" in llm.prompts[0]
+    assert "call(a," not in llm.prompts[0]
+    assert "secret body" not in llm.prompts[0]
+    assert "(삭제된 파일: 본문 2줄 생략)" in llm.prompts[0]
+    captured = capsys.readouterr()
+    assert captured.out == ""
+    assert "diff compaction:" in captured.err
+
+
+class _StreamingLLM(_RecordingLLM):
+    def generate_stream(self, prompt, *, on_usage=None):
+        self.prompts.append(prompt.user)
+        yield "## 핵심 요약\n"
+        yield "- 추가 개선 아이디어: 0건\n"
+        if on_usage is not None:
+            on_usage(TokenUsage(input_tokens=1_000_000, output_tokens=100_000, total_tokens=1_100_000))
+
+
+def test_create_review_should_forward_stream_deltas_and_return_full_report():
+    """on_delta가 있으면 조각을 전달하고, 최종 결과는 조각을 모두 합친 리포트를 정규화한 것이어야 한다."""
+    llm = _StreamingLLM()
+    received: list[str] = []
+
+    report = ReviewService(llm).create_review(  # type: ignore[arg-type]
+        ReviewContext(project_name="kop-web", pr_number="1", diff="diff --git a/a b/a\n"),
+        on_delta=received.append,
+    )
+
+    assert received == ["## 핵심 요약\n", "- 추가 개선 아이디어: 0건\n"]
+    full = "".join(received)
+    assert report == _render_review(full, ReviewReport.parse(full))
+    assert report.startswith("## 핵심 요약\n- 안정성을 위해 먼저 살펴보면 좋은 부분: 0건\n")
+
+
+def test_review_should_report_model_latency_and_cost_for_streamed_review():
+    """스트리밍 리뷰도 완료 이벤트의 사용량으로 모델·소요 시간·예상 비용을 채워야 한다."""
+    result = ReviewService(_StreamingLLM()).review(  # type: ignore[arg-type]
+        ReviewContext(project_name="kop-web", pr_number="1", diff="diff --git a/a b/a\n"),
+        on_delta=lambda _delta: None,
+    )
+
+    assert result.model == "gpt-5.1"
+    assert result.usage.input_tokens == 1_000_000
+    assert result.cost_usd == pytest.approx(1.25 + 1.0)
+    assert result.latency_seconds >= 0
+
+
+class _StructuredLLM(_RecordingLLM):
+    structured_output = True
+
+    def __init__(self, outputs: list[str]) -> None:
+        super().__init__()
+        self.outputs = outputs
+        self.systems: list[str] = []
+
+    def complete(self, prompt):
+        self.systems.append(prompt.system)
+        return LLMResult(text=self.outputs[len(self.systems) - 1], usage=TokenUsage())
+
+
+def _finding(path: str, severity: str, domain: str) -> dict:
+    return {"severity": severity, "domain": domain, "file": path, "line_start": 3, "line_end": 9, "problem": "문제", "impact": "영향", "action": "조치"}
+
+
+def test_structured_output_should_render_markdown_locally_across_chunks():
+    """구조화 출력 모드는 서식 규칙 없는 프롬프트를 쓰고, 묶음별 JSON을 합쳐 마크다운을 로컬에서 그려야 한다."""
+    diff = "".join(f"diff --git a/f{i}.py b/f{i}.py\n@@ -1 +1 @@\n-a\n+b\n" for i in range(2))
+    outputs = [
+        json.dumps({"risk_summary": "권한 검증 누락", "findings": [_finding("f0.py", "high", "보안")]}),
+        json.dumps({"risk_summary": "", "findings": [_finding("f1.py", "low", "유지보수성")]}),
+    ]
+    llm = _StructuredLLM(outputs)
+
+    result = ReviewService(llm, chunk_chars=60, max_workers=1).review(ReviewContext(project_name="kop-web", pr_number="1", diff=diff))  # type: ignore[arg-type]
+
+    assert llm.systems == [STRUCTURED_SYSTEM_PROMPT, STRUCTURED_SYSTEM_PROMPT]
+    assert "- 안정성을 위해 먼저 살펴보면 좋은 부분: {+ 1건 +}" in result.report
+    assert "- 핵심 위험 요약: {+ 권한 검증 누락 +}" in result.report
+    assert "### 보안\n- `(f0.py:3-9)`\n  - 문제: 문제\n  - 영향: 영향\n  - 조치: 조치" in result.report
+    assert result.parsed is not None
+    assert [(issue.path, issue.severity) for issue in result.parsed.issues] == [("f0.py", "high"), ("f1.py", "low")]
+
+
+def test_structured_output_should_fail_on_invalid_json():
+    """구조화 출력이 JSON이 아니면 리포트를 추측하지 않고 실패해야 한다."""
+    service = ReviewService(_StructuredLLM(["## 핵심 요약"]))  # type: ignore[arg-type]
+
+    with pytest.raises(RuntimeError, match="JSON"):
+        service.create_review(ReviewContext(project_name="kop-web", pr_number="1", diff="diff --git a/a b/a\n"))
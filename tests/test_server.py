@@ -0,0 +1,221 @@
+"""GitLab 웹훅 서버 모드 테스트."""
+
+import http.client
+import json
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+from ai_review_bot.cli import main
+from ai_review_bot.llm import LLMResult
+from ai_review_bot.review import TokenUsage
+from ai_review_bot.review_service import ReviewService
+from ai_review_bot.server import MergeRequestJob, ReviewWorker, create_server, parse_merge_request_event
+
+_API_URL = "https://gitlab.example.com/api/v4"
+_DIFF = "diff --git a/app.py b/app.py\n--- a/app.py\n+++ b/app.py\n@@ -1 +1 @@\n-a\n+b\n"
+
+
+def _event(action: str = "open", **attrs) -> dict:
+    return {
+        "object_kind": "merge_request",
+        "project": {"id": 42, "path": "kop-web", "web_url": "https://gitlab.example.com/group/kop-web"},
+        "object_attributes": {
+            "iid": 7,
+            "action": action,
+            "state": "opened",
+            "description": "관련 이슈 #3",
+            "last_commit": {"id": "abcdef1234567890"},
+            **attrs,
+        },
+    }
+
+
+class _FakeLLM:
+    is_available = True
+    model = "gpt-5.1"
+    structured_output = False
+
+    def __init__(self) -> None:
+        self.prompts: list = []
+
+    def complete(self, prompt):
+        self.prompts.append(prompt)
+        return LLMResult(text="## 핵심 요약\n- 문제 없음", usage=TokenUsage())
+
+
+def test_parse_merge_request_event_should_accept_open_and_pushed_updates():
+    """open 이벤트와 새 커밋이 올라온 update만 리뷰 작업으로 바꿔야 한다."""
+    job = parse_merge_request_event(_event(), api_url=_API_URL)
+
+    assert job == MergeRequestJob(
+        api_url="https://gitlab.example.com/api/v4",
+        project_id="42",
+        project_name="kop-web",
+        mr_iid="7",
+        head_sha="abcdef1234567890",
+        description="관련 이슈 #3",
+    )
+    assert parse_merge_request_event(_event("update", oldrev="1111111"), api_url=_API_URL) is not None
+    assert parse_merge_request_event(_event("update"), api_url=_API_URL) is None
+    assert parse_merge_request_event(_event(draft=True), api_url=_API_URL) is None
+    assert parse_merge_request_event(_event("close"), api_url=_API_URL) is None
+    assert parse_merge_request_event({"object_kind": "push"}, api_url=_API_URL) is None
+
+
+def test_parse_merge_request_event_should_ignore_projects_on_other_hosts():
+    """페이로드의 web_url 호스트가 설정된 GitLab과 다르면 토큰을 보낼 작업을 만들지 않아야 한다."""
+    forged = _event()
+    forged["project"]["web_url"] = "https://attacker.example/group/kop-web"
+
+    assert parse_merge_request_event(forged, api_url=_API_URL) is None
+    assert parse_merge_request_event(_event(), api_url="https://gitlab.internal/api/v4") is None
+
+
+@pytest.mark.parametrize("missing", ["LLM_REVIEW_WEBHOOK_SECRET", "GITLAB_API_URL"])
+def test_serve_should_refuse_to_start_without_secret_or_api_url(monkeypatch, capsys, missing):
+    """웹훅 secret이나 GITLAB_API_URL이 없으면 포트를 열지 않고 종료해야 한다."""
+    monkeypatch.setenv("GITLAB_TOKEN", "token")
+    monkeypatch.setenv("LLM_REVIEW_WEBHOOK_SECRET", "s3cret")
+    monkeypatch.setenv("GITLAB_API_URL", _API_URL)
+    monkeypatch.delenv(missing)
+
+    assert main(["serve", "--port", "0"]) == 1
+    assert f"required env var {missing} is missing" in capsys.readouterr().err
+
+
+def test_worker_should_fetch_context_review_and_post_note():
+    """워커는 API로 diff·AGENTS.md를 가져와 리뷰하고 마커를 붙여 코멘트를 남겨야 한다."""
+    posted: list[dict] = []
+    fetched: list[dict] = []
+    llm = _FakeLLM()
+    worker = ReviewWorker(
+        ReviewService(llm),  # type: ignore[arg-type]
+        token="token",
+        fetch_diff=lambda **kwargs: fetched.append(kwargs) or _DIFF,
+        fetch_file=lambda **kwargs: "팀 규칙" if kwargs["ref"] == "abcdef1234567890" else None,
+        post_note=lambda **kwargs: posted.append(kwargs),
+        collect_tickets=lambda job, token: "티켓 본문",
+        diff_excludes=["**/*.lock"],
+    )
+
+    worker.process(parse_merge_request_event(_event(), api_url=_API_URL))  # type: ignore[arg-type]
+
+    assert fetched[0]["excludes"] == ("**/*.lock",)
+    assert "팀 규칙" in llm.prompts[0].shared
+    assert "티켓 본문" in llm.prompts[0].user
+    assert posted[0]["mr_iid"] == "7" and posted[0]["project_id"] == "42"
+    assert posted[0]["body"].rstrip().endswith("<!-- ai-review-bot:reviewed-sha=abcdef1234567890 -->")
+
+
+class _RecordingWorker:
+    pending = 0
+
+    def __init__(self, accept: bool = True) -> None:
+        self.accept = accept
+        self.jobs: list[MergeRequestJob] = []
+
+    def submit(self, job):
+        self.jobs.append(job)
+        return self.accept
+
+
+@pytest.fixture
+def webhook_server():
+    servers = []
+
+    def _start(worker, secret="s3cret"):
+        server = create_server(worker, host="127.0.0.1", port=0, secret=secret, api_url=_API_URL)  # type: ignore[arg-type]
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return f"http://127.0.0.1:{server.server_port}"
+
+    yield _start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def _post(url: str, payload: dict, token: str) -> tuple[int, dict]:
+    request = urllib.request.Request(url, data=json.dumps(payload).encode(), headers={"X-Gitlab-Token": token, "Content-Type": "application/json"})
+    try:
+        with urllib.request.urlopen(request, timeout=5) as resp:
+            return resp.status, json.loads(resp.read())
+    except urllib.error.HTTPError as exc:
+        return exc.code, json.loads(exc.read())
+
+
+def test_webhook_should_authenticate_and_enqueue_merge_request_events(webhook_server):
+    """X-Gitlab-Token이 맞는 MR 이벤트만 큐에 넣고 202를, 리뷰 대상이 아니면 200을 반환해야 한다."""
+    worker = _RecordingWorker()
+    url = webhook_server(worker)
+
+    assert _post(url, _event(), "wrong")[0] == 401
+    assert _post(url, _event(), "s3cret") == (202, {"status": "queued", "project_id": "42", "mr_iid": "7"})
+    assert _post(url, {"object_kind": "push"}, "s3cret") == (200, {"status": "ignored"})
+    assert [job.mr_iid for job in worker.jobs] == ["7"]
+
+
+def test_webhook_should_ignore_events_whose_project_host_does_not_match(webhook_server):
+    """인증을 통과해도 다른 호스트의 프로젝트 이벤트는 큐에 넣지 않아야 한다."""
+    worker = _RecordingWorker()
+    url = webhook_server(worker)
+    forged = _event()
+    forged["project"]["web_url"] = "https://attacker.example/group/kop-web"
+
+    assert _post(url, forged, "s3cret") == (200, {"status": "ignored"})
+    assert worker.jobs == []
+
+
+@pytest.mark.parametrize("content_length", ["abc", "-5", str(10 * 1024 * 1024)])
+def test_webhook_should_reject_malformed_content_length(webhook_server, content_length):
+    """숫자가 아니거나 음수이거나 상한을 넘는 Content-Length는 본문을 읽지 않고 400이어야 한다."""
+    worker = _RecordingWorker()
+    url = webhook_server(worker)
+    connection = http.client.HTTPConnection(url.removeprefix("http://"), timeout=5)
+    try:
+        connection.putrequest("POST", "/")
+        connection.putheader("X-Gitlab-Token", "s3cret")
+        connection.putheader("Content-Length", content_length)
+        connection.endheaders()
+        response = connection.getresponse()
+        status, body = response.status, json.loads(response.read())
+    finally:
+        connection.close()
+
+    assert (status, body) == (400, {"status": "bad_request", "error": "invalid body size"})
+    assert worker.jobs == []
+
+
+def test_webhook_should_reject_when_queue_is_full(webhook_server):
+    """워커 큐가 가득 차면 503으로 GitLab이 다시 보내게 해야 한다."""
+    url = webhook_server(_RecordingWorker(accept=False))
+
+    assert _post(url, _event(), "s3cret")[0] == 503
+
+
+def test_worker_should_drop_older_job_when_same_mr_is_pushed_again():
+    """같은 MR에 새 push가 큐에 들어오면 이전 작업은 LLM을 호출하거나 코멘트를 남기지 않아야 한다."""
+    posted: list[dict] = []
+    llm = _FakeLLM()
+    worker = ReviewWorker(
+        ReviewService(llm),  # type: ignore[arg-type]
+        token="token",
+        fetch_diff=lambda **kwargs: _DIFF,
+        fetch_file=lambda **kwargs: None,
+        post_note=lambda **kwargs: posted.append(kwargs),
+        fetch_head_sha=lambda **kwargs: None,
+        collect_tickets=lambda job, token: None,
+        debounce_seconds=0,
+    )
+    older = parse_merge_request_event(_event(), api_url=_API_URL)
+    newer = parse_merge_request_event(_event("update", oldrev="abcdef1234567890", last_commit={"id": "fedcba0987654321"}), api_url=_API_URL)
+    older_guard = worker._guard(older)  # type: ignore[arg-type]
+    newer_guard = worker._guard(newer)  # type: ignore[arg-type]
+
+    assert worker.process(older, guard=older_guard) is False  # type: ignore[arg-type]
+    assert worker.process(newer, guard=newer_guard) is True  # type: ignore[arg-type]
+    assert len(llm.prompts) == 1
+    assert [note["body"].rstrip().endswith("reviewed-sha=fedcba0987654321 -->") for note in posted] == [True]
@@ -0,0 +1,27 @@
+"""시작 경로가 무거운 의존성을 미리 가져오지 않는지 확인하는 테스트."""
+
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+_PROBE = """
+import sys
+sys.path[:0] = [{src!r}, {root!r}]
+import entrypoint
+import ai_review_bot.cli
+from ai_review_bot.llm import ReviewLLMClient
+from ai_review_bot.support.http import get_http_client
+
+ReviewLLMClient(api_key="sk-test")
+print(",".join(name for name in ("openai", "requests", "http.server") if name in sys.modules))
+"""
+
+
+def test_startup_path_should_not_import_openai_or_requests():
+    """엔트리포인트·CLI import와 LLM 클라이언트 생성만으로는 openai/requests를 가져오지 않아야 한다."""
+    probe = _PROBE.format(src=str(ROOT / "src"), root=str(ROOT))
+    result = subprocess.run([sys.executable, "-c", probe], capture_output=True, text=True, check=True)
+
+    assert result.stdout.strip() == ""
@@ -0,0 +1,58 @@
+"""같은 MR의 연속 push를 대체·병합하는 리스 테스트."""
+
+from ai_review_bot.supersede import LeaseStore, SupersedeGuard, lease_key
+
+_KEY = lease_key("https://gitlab.example.com/api/v4", "42", "7")
+
+
+def test_newer_claim_should_supersede_older_lease_across_sqlite_stores(tmp_path):
+    """같은 SQLite 파일을 쓰는 다른 작업이 새 리스를 잡으면 이전 리뷰는 대체돼야 한다."""
+    path = tmp_path / "leases.sqlite3"
+    first = SupersedeGuard(LeaseStore(path), LeaseStore(path).claim(_KEY, "aaaa1111"))
+    second = SupersedeGuard(LeaseStore(path), LeaseStore(path).claim(_KEY, "bbbb2222"))
+
+    assert first.newer_head_sha() == "bbbb2222"
+    assert first.superseded("the LLM call") is True
+    assert second.superseded("the LLM call") is False
+
+
+def test_stale_claim_should_not_supersede_newer_running_review(tmp_path):
+    """재시도된 이전 파이프라인이 MR의 현재 head가 아닌 SHA로 리스를 잡으면 새 리뷰를 멈추게 하지 않아야 한다."""
+    path = tmp_path / "leases.sqlite3"
+    newer = SupersedeGuard(LeaseStore(path), LeaseStore(path).claim(_KEY, "bbbb2222", latest_head_sha="bbbb2222"))
+    stale = SupersedeGuard(LeaseStore(path), LeaseStore(path).claim(_KEY, "aaaa1111", latest_head_sha="bbbb2222"))
+
+    assert newer.superseded("the LLM call") is False
+    assert stale.newer_head_sha() == "bbbb2222"
+    assert LeaseStore(path).current(_KEY).head_sha == "bbbb2222"  # type: ignore[union-attr]
+
+
+def test_guard_should_compare_with_latest_head_sha_from_api():
+    """로컬 리스가 최신이어도 MR의 현재 head가 다르면 대체로 보고, 조회 실패는 무시해야 한다."""
+    store = LeaseStore()
+    lease = store.claim(_KEY, "aaaa1111")
+
+    def _fail():
+        raise RuntimeError("GitLab down")
+
+    assert SupersedeGuard(store, lease, latest_head_sha=lambda: "cccc3333").superseded("posting the review") is True
+    assert SupersedeGuard(store, lease, latest_head_sha=lambda: "aaaa1111").superseded("posting the review") is False
+    assert SupersedeGuard(store, lease, latest_head_sha=_fail).superseded("posting the review") is False
+
+
+def test_wait_debounce_should_skip_when_newer_push_arrives_during_window():
+    """debounce 창이 남았으면 남은 시간만큼 기다리고, 그사이 새 push가 들어오면 리뷰를 건너뛰어야 한다."""
+    store = LeaseStore(clock=lambda: 1000.0)
+    slept: list[float] = []
+
+    def _sleep_and_push(seconds: float) -> None:
+        slept.append(seconds)
+        store.claim(_KEY, "bbbb2222")
+
+    guard = SupersedeGuard(store, store.claim(_KEY, "aaaa1111"), debounce_seconds=30, clock=lambda: 1010.0, sleep=_sleep_and_push)
+    quiet_store = LeaseStore(clock=lambda: 1000.0)
+    quiet = SupersedeGuard(quiet_store, quiet_store.claim(_KEY, "cccc3333"), debounce_seconds=30, clock=lambda: 1010.0, sleep=slept.append)
+
+    assert guard.wait_debounce() is True
+    assert quiet.wait_debounce() is False
+    assert slept == [20.0, 20.0]
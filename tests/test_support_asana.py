@@ -1,5 +1,7 @@
 """Asana 연동 유틸리티 테스트."""
 
+import time
+
 from ai_review_bot.support.asana import (
     build_ticket_context_from_asana,
 )
@@ -98,3 +100,18 @@ def test_build_ticket_context_logs_when_asana_link_found(capsys):
 
     captured = capsys.readouterr()
     assert "[llm-code-review] found Asana task ids: 789012" in captured.out
+
+
+def test_build_ticket_context_keeps_link_order_when_fetching_concurrently():
+    """동시에 가져와도 티켓 요약은 링크가 등장한 순서를 유지해야 한다."""
+    description = "https://app.asana.com/0/1/111 https://app.asana.com/0/1/222 https://app.asana.com/0/1/111"
+    extra_texts = ["https://app.asana.com/0/1/333"]
+    delays = {"111": 0.05, "222": 0.0, "333": 0.02}
+
+    def _slow_fetcher(task_id: str):
+        time.sleep(delays[task_id])
+        return {"name": f"티켓 {task_id}", "notes": "", "permalink_url": ""}
+
+    result = build_ticket_context_from_asana(description, fetcher=_slow_fetcher, extra_texts=extra_texts, max_workers=3)
+
+    assert result == "[Asana] 티켓 111\n\n[Asana] 티켓 222\n\n[Asana] 티켓 333"
@@ -0,0 +1,122 @@
+"""git diff 스트리밍·필터링 유틸리티 테스트(임시 저장소에서 실제 git 실행)."""
+
+import subprocess
+
+import pytest
+
+from ai_review_bot.diff import parse_diff
+from ai_review_bot.support.git import DEFAULT_DIFF_EXCLUDES, build_diff_args, diff_excludes_from_env, is_excluded_path, iter_diff_chunks, read_diff
+
+
+def _git(repo, *args: str) -> str:
+    return subprocess.run(["git", *args], cwd=repo, check=True, capture_output=True, text=True).stdout
+
+
+def _commit(repo, files: dict[str, str | bytes], message: str) -> str:
+    for name, content in files.items():
+        path = repo / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(content if isinstance(content, bytes) else content.encode("utf-8"))
+    _git(repo, "add", "-A")
+    _git(repo, "commit", "-q", "-m", message)
+    return _git(repo, "rev-parse", "HEAD").strip()
+
+
+@pytest.fixture()
+def repo(tmp_path):
+    _git(tmp_path, "init", "-q", "-b", "main")
+    _git(tmp_path, "config", "user.email", "bot@example.com")
+    _git(tmp_path, "config", "user.name", "bot")
+    _commit(tmp_path, {"app.py": "print('a')\n", "moved.py": "".join(f"line {i}\n" for i in range(50))}, "base")
+    return tmp_path
+
+
+def test_read_diff_should_apply_merge_base_excludes_renames_and_binary_suppression(repo):
+    """merge-base 이후 변경만, 제외 경로·이름 변경 본문·바이너리 내용 없이 읽어야 한다."""
+    _git(repo, "checkout", "-q", "-b", "feature")
+    _git(repo, "mv", "moved.py", "renamed.py")
+    head = _commit(
+        repo,
+        {
+            "app.py": "print('b')\n",
+            "package-lock.json": '{"lockfileVersion": 3}\n',
+            "web/node_modules/lib/index.js": "module.exports = 1\n",
+            "logo.png": b"\x89PNG\x00\x01\x02",
+        },
+        "feature",
+    )
+    _git(repo, "checkout", "-q", "main")
+    main = _commit(repo, {"main_only.py": "x = 1\n"}, "main moves on")
+
+    output = read_diff(build_diff_args(main, head), cwd=str(repo))
+
+    files = {file.path: file for file in parse_diff(output.text)}
+    assert sorted(files) == ["app.py", "logo.png", "renamed.py"]
+    assert files["renamed.py"].is_rename and not files["renamed.py"].hunks
+    assert files["logo.png"].is_binary
+    assert output.files == 3
+
+
+def test_read_diff_should_skip_files_over_the_size_limit(repo):
+    """크기 상한을 넘은 뒤의 파일은 모으지 않고 개수만 세야 한다."""
+    base = _git(repo, "rev-parse", "HEAD").strip()
+    head = _commit(repo, {"a.py": "a = 1\n", "b.py": "b = 2\n" * 200}, "two files")
+
+    output = read_diff(build_diff_args(base, head, merge_base=False), cwd=str(repo), max_bytes=400)
+
+    assert [file.path for file in parse_diff(output.text)] == ["a.py"]
+    assert output.skipped_paths == ("b.py",)
+    assert output.skipped_files == 1
+
+
+def test_read_diff_should_report_skipped_paths_containing_b_slash(repo):
+    """건너뛴 파일 경로는 `" b/"`가 들어간 이름으로 바뀌어도 diff 파서와 같은 새 경로여야 한다."""
+    base = _git(repo, "rev-parse", "HEAD").strip()
+    (repo / "docs" / "a b").mkdir(parents=True)
+    _git(repo, "mv", "moved.py", "docs/a b/moved.py")
+    head = _commit(repo, {"a.py": "a = 1\n" * 200}, "rename into a spaced directory")
+
+    output = read_diff(build_diff_args(base, head, merge_base=False), cwd=str(repo), max_bytes=10)
+
+    assert sorted(output.skipped_paths) == ["a.py", "docs/a b/moved.py"]
+
+
+def test_iter_diff_chunks_should_not_block_on_large_stderr(repo):
+    """git이 stderr에 파이프 버퍼보다 많이 써도 멈추지 않고 diff를 끝까지 읽어야 한다."""
+    base = _git(repo, "rev-parse", "HEAD").strip()
+    head = _commit(repo, {"a.py": "a = 1\n"}, "one file")
+    noisy = repo / "noisy-git"
+    noisy.write_text("#!/bin/sh\nhead -c 200000 /dev/zero | tr '\\0' x >&2\nexec git \"$@\"\n")
+    noisy.chmod(0o755)
+    args = build_diff_args(base, head, merge_base=False)
+
+    chunks = list(iter_diff_chunks([str(noisy), *args[1:]], cwd=str(repo)))
+
+    assert [file.path for file in parse_diff("".join(chunks))] == ["a.py"]
+
+
+def test_iter_diff_chunks_should_raise_when_git_fails(repo):
+    """알 수 없는 리비전이면 git 오류 메시지를 담은 RuntimeError가 나야 한다."""
+    with pytest.raises(RuntimeError, match="git diff failed"):
+        list(iter_diff_chunks(build_diff_args("origin/missing", "HEAD"), cwd=str(repo)))
+
+
+def test_diff_excludes_from_env_should_replace_defaults(monkeypatch):
+    """LLM_REVIEW_DIFF_EXCLUDE는 기본 제외 목록을 대체하고 none이면 비활성화해야 한다."""
+    monkeypatch.setenv("LLM_REVIEW_DIFF_EXCLUDE", "**/*.lock, docs/**\n**/*.svg")
+    assert diff_excludes_from_env() == ("**/*.lock", "docs/**", "**/*.svg")
+
+    monkeypatch.setenv("LLM_REVIEW_DIFF_EXCLUDE", "none")
+    assert diff_excludes_from_env() == ()
+
+
+def test_is_excluded_path_should_agree_with_git_exclude_pathspecs(repo):
+    """API diff에 쓰는 경로 필터는 git의 :(exclude,glob) pathspec과 같은 파일을 빼야 한다."""
+    base = _git(repo, "rev-parse", "HEAD").strip()
+    paths = ["package-lock.json", "web/yarn.lock", "static/app.min.js", "src/app.js", "web/node_modules/lib/index.js", "src/__snapshots__/a.snap", "src/vendor.py"]
+    head = _commit(repo, {path: "x\n" for path in paths}, "many files")
+
+    included = [file.path for file in parse_diff(read_diff(build_diff_args(base, head, merge_base=False), cwd=str(repo)).text)]
+
+    assert sorted(path for path in paths if not is_excluded_path(path, DEFAULT_DIFF_EXCLUDES)) == sorted(included) == ["src/app.js", "src/vendor.py"]
+    assert is_excluded_path("docs/a/b.md", ["docs/**"]) and not is_excluded_path("src/docs/b.md", ["docs/**"])
@@ -1,6 +1,15 @@
 """GitLab 이슈 본문 수집 유틸리티 테스트."""
 
-from ai_review_bot.support.gitlab import collect_issue_descriptions, extract_issue_iids
+import time
+
+from ai_review_bot.diff import parse_diff
+from ai_review_bot.support.gitlab import (
+    collect_issue_descriptions,
+    extract_issue_iids,
+    fetch_current_user,
+    fetch_merge_request_diff,
+    fetch_merge_request_diff_refs,
+)
 
 
 def test_extract_issue_iids_should_find_links_with_dash_segment():
@@ -50,3 +59,106 @@ def test_collect_issue_descriptions_should_use_fetcher_and_skip_empty():
 
     assert fetched == ["42", "99"]
     assert bodies == ["본문 42"]
+
+
+def test_collect_issue_descriptions_should_keep_order_when_fetching_concurrently():
+    """동시에 가져와도 결과는 설명에 등장한 순서를 유지해야 한다."""
+    delays = {"1": 0.05, "2": 0.0, "3": 0.02}
+
+    def _slow_fetcher(issue_iid: str, api_url: str, project_id: str, token: str):
+        time.sleep(delays[issue_iid])
+        return {"description": f"본문 {issue_iid}"}
+
+    bodies = collect_issue_descriptions(
+        "#1 #2 #3 #2",
+        api_url="https://gitlab.example.com/api/v4",
+        project_id="123",
+        token="token",
+        fetcher=_slow_fetcher,
+        max_workers=3,
+    )
+
+    assert bodies == ["본문 1", "본문 2", "본문 3"]
+
+
+class _FakeResponse:
+    def __init__(self, data, next_page: str = "") -> None:
+        self._data = data
+        self.ok = True
+        self.status_code = 200
+        self.headers = {"X-Next-Page": next_page}
+
+    def json(self):
+        return self._data
+
+
+class _FakeHttpClient:
+    def __init__(self, pages: list) -> None:
+        self.pages = pages
+        self.params: list[dict] = []
+
+    def get(self, url, **kwargs):
+        self.params.append(kwargs["params"])
+        return self.pages[len(self.params) - 1]
+
+
+def test_fetch_merge_request_diff_should_rebuild_unified_diff_across_pages(monkeypatch):
+    """/diffs API 응답을 페이지를 따라가며 git diff 형식으로 조립해야 한다."""
+    client = _FakeHttpClient(
+        [
+            _FakeResponse([{"old_path": "a.py", "new_path": "a.py", "diff": "@@ -1 +1 @@\n-x\n+y\n"}], next_page="2"),
+            _FakeResponse([{"old_path": "new.py", "new_path": "new.py", "new_file": True, "diff": "@@ -0,0 +1 @@\n+z"}]),
+        ]
+    )
+    monkeypatch.setattr("ai_review_bot.support.gitlab.get_http_client", lambda: client)
+
+    diff = fetch_merge_request_diff(api_url="https://gitlab.example.com/api/v4", project_id="1", mr_iid="2", token="t")
+
+    assert [params["page"] for params in client.params] == [1, 2]
+    assert [(file.path, file.is_new, file.added) for file in parse_diff(diff)] == [("a.py", False, 1), ("new.py", True, 1)]
+    assert "--- /dev/null\n+++ b/new.py\n" in diff
+
+
+def test_fetch_merge_request_diff_refs_should_require_all_shas(monkeypatch):
+    """diff_refs의 세 SHA가 모두 있을 때만 돌려주고, 하나라도 빠지면 None이어야 한다."""
+    refs = {"base_sha": "b", "start_sha": "s", "head_sha": "h"}
+    responses = [_FakeResponse({"diff_refs": refs}), _FakeResponse({"diff_refs": {**refs, "start_sha": None}})]
+    monkeypatch.setattr("ai_review_bot.support.gitlab.get_http_client", lambda: type("_Client", (), {"get": lambda self, url, **kwargs: responses.pop(0)})())
+
+    assert fetch_merge_request_diff_refs(api_url="https://gitlab.example.com/api/v4", project_id="1", mr_iid="2", token="t") == refs
+    assert fetch_merge_request_diff_refs(api_url="https://gitlab.example.com/api/v4", project_id="1", mr_iid="2", token="t") is None
+
+
+def test_fetch_current_user_should_return_id_and_username(monkeypatch):
+    """GET /user 응답에서 봇 계정의 id와 username만 돌려주고, 실패하면 None이어야 한다."""
+    requested: list[str] = []
+    responses = [_FakeResponse({"id": 7, "username": "review-bot", "email": "bot@example.com"}), _FakeResponse({"message": "401 Unauthorized"})]
+
+    def _get(self, url, **kwargs):
+        requested.append(url)
+        return responses.pop(0)
+
+    monkeypatch.setattr("ai_review_bot.support.gitlab.get_http_client", lambda: type("_Client", (), {"get": _get})())
+
+    assert fetch_current_user(api_url="https://gitlab.example.com/api/v4", token="t") == {"id": 7, "username": "review-bot"}
+    assert fetch_current_user(api_url="https://gitlab.example.com/api/v4", token="t") is None
+    assert requested[0] == "https://gitlab.example.com/api/v4/user"
+
+
+def test_fetch_merge_request_diff_should_drop_excluded_files(monkeypatch):
+    """excludes glob에 맞는 파일은 CI 모드의 git diff처럼 조립한 diff에서 빠져야 한다."""
+    client = _FakeHttpClient(
+        [
+            _FakeResponse(
+                [
+                    {"old_path": "web/package-lock.json", "new_path": "web/package-lock.json", "diff": "@@ -1 +1 @@\n-x\n+y\n"},
+                    {"old_path": "a.py", "new_path": "a.py", "diff": "@@ -1 +1 @@\n-x\n+y\n"},
+                ]
+            )
+        ]
+    )
+    monkeypatch.setattr("ai_review_bot.support.gitlab.get_http_client", lambda: client)
+
+    diff = fetch_merge_request_diff(api_url="https://gitlab.example.com/api/v4", project_id="1", mr_iid="2", token="t", excludes=["**/package-lock.json"])
+
+    assert [file.path for file in parse_diff(diff)] == ["a.py"]
@@ -0,0 +1,68 @@
+"""공유 HTTP 클라이언트 재시도 정책 테스트."""
+
+import pytest
+import requests
+
+from ai_review_bot.support.http import HttpClient
+
+
+class _FakeResponse:
+    def __init__(self, status_code: int, headers: dict | None = None) -> None:
+        self.status_code = status_code
+        self.headers = headers or {}
+
+
+class _FakeSession:
+    def __init__(self, outcomes: list) -> None:
+        self.outcomes = outcomes
+        self.calls: list[tuple[str, str]] = []
+
+    def request(self, method, url, **kwargs):
+        self.calls.append((method, url))
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+def _client(outcomes: list, sleeps: list[float]) -> tuple[HttpClient, _FakeSession]:
+    session = _FakeSession(outcomes)
+    return HttpClient(session=session, max_retries=2, sleep=sleeps.append), session  # type: ignore[arg-type]
+
+
+def test_get_should_retry_5xx_and_honor_retry_after():
+    """GET은 429/5xx를 재시도하고 Retry-After 초 단위 값을 그대로 기다려야 한다."""
+    sleeps: list[float] = []
+    client, session = _client([_FakeResponse(429, {"Retry-After": "3"}), _FakeResponse(503), _FakeResponse(200)], sleeps)
+
+    resp = client.get("https://gitlab.example.com/api/v4/issues/1")
+
+    assert resp.status_code == 200
+    assert len(session.calls) == 3
+    assert sleeps[0] == 3.0
+    assert 0 <= sleeps[1] <= 1.0
+
+
+def test_post_should_not_retry_server_errors():
+    """POST는 중복 생성을 막기 위해 5xx를 재시도하지 않아야 한다."""
+    sleeps: list[float] = []
+    client, session = _client([_FakeResponse(502), _FakeResponse(200)], sleeps)
+
+    resp = client.post("https://gitlab.example.com/api/v4/notes", json={"body": "x"})
+
+    assert resp.status_code == 502
+    assert len(session.calls) == 1
+    assert sleeps == []
+
+
+def test_request_should_raise_after_exhausting_retries_on_connection_error():
+    """연결 오류가 재시도 횟수를 넘기면 예외를 그대로 올려야 한다."""
+    sleeps: list[float] = []
+    errors = [requests.ConnectionError("boom") for _ in range(3)]
+    client, session = _client(errors, sleeps)  # type: ignore[arg-type]
+
+    with pytest.raises(requests.ConnectionError):
+        client.get("https://app.asana.com/api/1.0/tasks/1")
+
+    assert len(session.calls) == 3
+    assert len(sleeps) == 2
@@ -1,12 +1,24 @@
 """ReviewLLMClient 동작 검증."""
 
+import pytest
+
 from ai_review_bot.llm import ReviewLLMClient
 from ai_review_bot.prompt import PromptBundle
+from ai_review_bot.rate_limit import RateLimiter
+from ai_review_bot.report import REVIEW_JSON_SCHEMA
+
+
+class _DummyUsage:
+    input_tokens = 1200
+    output_tokens = 300
+    total_tokens = 1500
+    input_tokens_details = type("_Details", (), {"cached_tokens": 1024})()
 
 
 class _DummyResponse:
     def __init__(self, text: str = "ok") -> None:
         self.output_text = text
+        self.usage = _DummyUsage()
 
 
 class _DummyResponses:
@@ -26,12 +38,14 @@ class _DummyClient:
 def _make_client(
     reasoning_effort: str | None = None,
     text_verbosity: str | None = None,
+    structured_output: bool = False,
 ) -> tuple[ReviewLLMClient, _DummyClient]:
     client = ReviewLLMClient(
         api_key="test",
         enabled=False,
         reasoning_effort=reasoning_effort,
         text_verbosity=text_verbosity,
+        structured_output=structured_output,
     )
     dummy = _DummyClient()
     client._client = dummy  # type: ignore[attr-defined]
@@ -60,3 +74,211 @@ def test_generate_should_allow_custom_reasoning_and_text_verbosity():
     assert dummy.responses.kwargs is not None
     assert dummy.responses.kwargs["reasoning"] == {"effort": "high"}
     assert dummy.responses.kwargs["text"] == {"verbosity": "medium"}
+
+
+def test_generate_should_request_json_schema_in_structured_output_mode():
+    """구조화 출력 모드는 리포트 JSON 스키마를 strict json_schema 형식으로 요청해야 한다."""
+    llm, dummy = _make_client(structured_output=True)
+
+    llm.generate(PromptBundle(system="sys", user="usr"))
+
+    assert dummy.responses.kwargs is not None
+    assert dummy.responses.kwargs["text"] == {
+        "verbosity": "low",
+        "format": {"type": "json_schema", "name": "review_findings", "schema": REVIEW_JSON_SCHEMA, "strict": True},
+    }
+
+
+class _DummyEvent:
+    def __init__(self, type_: str, delta: str = "") -> None:
+        self.type = type_
+        self.delta = delta
+
+
+class _StreamingResponses(_DummyResponses):
+    def create(self, **kwargs):
+        self.kwargs = kwargs
+        return iter(
+            [
+                _DummyEvent("response.created"),
+                _DummyEvent("response.output_text.delta", "## 핵심"),
+                _DummyEvent("response.output_text.delta", " 요약"),
+                _DummyEvent("response.completed"),
+            ]
+        )
+
+
+def test_generate_stream_should_yield_text_deltas(capsys):
+    """스트림 이벤트 중 텍스트 delta만 순서대로 돌려주고 TTFT/전체 시간을 기록해야 한다."""
+    llm, dummy = _make_client()
+    dummy.responses = _StreamingResponses()
+
+    deltas = list(llm.generate_stream(PromptBundle(system="sys", user="usr")))
+
+    assert deltas == ["## 핵심", " 요약"]
+    assert dummy.responses.kwargs is not None
+    assert dummy.responses.kwargs["stream"] is True
+    assert "ttft=" in capsys.readouterr().err
+
+
+class _BrokenStreamResponses(_DummyResponses):
+    def create(self, **kwargs):
+        self.kwargs = kwargs
+        yield _DummyEvent("response.output_text.delta", "## 핵심")
+        raise ConnectionError("stream reset")
+
+
+def test_generate_stream_should_release_reservation_when_stream_breaks():
+    """스트림이 중간에 끊기면 예약한 토큰을 돌려줘 다음 호출이 남은 창 동안 막히지 않아야 한다."""
+    now = [0.0]
+
+    def _sleep(seconds: float) -> None:
+        now[0] += seconds
+
+    limiter = RateLimiter(tokens_per_minute=10_000, clock=lambda: now[0], sleep=_sleep)
+    llm, dummy = _make_client()
+    llm._rate_limiter = limiter  # type: ignore[attr-defined]
+    dummy.responses = _BrokenStreamResponses()
+
+    deltas: list[str] = []
+    with pytest.raises(RuntimeError, match="stream reset"):
+        for delta in llm.generate_stream(PromptBundle(system="sys", user="usr")):
+            deltas.append(delta)
+
+    assert deltas == ["## 핵심"]
+    assert limiter.acquire(10_000) == 0.0
+
+
+class _RateLimitError(Exception):
+    status_code = 429
+
+    def __init__(self) -> None:
+        super().__init__("rate limited")
+        self.response = type("_Response", (), {"headers": {"retry-after-ms": "250"}})()
+
+
+class _RawResponse:
+    def __init__(self, headers: dict) -> None:
+        self.headers = headers
+
+    def parse(self):
+        return _DummyResponse()
+
+
+class _RawResponses:
+    def __init__(self, failures: int) -> None:
+        self.failures = failures
+        self.calls = 0
+
+    def create(self, **kwargs):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise _RateLimitError()
+        return _RawResponse({"x-ratelimit-limit-requests": "60", "x-ratelimit-remaining-requests": "59"})
+
+
+def test_generate_should_wait_out_rate_limit_and_learn_limits_from_headers():
+    """429는 실패로 끝내지 않고 Retry-After만큼 멈춘 뒤 다시 보내고, 응답 헤더의 한도를 학습해야 한다."""
+    now = [0.0]
+    sleeps: list[float] = []
+
+    def _sleep(seconds: float) -> None:
+        sleeps.append(seconds)
+        now[0] += seconds
+
+    limiter = RateLimiter(clock=lambda: now[0], sleep=_sleep)
+    llm, dummy = _make_client()
+    llm._rate_limiter = limiter  # type: ignore[attr-defined]
+    raw = _RawResponses(failures=2)
+    dummy.responses.with_raw_response = raw  # type: ignore[attr-defined]
+
+    assert llm.generate(PromptBundle(system="sys", user="usr")) == "ok"
+    assert raw.calls == 3
+    assert sleeps == [0.25, 0.25]
+    assert limiter.requests_per_minute == 60
+
+
+class _ServerError(Exception):
+    status_code = 503
+
+
+class _FlakyResponses(_DummyResponses):
+    def __init__(self, failures: int) -> None:
+        super().__init__()
+        self.failures = failures
+
+    def create(self, **kwargs):
+        if self.failures:
+            self.failures -= 1
+            raise _ServerError("service unavailable")
+        return super().create(**kwargs)
+
+
+def test_generate_should_retry_server_errors_with_attempt_timeout():
+    """5xx는 백오프 후 재시도하고, 시도마다 제한 시간을 넘겨야 하며, 시도 횟수가 집계돼야 한다."""
+    llm, dummy = _make_client()
+    llm._sleep = lambda _seconds: None  # type: ignore[attr-defined]
+    dummy.responses = _FlakyResponses(failures=1)
+
+    assert llm.generate(PromptBundle(system="sys", user="usr")) == "ok"
+    assert dummy.responses.kwargs is not None
+    assert dummy.responses.kwargs["timeout"] > 0
+    assert llm.call_stats()["attempts"] == 2
+    assert llm.call_stats()["retries"] == 1
+
+
+def test_complete_should_send_stable_prefix_first_and_report_cached_tokens():
+    """system → shared → user 순서로 보내고 같은 접두사에 같은 캐시 키를 쓰며, 캐시된 입력 토큰 수를 돌려줘야 한다."""
+    llm, dummy = _make_client()
+
+    result = llm.complete(PromptBundle(system="sys", shared="[프로젝트] kop-web", user="[PR/MR] 1"))
+    first_key = dummy.responses.kwargs["prompt_cache_key"]  # type: ignore[index]
+    llm.complete(PromptBundle(system="sys", shared="[프로젝트] kop-web", user="[PR/MR] 2"))
+
+    assert dummy.responses.kwargs is not None
+    assert dummy.responses.kwargs["input"][1]["content"] == [
+        {"type": "input_text", "text": "[프로젝트] kop-web"},
+        {"type": "input_text", "text": "[PR/MR] 2"},
+    ]
+    assert dummy.responses.kwargs["prompt_cache_key"] == first_key
+    assert result.usage.cached_tokens == 1024
+    assert result.usage.input_tokens == 1200
+
+
+def _metered_client(tokens_per_minute: int):
+    now = [0.0]
+
+    def _sleep(seconds: float) -> None:
+        now[0] += seconds
+
+    limiter = RateLimiter(tokens_per_minute=tokens_per_minute, clock=lambda: now[0], sleep=_sleep)
+    llm, dummy = _make_client()
+    llm._rate_limiter = limiter  # type: ignore[attr-defined]
+    llm._sleep = _sleep  # type: ignore[attr-defined]
+    return llm, dummy, limiter
+
+
+@pytest.mark.parametrize("failing", ["rate_limited", "server_error"])
+def test_failed_attempts_should_return_their_token_reservation(failing):
+    """429·5xx로 실패한 시도의 예약은 돌려주고, 버킷에는 성공한 시도의 실제 사용량만 남아야 한다."""
+    llm, dummy, limiter = _metered_client(20_000)
+    if failing == "rate_limited":
+        dummy.responses.with_raw_response = _RawResponses(failures=2)  # type: ignore[attr-defined]
+    else:
+        dummy.responses = _FlakyResponses(failures=2)
+
+    assert llm.generate(PromptBundle(system="sys", user="usr")) == "ok"
+
+    # 성공 응답의 사용량은 1,500토큰이므로 18,000토큰은 기다리지 않고 바로 예약돼야 한다.
+    assert limiter.acquire(18_000) == 0.0
+
+
+def test_generate_stream_should_return_reservation_when_connection_fails():
+    """스트림 연결이 끝내 실패해도 시도마다 잡은 예약이 버킷에 남지 않아야 한다."""
+    llm, dummy, limiter = _metered_client(10_000)
+    dummy.responses = _FlakyResponses(failures=10)
+
+    with pytest.raises(RuntimeError, match="service unavailable"):
+        list(llm.generate_stream(PromptBundle(system="sys", user="usr")))
+
+    assert limiter.acquire(10_000) == 0.0
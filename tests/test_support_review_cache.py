@@ -0,0 +1,99 @@
+"""리뷰 결과 디스크 캐시 테스트."""
+
+import os
+
+from ai_review_bot.llm import LLMResult
+from ai_review_bot.review import ReviewContext, TokenUsage
+from ai_review_bot.review_service import ReviewService
+from ai_review_bot.support.review_cache import ReviewCache, build_cache_key
+
+_DIFF = "diff --git a/a.py b/a.py\nindex 1111111..2222222 100644\n--- a/a.py\n+++ b/a.py\n@@ -1 +1 @@\n-a\n+b\n"
+
+
+class _CountingLLM:
+    is_available = True
+    model = "gpt-5.1"
+    structured_output = False
+    reasoning_effort = "low"
+    text_verbosity = "low"
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def complete(self, prompt):
+        return LLMResult(text=self.generate(prompt), usage=TokenUsage(input_tokens=10, output_tokens=5, total_tokens=15))
+
+    def generate(self, prompt):
+        self.calls += 1
+        return "## 핵심 요약\n- 안정성을 위해 먼저 살펴보면 좋은 부분: 0건"
+
+
+def _context(diff: str = _DIFF) -> ReviewContext:
+    return ReviewContext(project_name="kop-web", pr_number="1", diff=diff)
+
+
+def test_build_cache_key_should_ignore_index_lines_and_line_endings():
+    """리베이스로 바뀌는 blob 해시와 CRLF 차이는 같은 키가 되어야 한다."""
+    rebased = _DIFF.replace("1111111..2222222", "3333333..4444444").replace("\n", "\r\n")
+
+    key = build_cache_key(_context(), system_prompt="sys", settings={"model": "gpt-5.1"})
+
+    assert key == build_cache_key(_context(rebased), system_prompt="sys", settings={"model": "gpt-5.1"})
+    assert key != build_cache_key(_context(), system_prompt="sys", settings={"model": "gpt-5-mini"})
+
+
+def test_review_cache_should_round_trip_and_evict_least_recently_used(tmp_path):
+    """저장한 항목을 돌려주고, 용량을 넘으면 가장 오래 쓰이지 않은 항목부터 지워야 한다."""
+    cache = ReviewCache(tmp_path, max_bytes=400)
+    cache.put("old", "A" * 100, latency_seconds=1.0)
+    cache.put("hot", "B" * 100, latency_seconds=2.0)
+    os.utime(tmp_path / "old.json", (1, 1))
+    os.utime(tmp_path / "hot.json", (2, 2))
+
+    cache.put("new", "C" * 100, latency_seconds=3.0)
+
+    assert cache.get("old") is None
+    hot = cache.get("hot")
+    assert hot is not None and hot.report == "B" * 100 and hot.latency_seconds == 2.0
+    assert not list(tmp_path.glob(".tmp-*"))
+
+
+def test_review_cache_should_treat_malformed_entries_as_miss(tmp_path):
+    """JSON 객체가 아니거나 숫자가 아닌 지연 시간을 가진 항목은 예외 없이 미스여야 한다."""
+    cache = ReviewCache(tmp_path)
+    (tmp_path / "list.json").write_text('["report"]', encoding="utf-8")
+    (tmp_path / "latency.json").write_text('{"report": "r", "latency_seconds": "slow"}', encoding="utf-8")
+    (tmp_path / "nested.json").write_text('{"report": "r", "latency_seconds": {"s": 1}}', encoding="utf-8")
+
+    assert cache.get("list") is None
+    assert cache.get("latency") is None
+    assert cache.get("nested") is None
+
+
+def test_review_cache_put_should_remove_temp_file_on_failure(tmp_path, monkeypatch):
+    """교체에 실패하면 임시 파일을 남기지 않아야 한다."""
+    cache = ReviewCache(tmp_path)
+
+    def _fail(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(os, "replace", _fail)
+    cache.put("key", "report", latency_seconds=1.0)
+
+    assert not list(tmp_path.iterdir())
+
+
+def test_create_review_should_skip_llm_call_on_cache_hit(tmp_path, capsys):
+    """같은 입력으로 다시 실행하면 LLM을 호출하지 않고 캐시 결과를 돌려줘야 한다."""
+    llm = _CountingLLM()
+    service = ReviewService(llm, cache=ReviewCache(tmp_path))  # type: ignore[arg-type]
+
+    first = service.create_review(_context())
+    second = service.create_review(_context())
+
+    assert llm.calls == 1
+    assert first == second
+    captured = capsys.readouterr()
+    assert "review cache miss" in captured.err
+    assert "review cache hit" in captured.err
+    assert "review cache" not in captured.out
@@ -0,0 +1,91 @@
+"""티켓 응답 캐시(TTL + ETag) 테스트."""
+
+from ai_review_bot.support.ticket_cache import TicketCache, get_json_cached, scoped_cache_key
+
+
+class _FakeResponse:
+    def __init__(self, status_code: int, payload=None, headers: dict | None = None) -> None:
+        self.status_code = status_code
+        self.ok = 200 <= status_code < 300
+        self._payload = payload
+        self.headers = headers or {}
+
+    def json(self):
+        return self._payload
+
+
+class _FakeClient:
+    def __init__(self, responses: list[_FakeResponse]) -> None:
+        self.responses = responses
+        self.headers: list[dict] = []
+
+    def get(self, url, *, headers, timeout):
+        self.headers.append(dict(headers))
+        return self.responses.pop(0)
+
+
+def test_get_json_cached_should_serve_fresh_entries_without_network(tmp_path):
+    """TTL 안의 항목은 네트워크 호출 없이 돌려줘야 한다."""
+    cache = TicketCache(tmp_path / "tickets.sqlite3", ttl_seconds=3600)
+    client = _FakeClient([_FakeResponse(200, {"data": {"name": "티켓"}}, {"ETag": '"v1"'})])
+
+    first = get_json_cached("https://a/1", key="k", headers={}, extract=lambda d: d["data"], cache=cache, client=client)  # type: ignore[arg-type]
+    second = get_json_cached("https://a/1", key="k", headers={}, extract=lambda d: d["data"], cache=cache, client=client)  # type: ignore[arg-type]
+
+    assert first == second == {"name": "티켓"}
+    assert len(client.headers) == 1
+
+
+def test_get_json_cached_should_revalidate_expired_entries_with_etag(tmp_path):
+    """만료된 항목은 If-None-Match로 재검증하고 304면 저장된 값을 써야 한다."""
+    cache = TicketCache(tmp_path / "tickets.sqlite3", ttl_seconds=0)
+    cache.put(scoped_cache_key("k", {"PRIVATE-TOKEN": "t"}), {"name": "이전"}, etag='"v1"')
+    client = _FakeClient([_FakeResponse(304)])
+
+    result = get_json_cached("https://a/1", key="k", headers={"PRIVATE-TOKEN": "t"}, cache=cache, client=client)  # type: ignore[arg-type]
+
+    assert result == {"name": "이전"}
+    assert client.headers == [{"PRIVATE-TOKEN": "t", "If-None-Match": '"v1"'}]
+
+
+def test_get_json_cached_should_fall_back_to_stale_entry_on_error(tmp_path):
+    """요청이 실패하면 만료된 항목이라도 돌려줘야 한다."""
+    cache = TicketCache(tmp_path / "tickets.sqlite3", ttl_seconds=0)
+    cache.put(scoped_cache_key("k", {}), {"name": "이전"})
+    client = _FakeClient([_FakeResponse(503)])
+
+    assert get_json_cached("https://a/1", key="k", headers={}, cache=cache, client=client) == {"name": "이전"}  # type: ignore[arg-type]
+
+
+def test_get_json_cached_should_not_share_entries_across_tokens(tmp_path):
+    """다른 토큰으로 요청하면 TTL 안이라도 캐시된 응답을 쓰지 않고 다시 가져와야 한다."""
+    cache = TicketCache(tmp_path / "tickets.sqlite3", ttl_seconds=3600)
+    client = _FakeClient([_FakeResponse(200, {"name": "A 프로젝트"}), _FakeResponse(404)])
+
+    first = get_json_cached("https://a/1", key="k", headers={"PRIVATE-TOKEN": "a"}, cache=cache, client=client)  # type: ignore[arg-type]
+    second = get_json_cached("https://a/1", key="k", headers={"PRIVATE-TOKEN": "b"}, cache=cache, client=client)  # type: ignore[arg-type]
+
+    assert first == {"name": "A 프로젝트"}
+    assert second is None
+    assert len(client.headers) == 2
+
+
+def test_get_json_cached_should_not_serve_stale_entry_on_client_errors(tmp_path):
+    """401/403/404는 권한 회수·삭제이므로 만료된 항목을 돌려주면 안 된다."""
+    cache = TicketCache(tmp_path / "tickets.sqlite3", ttl_seconds=0)
+    cache.put(scoped_cache_key("k", {}), {"name": "이전"})
+    client = _FakeClient([_FakeResponse(403)])
+
+    assert get_json_cached("https://a/1", key="k", headers={}, cache=cache, client=client) is None  # type: ignore[arg-type]
+
+
+def test_ticket_cache_should_treat_database_errors_as_miss(tmp_path):
+    """DB가 손상돼 읽고 쓸 수 없어도 예외 없이 캐시 미스로 처리해야 한다."""
+    path = tmp_path / "tickets.sqlite3"
+    cache = TicketCache(path, ttl_seconds=3600)
+    path.write_bytes(b"not a sqlite database" * 100)
+    for suffix in ("-wal", "-shm"):
+        (tmp_path / f"tickets.sqlite3{suffix}").unlink(missing_ok=True)
+    client = _FakeClient([_FakeResponse(200, {"name": "티켓"})])
+
+    assert get_json_cached("https://a/1", key="k", headers={}, cache=cache, client=client) == {"name": "티켓"}  # type: ignore[arg-type]